@@ -1,6 +1,5 @@
 import streamlit as st
 import json
-import io
 import random
 from datetime import datetime
 
@@ -300,18 +299,21 @@ st.markdown("""
 # REAL-TIME COMPLIANCE STATUS
 # ==========================
 
-def get_compliance_status():
-    """Get real-time compliance status based on recent audits"""
-    # Simulate real compliance data
-    total_audits = random.randint(120, 150)
-    passed_audits = random.randint(90, 110)
-    failed_audits = random.randint(10, 25)
-    warning_audits = total_audits - passed_audits - failed_audits
-    
-    compliance_rate = (passed_audits / total_audits) * 100
+# Sidebar figures are re-read at most every few seconds instead of on every widget interaction
+@st.cache_data(ttl=5, show_spinner=False)
+def get_compliance_status(department=None):
+    """Get real-time compliance status from the audit history's running totals (one department, or all)"""
+    from vidhik_audit_store import ALL_DEPARTMENTS, get_audit_store
+
+    totals = get_audit_store().totals(department or ALL_DEPARTMENTS)
+    compliance_rate = totals["compliance_rate"]
     
     # Determine overall status
-    if compliance_rate >= 85:
+    if compliance_rate is None:
+        overall_status = "No audits yet"
+        status_color = "⚪"
+        compliance_rate = 0.0
+    elif compliance_rate >= 85:
         overall_status = "Excellent"
         status_color = "🟢"
     elif compliance_rate >= 70:
@@ -322,16 +324,40 @@ def get_compliance_status():
         status_color = "🔴"
     
     return {
-        "total_audits": total_audits,
-        "passed_audits": passed_audits,
-        "failed_audits": failed_audits,
-        "warning_audits": warning_audits,
-        "compliance_rate": round(compliance_rate, 1),
+        "total_audits": totals["total"],
+        "passed_audits": totals["passed"],
+        "failed_audits": totals["failed"],
+        "warning_audits": totals["warning"],
+        "compliance_rate": compliance_rate,
         "overall_status": overall_status,
         "status_color": status_color,
         "last_updated": datetime.now().strftime("%H:%M:%S")
     }
 
+@st.cache_data(ttl=5, show_spinner=False)
+def get_department_breakdown(limit=10):
+    """Per-department running totals from the audit history, busiest first"""
+    from vidhik_audit_store import get_audit_store
+    return get_audit_store().department_breakdown()[:limit]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_fleet_analytics(limit=5):
+    """Most-conflicted provisions and PII rate by department from the Parquet export (None without pyarrow)"""
+    try:
+        from vidhik_analytics import (ANALYTICS_DIR, get_analytics_writer, most_conflicted_provisions,
+                                      pii_rate_by_department)
+    except ImportError:
+        return None
+    if not ANALYTICS_DIR:
+        return None
+    # Reads what is already on disk; this process's buffered audits are written in
+    # the background and show up once the cached figures expire
+    get_analytics_writer().request_flush()
+    return {
+        "provisions": most_conflicted_provisions(limit),
+        "pii_rates": pii_rate_by_department()
+    }
+
 # ==========================
 # ELEGANT HEADER
 # ==========================
@@ -352,68 +378,103 @@ st.info("📋 Upload your policy draft or use the sample text below to conduct a
 # PDF GENERATOR
 # ==========================
 
-def create_pdf(report):
-    try:
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.units import cm
-        
-        buffer = io.BytesIO()
-
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            leftMargin=2 * cm,
-            rightMargin=2 * cm,
-            topMargin=2 * cm,
-            bottomMargin=2 * cm
-        )
+@st.cache_resource
+def get_pdf_renderer():
+    """Process-wide background PDF renderer, shared by all sessions"""
+    from vidhik_pdf import PdfRenderCache
+    return PdfRenderCache()
 
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Title
-        story.append(Paragraph("<b>Vidhik AI – Policy Audit Report</b>", styles["Title"]))
-        story.append(Spacer(1, 16))
-
-        # Overall Status
-        status = report.get("Overall Status", "Unknown")
-        story.append(Paragraph(f"<b>Overall Status:</b> {status}", styles["Heading2"]))
-        story.append(Spacer(1, 12))
-
-        # Executive Summary
-        story.append(Paragraph("<b>Executive Summary</b>", styles["Heading2"]))
-        summary = report.get("Executive Summary", "No summary available").replace("\n", "<br/>")
-        story.append(Paragraph(summary, styles["Normal"]))
-        story.append(Spacer(1, 12))
-
-        # Actionable Recommendations
-        story.append(Paragraph("<b>Actionable Recommendations</b>", styles["Heading2"]))
-        recommendations = report.get("Actionable Recommendations", "None").replace("\n", "<br/>")
-        story.append(Paragraph(recommendations, styles["Normal"]))
-        story.append(Spacer(1, 12))
-
-        # Raw Reports
-        story.append(Paragraph("<b>Raw Reports</b>", styles["Heading2"]))
-
-        for title, section in report.get("Raw Reports", {}).items():
-            story.append(Spacer(1, 10))
-            story.append(Paragraph(f"<b>{title}</b>", styles["Heading3"]))
-            raw_json = json.dumps(section, indent=2).replace("\n", "<br/>")
-            story.append(Paragraph(raw_json, styles["Code"]))
-
-        doc.build(story)
-        pdf_data = buffer.getvalue()
-        buffer.close()
-        return pdf_data
-        
+def get_report_digest(report):
+    """Cache key of a report's PDF; computed once per report (see report_export)"""
+    from vidhik_pdf import report_digest
+    return report_digest(report)
+
+def create_pdf(report, digest=None):
+    """
+    Start (or reuse) the background render of a report's PDF without waiting for it.
+    Returns (pdf_bytes, pending): pdf_bytes is None while rendering or on failure.
+    """
+    try:
+        future = get_pdf_renderer().submit(report, digest=digest)
+        if not future.done():
+            return None, True
+        return future.result(), False
     except ImportError:
         st.error("PDF generation libraries not available. Please install reportlab.")
-        return None
+        return None, False
     except Exception as e:
         st.error(f"PDF generation failed: {e}")
+        return None, False
+
+# ==========================
+# SHARED ENGINE & DERIVED VIEWS
+# ==========================
+
+@st.cache_resource
+def get_engine_module():
+    """The vidhik_engine module, imported once per process (None if the full engine is not installed)"""
+    try:
+        import vidhik_engine
+    except ImportError:
         return None
+    return vidhik_engine
+
+def set_report(report, text):
+    """Show a new report; download payloads derived from the previous one are dropped"""
+    st.session_state["report"] = report
+    st.session_state["report_text"] = text
+    st.session_state.pop("report_exports", None)
+
+def report_export(key, build):
+    """
+    Build a value derived from the displayed report (digest, JSON, redacted draft)
+    on first use and keep it in the session, so reruns don't rebuild it.
+    """
+    exports = st.session_state.setdefault("report_exports", {})
+    if key not in exports:
+        exports[key] = build()
+    return exports[key]
+
+# ==========================
+# LIVE QUICK SCAN
+# ==========================
+
+def render_quick_scan(text):
+    """Show PII and bias findings from the engine's quick mode (no model, no legal DB)"""
+    engine = get_engine_module()
+    if engine is None:
+        st.caption("⚡ Quick scan unavailable - full engine not installed")
+        return
+
+    quick_report = engine.analyze_policy(text, mode="quick")
+    raw_reports = quick_report["Raw Reports"]
+    pii_count = len(raw_reports["PII Report"]["detected_items"])
+    bias_count = len(raw_reports["Bias Report"]["flagged_phrases"])
+    duration = quick_report["Audit Metadata"]["Duration (ms)"]
+    icon = "🔴" if pii_count else "🟡" if bias_count else "🟢"
+    st.caption(f"{icon} Quick scan: {pii_count} PII items • {bias_count} biased phrases "
+               f"({duration} ms) - run the full audit for legal conflicts")
+
+def render_full_provision(conflict_data):
+    """Reports carry provision previews; fetch the full text of the one the officer picks"""
+    conflicts = conflict_data.get("Conflicting Laws") or []
+    engine = get_engine_module()
+    if not conflicts or engine is None or not all(isinstance(c, dict) for c in conflicts):
+        return
+    rank = st.selectbox(
+        "Read full provision",
+        [None] + [conflict["Rank"] for conflict in conflicts],
+        format_func=lambda r: "Select a conflict..." if r is None else f"#{r}: {conflicts[r - 1]['Legal Provision'][:60]}..."
+    )
+    if rank is None:
+        return
+    conflict = conflicts[rank - 1]
+    text = engine.provision_text(conflict["Provision ID"], conflict.get("Language", "en"),
+                                 conflict_data.get("Index Versions", {}).get(conflict.get("Language", "en")))
+    if text is None:
+        st.warning("The legal database has been updated since this audit; re-run it to see the full provision.")
+    else:
+        st.markdown(text)
 
 # ==========================
 # MOCK ANALYSIS FUNCTION
@@ -472,10 +533,15 @@ with st.sidebar.expander("🏛 System Architecture", expanded=False):
 
 st.sidebar.markdown("---")
 
-# Real-time Compliance Status
-compliance_data = get_compliance_status()
+department = st.sidebar.text_input("🏢 Department", value=st.session_state.get("department", ""),
+                                   placeholder="e.g. IT Department")
+st.session_state["department"] = department
+
+# Real-time Compliance Status, for the selected department if one is entered
+compliance_data = get_compliance_status(department.strip() or None)
 
 st.sidebar.markdown("### 📊 Live Compliance Status")
+st.sidebar.caption(f"Department: {department.strip()}" if department.strip() else "All departments")
 
 # Overall Status
 status_display = f"{compliance_data['status_color']} {compliance_data['overall_status']}"
@@ -516,6 +582,28 @@ with col2:
 
 st.sidebar.caption(f"Last updated: {compliance_data['last_updated']}")
 
+with st.sidebar.expander("🏢 By Department", expanded=False):
+    breakdown = get_department_breakdown()
+    if not breakdown:
+        st.caption("No audits recorded yet")
+    for row in breakdown:
+        rate = f"{row['compliance_rate']}%" if row["compliance_rate"] is not None else "n/a"
+        st.markdown(f"*{row['department']}*: {row['total']} audits • {rate} compliant • {row['failed']} need review")
+
+with st.sidebar.expander("📈 Fleet Analytics", expanded=False):
+    analytics = get_fleet_analytics()
+    if analytics is None:
+        st.caption("Analytics export is disabled (needs pyarrow and VIDHIK_ANALYTICS_DIR)")
+    elif not analytics["pii_rates"]:
+        st.caption("No audits exported yet")
+    else:
+        st.markdown("*Most-conflicted provisions*")
+        for row in analytics["provisions"]:
+            st.markdown(f"#{row['provision_id']} ({row['reports']} drafts): {row['provision_preview'][:80]}…")
+        st.markdown("*PII rate by department*")
+        for row in analytics["pii_rates"]:
+            st.markdown(f"*{row['department']}*: {row['pii_rate']}% of {row['audits']} audits")
+
 # ==========================
 # POLICY CONTENT
 # ==========================
@@ -549,6 +637,10 @@ with col1:
         height=350,
         label_visibility="collapsed"
     )
+    if st.toggle("⚡ Live quick scan", value=True,
+                 help="Re-check PII and biased language on every edit; legal conflicts need the full audit"):
+        if policy_input.strip():
+            render_quick_scan(policy_input)
 
 with col2:
     st.markdown("*Document Controls*")
@@ -560,6 +652,12 @@ with col2:
     )
     if uploaded_file:
         st.success(f"✅ {uploaded_file.name}")
+    audit_depth = st.radio(
+        "Audit depth",
+        ["Standard", "Deep"],
+        horizontal=True,
+        help="Deep retrieves more legal provisions per clause and lists more related sections"
+    )
 
 # ==========================
 # ACTION CONTROLS
@@ -588,34 +686,35 @@ with col3:
 # Handle button actions immediately
 if reset_clicked:
     st.session_state.clear()
+    st.query_params.clear()
     st.rerun()
 
 if st.session_state.get("report") and clear_clicked:
     st.session_state.pop("report", None)
     st.session_state.pop("report_text", None)
+    st.session_state.pop("report_exports", None)
     st.rerun()
 
 # ==========================
 # AUDIT PROCESSING
 # ==========================
 
-if run_audit_clicked:
-    # Process uploaded file or use text area content
-    final_text = policy_input
-    
+JOB_STAGE_LABELS = {
+    "queued": "⏳ Waiting for a free auditor",
+    "extracting": "📄 Extracting pages",
+    "embedding": "🧠 Embedding clauses",
+    "scanning": "🔍 Scanning for bias and PII",
+}
+# How often a running job's progress is refreshed
+JOB_POLL_SECONDS = 1.0
+
+def run_demo_audit(text, uploaded_file):
+    """Synchronous fallback when the full engine (and job scheduler) is not installed"""
+    final_text = text
     if uploaded_file:
         try:
-            if uploaded_file.type == "text/plain":
-                final_text = str(uploaded_file.read(), "utf-8")
-            elif uploaded_file.type == "application/pdf":
-                import PyPDF2
-                reader = PyPDF2.PdfReader(uploaded_file)
-                final_text = "\n".join([page.extract_text() for page in reader.pages])
-            elif uploaded_file.type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                        "application/msword"]:
-                import docx
-                doc = docx.Document(uploaded_file)
-                final_text = "\n".join([p.text for p in doc.paragraphs])
+            from vidhik_documents import extract_document_text
+            final_text = extract_document_text(uploaded_file.getvalue(), uploaded_file.type)
         except Exception as e:
             st.error(f"❌ File processing error: {e}")
 
@@ -623,21 +722,77 @@ if run_audit_clicked:
         st.error("Please provide policy text for analysis.")
         st.stop()
 
-    with st.spinner("🔍 Conducting comprehensive policy analysis..."):
-        try:
-            # Try to import the real analyzer, fall back to mock
-            try:
-                from vidhik_engine import analyze_policy as real_analyze_policy
-                final_report = real_analyze_policy(final_text)
-            except ImportError:
-                st.warning("⚠ Using demonstration analysis - full engine not available")
-                final_report = analyze_policy(final_text)
-            
-            st.session_state["report"] = final_report
-            st.session_state["report_text"] = final_text
-            st.success("✅ Policy audit completed successfully!")
-        except Exception as e:
-            st.error(f"❌ Analysis error: {e}")
+    st.warning("⚠ Using demonstration analysis - full engine not available")
+    set_report(analyze_policy(final_text), final_text)
+    st.success("✅ Policy audit completed successfully!")
+
+if run_audit_clicked:
+    try:
+        from vidhik_jobs import get_scheduler
+    except ImportError:
+        run_demo_audit(policy_input, uploaded_file)
+    else:
+        # Queue the audit; the worker extracts the upload, so a reconnecting
+        # browser can re-attach to the same job through the ?job= URL parameter
+        if uploaded_file:
+            job_id = get_scheduler().submit_document(
+                uploaded_file.getvalue(), uploaded_file.type,
+                department=department.strip() or None, name=uploaded_file.name, mode=audit_depth.lower()
+            )
+        elif policy_input.strip():
+            job_id = get_scheduler().submit_text(policy_input, department=department.strip() or None,
+                                                 mode=audit_depth.lower())
+        else:
+            st.error("Please provide policy text for analysis.")
+            st.stop()
+        st.session_state["job_id"] = job_id
+        st.query_params["job"] = job_id
+
+# ==========================
+# JOB PROGRESS
+# ==========================
+
+active_job_id = st.session_state.get("job_id") or st.query_params.get("job")
+
+if active_job_id:
+    from vidhik_jobs import DONE, FAILED, get_scheduler
+
+    scheduler = get_scheduler()
+    job = scheduler.get(active_job_id)
+
+    def detach_job():
+        st.session_state.pop("job_id", None)
+        st.query_params.pop("job", None)
+
+    @st.fragment(run_every=JOB_POLL_SECONDS)
+    def show_job_progress(job_id):
+        """Redraws only the progress bar on a timer, rerunning the whole page once the job ends"""
+        job = scheduler.get(job_id)
+        if job is None or job.status in (DONE, FAILED):
+            st.rerun()
+        progress = job.progress
+        label = JOB_STAGE_LABELS.get(progress["stage"], progress["stage"])
+        if progress["stage"] == "queued":
+            label += f" ({scheduler.queue_position(job.id)} ahead)"
+        elif progress["total"]:
+            label += f": {progress['done']} / {progress['total']}"
+        fraction = progress["done"] / progress["total"] if progress["total"] else 0.0
+        st.progress(min(fraction, 1.0), text=label)
+        st.caption(f"Findings so far: {progress['findings']} • Job ID: {job.id} "
+                   "(you can close this tab and return to this URL)")
+
+    if job is None:
+        st.warning("⚠ That audit job is no longer available. Please run the audit again.")
+        detach_job()
+    elif job.status == DONE:
+        set_report(job.report, job.text)
+        detach_job()
+        st.success("✅ Policy audit completed successfully!")
+    elif job.status == FAILED:
+        detach_job()
+        st.error(f"❌ Analysis error: {job.error}")
+    else:
+        show_job_progress(job.id)
 
 # ==========================
 # ELEGANT REPORT DISPLAY
@@ -678,6 +833,7 @@ if "report" in st.session_state:
         conflict_data = report.get("Raw Reports", {}).get("Conflict Report", {})
         if conflict_data:
             st.json(conflict_data)
+            render_full_provision(conflict_data)
         else:
             st.info("No legal compliance issues detected")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -704,12 +860,12 @@ if "report" in st.session_state:
     st.markdown("---")
     st.markdown('<div class="section-header">📤 Export Results</div>', unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     
     with col1:
         st.markdown('<div class="custom-card">', unsafe_allow_html=True)
         st.markdown("*PDF Report*")
-        pdf_bytes = create_pdf(report)
+        pdf_bytes, pdf_pending = create_pdf(report, report_export("digest", lambda: get_report_digest(report)))
         if pdf_bytes:
             st.download_button(
                 label="📄 Download PDF Report",
@@ -718,12 +874,15 @@ if "report" in st.session_state:
                 mime="application/pdf",
                 use_container_width=True
             )
+        elif pdf_pending:
+            st.caption("⏳ Preparing PDF in the background...")
+            st.button("🔄 Check PDF", use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
     with col2:
         st.markdown('<div class="custom-card">', unsafe_allow_html=True)
         st.markdown("*Raw Data*")
-        json_str = json.dumps(report, indent=2)
+        json_str = report_export("json", lambda: json.dumps(report, indent=2))
         st.download_button(
             label="📊 Download JSON Data",
             data=json_str,
@@ -733,8 +892,42 @@ if "report" in st.session_state:
         )
         st.markdown('</div>', unsafe_allow_html=True)
 
-    # Raw Data View
-    with st.expander("🔍 View Complete Dataset"):
+    with col3:
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        st.markdown("*Redacted Draft*")
+        engine = get_engine_module()
+        if engine is None:
+            st.info("Redaction requires the full engine")
+        else:
+            redaction_mode = st.selectbox(
+                "Redaction style",
+                engine.redaction_modes(),
+                format_func=lambda mode: {"placeholder": "Typed placeholders ([AADHAAR])",
+                                          "mask": "Masked (XXXX XXXX 1234)",
+                                          "hash": "Keyed hash"}[mode],
+                label_visibility="collapsed"
+            )
+            try:
+                # The engine scans the text again if the report's PII scan failed or did not run
+                redaction = report_export(("redacted", redaction_mode), lambda: engine.redact_pii(
+                    st.session_state.get("report_text", ""),
+                    report.get("Raw Reports", {}).get("PII Report"),
+                    mode=redaction_mode
+                ))
+            except ValueError as e:
+                st.error(f"❌ Cannot produce a redacted draft: {e}")
+            else:
+                st.download_button(
+                    label=f"🔏 Download Redacted Draft ({redaction['redaction_count']} redactions)",
+                    data=redaction["redacted_text"],
+                    file_name="VidhikAI_Redacted_Draft.txt",
+                    mime="text/plain",
+                    use_container_width=True
+                )
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    # Raw Data View (only sent to the browser when asked for; an expander would send it on every rerun)
+    if st.toggle("🔍 View Complete Dataset"):
         st.json(report)
 
 # ==========================
@@ -0,0 +1,43 @@
+"""
+Shared test setup: the engine runs offline (stub embeddings) against a small
+synthetic legal DB in a temporary directory, and never writes the audit
+history or the analytics export.
+"""
+import os
+import tempfile
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = tempfile.mkdtemp(prefix="vidhik_tests_")
+
+# The engine reads its configuration at import time
+os.environ.update({
+    "VIDHIK_EMBEDDING_MODEL": "stub",
+    "VIDHIK_AUDIT_DB": "",
+    "VIDHIK_ANALYTICS_DIR": "",
+    "VIDHIK_INDEX_POLL_SECONDS": "0",
+    "VIDHIK_REDACTION_SECRET": "",
+    "VIDHIK_LEXICON_DIR": os.path.join(REPO_DIR, "data", "lexicons"),
+    "VIDHIK_FAISS_INDEX_PATH": os.path.join(DATA_DIR, "vidhik_legal_db.faiss"),
+    "VIDHIK_FAISS_METADATA_PATH": os.path.join(DATA_DIR, "vidhik_legal_db_metadata.pkl"),
+    "VIDHIK_FAISS_TEXT_STORE_PATH": os.path.join(DATA_DIR, "vidhik_legal_db_metadata.vts"),
+    "VIDHIK_NEIGHBOUR_GRAPH_PATH": os.path.join(DATA_DIR, "vidhik_legal_db_graph.npz"),
+    "VIDHIK_FAISS_SOURCES_PATH": os.path.join(DATA_DIR, "vidhik_legal_db_sources.npz"),
+    "VIDHIK_HINDI_FAISS_INDEX_PATH": os.path.join(DATA_DIR, "vidhik_legal_db_hi.faiss"),
+})
+
+LEGAL_DB_PROVISIONS = 500
+
+
+@pytest.fixture(scope="session")
+def legal_db():
+    """Builds the synthetic legal DB once; returns its provision texts."""
+    import pickle
+
+    from vidhik_loadtest import build_synthetic_corpus
+
+    build_synthetic_corpus(LEGAL_DB_PROVISIONS, os.environ["VIDHIK_FAISS_INDEX_PATH"],
+                           os.environ["VIDHIK_FAISS_METADATA_PATH"])
+    with open(os.environ["VIDHIK_FAISS_METADATA_PATH"], "rb") as f:
+        return pickle.load(f)
@@ -0,0 +1,96 @@
+import os
+import time
+
+import vidhik_engine
+from vidhik_analytics import AnalyticsWriter, dataset, most_conflicted_provisions, pii_rate_by_department
+
+
+def synthetic_report(report_hash, fingerprint, provision_ids, department="IT", pii_items=0):
+    return {
+        "Overall Status": "Medium Risk",
+        "Audit Metadata": {"Report Hash": report_hash, "Department": department,
+                           "Audited At": "2025-11-15T10:00:00", "Duration (ms)": 12.5},
+        "Raw Reports": {
+            "Conflict Report": {
+                "Legal DB Fingerprints": {"en": fingerprint},
+                "Conflicting Laws": [{"Rank": rank, "Clause": 1, "Language": "en", "Provision ID": provision_id,
+                                      "Legal Provision": f"Provision {provision_id}", "Similarity Score": 0.8,
+                                      "Risk Level": "HIGH"}
+                                     for rank, provision_id in enumerate(provision_ids, start=1)],
+            },
+            "Bias Report": {"flagged_phrases": []},
+            "PII Report": {"detected_items": [{"type": "Email Address", "value": "a@b.com", "start": 0, "end": 7}]
+                           * pii_items},
+        },
+    }
+
+
+def test_engine_reports_round_trip(legal_db, tmp_path):
+    writer = AnalyticsWriter(str(tmp_path), flush_reports=100, flush_seconds=60)
+    policy = "\n\n".join(legal_db[4:80:11])
+    reports = [vidhik_engine.analyze_policy(policy, department="Health"),
+               vidhik_engine.analyze_policy(policy + "\n\nContact a@b.com", department="IT")]
+    for report in reports:
+        writer.append(report)
+    assert writer.flush() == 2
+
+    conflicts = reports[0]["Raw Reports"]["Conflict Report"]
+    assert conflicts["Conflicting Laws"]
+    top = most_conflicted_provisions(limit=1, root=str(tmp_path))[0]
+    assert top["reports"] == 2
+    assert top["db_fingerprint"] == conflicts["Legal DB Fingerprints"]["en"]
+    assert top["provision_id"] in {law["Provision ID"] for law in conflicts["Conflicting Laws"]}
+
+    rates = {row["department"]: row for row in pii_rate_by_department(root=str(tmp_path))}
+    assert rates["IT"]["pii_rate"] == 100.0
+    assert rates["IT"]["pii_items"] == rates["Health"]["pii_items"] + 1
+    assert dataset("pii", str(tmp_path)).to_table().column_names[:3] == ["report_hash", "audited_at", "pii_type"]
+
+
+def test_provisions_of_different_dbs_are_not_merged(tmp_path):
+    writer = AnalyticsWriter(str(tmp_path))
+    writer.append(synthetic_report("a", "db-one", [7, 8]))
+    writer.append(synthetic_report("b", "db-one", [7]))
+    writer.append(synthetic_report("c", "db-two", [7]))
+    writer.flush()
+
+    rows = {(row["db_fingerprint"], row["provision_id"]): row["reports"]
+            for row in most_conflicted_provisions(root=str(tmp_path))}
+    assert rows == {("db-one", 7): 2, ("db-one", 8): 1, ("db-two", 7): 1}
+
+
+def test_background_flush_writes_without_new_reports(tmp_path):
+    writer = AnalyticsWriter(str(tmp_path), flush_reports=100, flush_seconds=0.05)
+    writer.append(synthetic_report("a", "db", [1]))
+    deadline = time.monotonic() + 5
+    while dataset("audits", str(tmp_path)) is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert dataset("audits", str(tmp_path)).count_rows() == 1
+
+
+def test_requested_flush_runs_in_the_background(tmp_path):
+    writer = AnalyticsWriter(str(tmp_path), flush_reports=100, flush_seconds=60)
+    writer.append(synthetic_report("a", "db", [1]))
+    writer.request_flush()
+    deadline = time.monotonic() + 5
+    while dataset("audits", str(tmp_path)) is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert dataset("audits", str(tmp_path)).count_rows() == 1
+
+
+def test_failed_write_drops_rows(tmp_path):
+    blocked = tmp_path / "not-a-directory"
+    blocked.write_text("")
+    writer = AnalyticsWriter(str(blocked), flush_seconds=60)
+    writer.append(synthetic_report("a", "db", [1]))
+    assert writer.flush() == 0
+    assert writer.flush() == 0
+
+
+def test_buffer_is_capped(tmp_path):
+    writer = AnalyticsWriter(str(tmp_path), flush_seconds=60, max_buffered_reports=2)
+    for report_hash in "abc":
+        writer.append(synthetic_report(report_hash, "db", [1]))
+    assert writer.dropped_reports == 1
+    assert writer.flush() == 2
+    assert sorted(os.listdir(tmp_path)) == ["audits", "conflicts"]
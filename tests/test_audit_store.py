@@ -0,0 +1,34 @@
+from vidhik_audit_store import ALL_DEPARTMENTS, DEFAULT_DEPARTMENT, AuditStore
+
+
+def test_totals_per_department_and_overall(tmp_path):
+    store = AuditStore(str(tmp_path / "audits.db"))
+    store.record("a", "Clean", department="IT")
+    store.record("b", "High Risk", department="IT")
+    store.record("c", "Medium Risk", department="Health")
+    store.record("d", "Processing Error")
+
+    overall = store.totals(ALL_DEPARTMENTS)
+    assert (overall["total"], overall["passed"], overall["warning"], overall["failed"], overall["errors"]) == (4, 1, 1, 1, 1)
+    assert overall["compliance_rate"] == round(100.0 / 3, 1)
+    assert store.totals("IT")["total"] == 2
+    assert store.totals(DEFAULT_DEPARTMENT)["errors"] == 1
+    assert [row["department"] for row in store.department_breakdown()] == ["IT", "Health", DEFAULT_DEPARTMENT]
+
+
+def test_star_is_an_ordinary_department(tmp_path):
+    store = AuditStore(str(tmp_path / "audits.db"))
+    store.record("a", "Clean", department="*")
+    store.record("b", "Clean", department="IT")
+
+    assert store.totals("*")["total"] == 1
+    assert store.totals(ALL_DEPARTMENTS)["total"] == 2
+    assert sorted(row["department"] for row in store.department_breakdown()) == ["*", "IT"]
+
+
+def test_blank_departments_are_unassigned(tmp_path):
+    store = AuditStore(str(tmp_path / "audits.db"))
+    store.record("a", "Clean", department="  ")
+    assert store.totals(DEFAULT_DEPARTMENT)["total"] == 1
+    assert store.totals(ALL_DEPARTMENTS)["total"] == 1
+
@@ -0,0 +1,67 @@
+import pickle
+
+import faiss
+import numpy as np
+
+from vidhik_binary_index import TwoTierSearcher, _synthetic_corpus, build_binary_tier, load_two_tier
+from vidhik_engine import VersionedIndex
+
+
+def build(tmp_path, vectors, metric=faiss.METRIC_L2):
+    index = faiss.IndexFlat(vectors.shape[1], metric)
+    index.add(vectors)
+    binary_path, vectors_path = str(tmp_path / "binary.faiss"), str(tmp_path / "vectors.npy")
+    build_binary_tier(index, binary_path, vectors_path)
+    return index, binary_path, vectors_path
+
+
+def queries_near(corpus, count=100, seed=1):
+    queries = corpus[np.random.default_rng(seed).integers(0, len(corpus), count)]
+    queries = queries + 0.3 * np.random.default_rng(seed + 1).standard_normal(queries.shape).astype("float32") \
+        / np.sqrt(corpus.shape[1])
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def test_recall_against_flat_search(tmp_path):
+    corpus = _synthetic_corpus(5000, 64, clusters=100)
+    queries = queries_near(corpus)
+    for metric in (faiss.METRIC_L2, faiss.METRIC_INNER_PRODUCT):
+        index, binary_path, vectors_path = build(tmp_path, corpus, metric)
+        searcher = load_two_tier(binary_path, vectors_path, metric_type=metric)
+        assert isinstance(searcher, TwoTierSearcher)
+
+        k = 5
+        exact_D, exact_I = index.search(queries, k)
+        D, I = searcher.search(queries, k)
+        recall = np.mean([len(set(a) & set(e)) / k for a, e in zip(I, exact_I)])
+        assert recall >= 0.9
+        # Reranked scores are exact, in the metric of the original index
+        hits = I[:, 0] == exact_I[:, 0]
+        np.testing.assert_allclose(D[hits, 0], exact_D[hits, 0], rtol=1e-4, atol=1e-4)
+
+
+def test_short_results_are_padded(tmp_path):
+    corpus = _synthetic_corpus(5, 16, clusters=2)
+    _, binary_path, vectors_path = build(tmp_path, corpus, faiss.METRIC_INNER_PRODUCT)
+    searcher = load_two_tier(binary_path, vectors_path, metric_type=faiss.METRIC_INNER_PRODUCT)
+
+    D, I = searcher.search(corpus[:2], 8)
+    assert I.shape == (2, 8)
+    assert sorted(I[0, :5]) == [0, 1, 2, 3, 4]
+    assert (I[:, 5:] == -1).all() and np.isneginf(D[:, 5:]).all()
+
+
+def test_binary_mode_snapshot_searches_the_tier(tmp_path):
+    corpus = _synthetic_corpus(300, 32, clusters=10)
+    index, binary_path, vectors_path = build(tmp_path, corpus, faiss.METRIC_INNER_PRODUCT)
+    index_path, metadata_path = str(tmp_path / "db.faiss"), str(tmp_path / "db_metadata.pkl")
+    faiss.write_index(index, index_path)
+    with open(metadata_path, "wb") as f:
+        pickle.dump([f"provision {i}" for i in range(len(corpus))], f)
+
+    snapshot = VersionedIndex(index_path, metadata_path, binary_index_path=binary_path,
+                              vectors_path=vectors_path, poll_interval=0).current()
+    assert isinstance(snapshot.searcher, TwoTierSearcher)
+    assert snapshot.index.ntotal == len(corpus)
+    _, I = snapshot.searcher.search(corpus[[7]], 1)
+    assert I[0, 0] == 7
@@ -0,0 +1,57 @@
+import random
+
+from vidhik_engine import MAX_CLAUSE_CHARS, split_clauses
+
+
+def assert_valid_spans(text, spans):
+    previous_end = 0
+    for start, end in spans:
+        assert previous_end <= start < end <= len(text)
+        assert end - start <= MAX_CLAUSE_CHARS
+        assert not text[start].isspace() and not text[end - 1].isspace()
+        previous_end = end
+
+
+def test_paragraphs_are_clauses():
+    text = "First clause.\n\n  Second clause.  \n\n\n"
+    assert [text[s:e] for s, e in split_clauses(text)] == ["First clause.", "Second clause."]
+
+
+def test_blank_text_yields_one_span():
+    assert split_clauses("  \n ") == [(0, 4)]
+
+
+def test_long_paragraph_split_at_sentences():
+    sentence = "The department shall retain records for seven years. "
+    text = sentence * 60
+    spans = split_clauses(text)
+    assert len(spans) > 1
+    assert_valid_spans(text, spans)
+    assert all(text[s:e].endswith(".") for s, e in spans)
+
+
+def test_long_sentence_mid_paragraph_is_wrapped_at_whitespace():
+    text = "Short opening. " + " ".join(["word"] * 600) + ". Short closing."
+    spans = split_clauses(text)
+    assert_valid_spans(text, spans)
+    words = " ".join(text[s:e] for s, e in spans).split()
+    assert words == text.split()
+
+
+def test_unbroken_text_is_cut_at_the_limit():
+    text = "Intro. " + "x" * (3 * MAX_CLAUSE_CHARS + 5) + " end."
+    spans = split_clauses(text)
+    assert_valid_spans(text, spans)
+    assert max(e - s for s, e in spans) == MAX_CLAUSE_CHARS
+
+
+def test_random_texts_stay_within_bounds():
+    rng = random.Random(7)
+    pieces = ["a", "bb", "ccc" * 50, "x" * 1500, ". ", "; ", " ", "  ", "\n", "\n\n", "। "]
+    for _ in range(200):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 80)))
+        spans = split_clauses(text)
+        if text.strip():
+            assert_valid_spans(text, spans)
+            # Only whitespace falls between clauses
+            assert "".join("".join(text[s:e] for s, e in spans).split()) == "".join(text.split())
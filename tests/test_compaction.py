@@ -0,0 +1,47 @@
+import faiss
+import numpy as np
+import pytest
+
+from vidhik_compaction import compact_legal_db, load_sources
+from vidhik_engine import RISK_HIGH, ConflictFinding, IndexSnapshot, format_conflicts
+
+
+def build_index():
+    rng = np.random.default_rng(3)
+    base = rng.normal(size=(4, 16)).astype("float32")
+    # Provisions 0, 2 and 5 are near copies of one another, as are 1 and 4
+    vectors = np.vstack([base[0], base[1], base[0] * 1.001, base[2], base[1], base[0], base[3]])
+    index = faiss.IndexFlatIP(16)
+    index.add(vectors / np.linalg.norm(vectors, axis=1, keepdims=True))
+    texts = [f"Section {i} of the Act, as amended" for i in range(len(vectors))]
+    return index, texts
+
+
+def test_sources_map_keeps_merged_previews(tmp_path):
+    index, texts = build_index()
+    stats = compact_legal_db(index, texts, threshold=0.99, output_dir=str(tmp_path))
+    assert (stats["provisions"], stats["representatives"]) == (7, 4)
+
+    sources = load_sources(stats["sources_path"])
+    assert sources.of(0).tolist() == [0, 2, 5]
+    assert sources.texts_of(0) == [texts[0], texts[2], texts[5]]
+    assert sources.texts_of(3) == [texts[6]]
+
+
+def test_maps_without_previews_are_rejected(tmp_path):
+    path = str(tmp_path / "sources.npz")
+    np.savez(path, indptr=np.array([0, 2, 3]), sources=np.array([0, 2, 1], dtype="int32"))
+    with pytest.raises(ValueError):
+        load_sources(path)
+
+
+def test_conflicts_list_merged_provision_texts(tmp_path):
+    index, texts = build_index()
+    stats = compact_legal_db(index, texts, threshold=0.99, output_dir=str(tmp_path))
+    snapshot = IndexSnapshot(None, [texts[0], texts[1], texts[3], texts[6]], 1, 0.0, None, None,
+                             load_sources(stats["sources_path"]), "0" * 16)
+    findings = [ConflictFinding(1, 0, 0.9, RISK_HIGH, "en"), ConflictFinding(2, 3, 0.8, RISK_HIGH, "en")]
+
+    conflicts = format_conflicts(findings, {"en": snapshot})
+    assert conflicts[0]["Merged Provisions"] == [texts[2], texts[5]]
+    assert "Merged Provisions" not in conflicts[1]
@@ -0,0 +1,55 @@
+import numpy as np
+
+import vidhik_engine
+from vidhik_dedup import DraftIndex, minhash_signature
+
+
+def make_policy(legal_db, clauses=12, offset=0):
+    return "\n\n".join(legal_db[offset + i * 7] for i in range(clauses))
+
+
+def duplicate_check(report):
+    return report["Raw Reports"]["Near-Duplicate Check"]
+
+
+def test_exact_resubmission_reuses_every_clause(legal_db):
+    policy = make_policy(legal_db, offset=1)
+    first = vidhik_engine.analyze_policy(policy)
+    assert duplicate_check(first)["Status"] == "New draft"
+    assert duplicate_check(first)["Clauses Analysed"] == 12
+
+    second = vidhik_engine.analyze_policy(policy)
+    check = duplicate_check(second)
+    assert check["Status"] == "Exact duplicate"
+    assert check["Estimated Similarity"] == 1.0
+    assert (check["Clauses Reused"], check["Clauses Analysed"]) == (12, 0)
+    assert second["Raw Reports"]["Conflict Report"]["Conflicting Laws"] == \
+        first["Raw Reports"]["Conflict Report"]["Conflicting Laws"]
+
+
+def test_near_duplicate_reuses_unchanged_clauses(legal_db):
+    clauses = [legal_db[2 + i * 7] for i in range(40)]
+    vidhik_engine.analyze_policy("\n\n".join(clauses))
+
+    clauses[5] = clauses[5] + " This clause was amended."
+    check = duplicate_check(vidhik_engine.analyze_policy("\n\n".join(clauses)))
+    assert check["Status"] == "Near duplicate"
+    assert (check["Clauses Reused"], check["Clauses Analysed"]) == (39, 1)
+
+
+def test_draft_index_get_and_find():
+    index = DraftIndex(threshold=0.9, max_drafts=2)
+    text = " ".join(f"word{i}" for i in range(300))
+    signature = minhash_signature(text)
+    index.add("a", signature, {"n": 1})
+
+    assert index.get("a").payload == {"n": 1}
+    assert index.get("missing") is None
+    draft, similarity = index.find(minhash_signature(text + " extra"))
+    assert draft.draft_id == "a" and similarity >= 0.9
+    draft, _ = index.find(minhash_signature(" ".join(f"other{i}" for i in range(300))))
+    assert draft is None
+
+    index.add("b", np.array(signature), {})
+    index.add("c", np.array(signature), {})
+    assert len(index) == 2 and index.get("a") is None
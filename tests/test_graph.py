@@ -0,0 +1,106 @@
+import os
+import pickle
+
+import faiss
+import numpy as np
+import pytest
+
+import vidhik_graph
+from vidhik_engine import VersionedIndex
+from vidhik_graph import build_neighbour_graph, load_neighbour_graph
+
+DIM = 16
+
+
+def clustered_index(count, seed=0):
+    """A flat L2 index over unit vectors in tight clusters of five, so every provision has close neighbours."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(count // 5 + 1, DIM))
+    vectors = centres[np.arange(count) // 5] + rng.normal(scale=0.05, size=(count, DIM))
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype("float32")
+    index = faiss.IndexFlatL2(DIM)
+    index.add(vectors)
+    return index, vectors
+
+
+def test_graph_is_stored_as_csr(tmp_path, monkeypatch):
+    # Several build batches, so row order across batches is covered too
+    monkeypatch.setattr(vidhik_graph, "BUILD_BATCH_SIZE", 16)
+    index, vectors = clustered_index(50)
+    path = str(tmp_path / "graph.npz")
+    stats = build_neighbour_graph(index, path, k=3, min_similarity=0.5)
+    graph = load_neighbour_graph(path)
+
+    assert len(graph) == stats["provisions"] == 50
+    assert (graph.indptr.dtype, graph.indices.dtype, graph.scores.dtype) == (np.int64, np.int32, np.float16)
+    assert graph.indptr[-1] == len(graph.indices) == stats["edges"] == 50 * 3
+
+    distances = ((vectors[:, None, :] - vectors[None, :, :]) ** 2).sum(axis=2)
+    similarity = 1 - distances
+    for i in range(50):
+        ids, scores = graph.neighbours(i)
+        order = [j for j in np.argsort(-similarity[i]) if j != i and similarity[i, j] > 0.5][:3]
+        assert list(ids) == order
+        np.testing.assert_allclose(scores, similarity[i, order], atol=1e-2)
+        assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_build_replaces_the_graph_atomically(tmp_path, monkeypatch):
+    path = str(tmp_path / "graph.npz")
+    build_neighbour_graph(clustered_index(20)[0], path, k=2)
+    before = open(path, "rb").read()
+
+    def failing_savez(f, **arrays):
+        f.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "savez", failing_savez)
+    with pytest.raises(OSError):
+        build_neighbour_graph(clustered_index(30, seed=1)[0], path, k=2)
+    assert open(path, "rb").read() == before
+    assert len(load_neighbour_graph(path)) == 20
+
+    monkeypatch.undo()
+    build_neighbour_graph(clustered_index(30, seed=1)[0], path, k=2)
+    assert len(load_neighbour_graph(path)) == 30
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_inconsistent_arrays_are_rejected(tmp_path):
+    path = str(tmp_path / "graph.npz")
+    np.savez(path, indptr=np.array([0, 2, 5]), indices=np.zeros(4, dtype="int32"),
+             scores=np.zeros(4, dtype="float16"))
+    with pytest.raises(ValueError):
+        load_neighbour_graph(path)
+
+
+def write_db(directory, index):
+    index_path = os.path.join(directory, "db.faiss")
+    metadata_path = os.path.join(directory, "db_metadata.pkl")
+    faiss.write_index(index, index_path)
+    with open(metadata_path, "wb") as f:
+        pickle.dump([f"provision {i}" for i in range(index.ntotal)], f)
+    return index_path, metadata_path
+
+
+def test_snapshot_carries_a_matching_graph(tmp_path):
+    index, _ = clustered_index(20)
+    index_path, metadata_path = write_db(tmp_path, index)
+    graph_path = str(tmp_path / "graph.npz")
+    build_neighbour_graph(index, graph_path, k=2)
+
+    snapshot = VersionedIndex(index_path, metadata_path, graph_path=graph_path, poll_interval=0).current()
+    assert len(snapshot.neighbours) == 20
+    assert len(snapshot.neighbours.neighbours(0)[0]) == 2
+
+
+def test_graph_of_another_index_is_dropped(tmp_path, capsys):
+    index_path, metadata_path = write_db(tmp_path, clustered_index(20)[0])
+    graph_path = str(tmp_path / "graph.npz")
+    build_neighbour_graph(clustered_index(25)[0], graph_path, k=2)
+
+    snapshot = VersionedIndex(index_path, metadata_path, graph_path=graph_path, poll_interval=0).current()
+    # The index itself is still served, only without conflict expansion
+    assert snapshot.index.ntotal == 20
+    assert snapshot.neighbours is None
+    assert "graph has 25 provisions but index has 20" in capsys.readouterr().out
@@ -0,0 +1,39 @@
+import threading
+
+import vidhik_engine
+from vidhik_engine import INFERENCE_WORKERS, VidhikEngine, get_inference_executor
+
+
+def test_models_share_one_bounded_executor():
+    english = VidhikEngine("stub")
+    hindi = VidhikEngine("stub-hi")
+    assert english._executor is hindi._executor is get_inference_executor()
+    assert get_inference_executor()._max_workers == INFERENCE_WORKERS
+
+
+def test_concurrent_passes_are_bounded_across_models(monkeypatch):
+    running, peak = 0, 0
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def slow_encode(self, texts):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        release.wait(timeout=5)
+        with lock:
+            running -= 1
+        return None
+
+    monkeypatch.setattr(VidhikEngine, "_encode", slow_encode)
+    engines = [VidhikEngine("stub"), VidhikEngine("stub-hi")]
+    threads = [threading.Thread(target=engines[i % 2].encode, args=(["text"],))
+               for i in range(2 * INFERENCE_WORKERS + 2)]
+    for thread in threads:
+        thread.start()
+    threading.Timer(0.2, release.set).start()
+    for thread in threads:
+        thread.join()
+    assert peak <= INFERENCE_WORKERS
+    assert vidhik_engine.get_inference_executor() is engines[0]._executor
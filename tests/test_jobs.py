@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+import vidhik_jobs
+from vidhik_jobs import DONE, FAILED, QUEUED, RUNNING, AuditJobScheduler
+
+
+class FakeAudits:
+    """Stands in for analyze_policy: records start order and blocks each audit until released."""
+
+    def __init__(self):
+        self.started = []
+        self.gates = {}
+        self._lock = threading.Lock()
+
+    def gate(self, text):
+        with self._lock:
+            return self.gates.setdefault(text, threading.Event())
+
+    def __call__(self, text, similarity_threshold=0.3, department=None, progress_callback=None, mode="standard"):
+        with self._lock:
+            self.started.append(text)
+        if not self.gate(text).wait(timeout=10):
+            raise TimeoutError(text)
+        return {"Overall Status": "Clean", "text": text}
+
+
+@pytest.fixture
+def audits(monkeypatch):
+    fake = FakeAudits()
+    monkeypatch.setattr(vidhik_jobs, "analyze_policy", fake)
+    monkeypatch.setattr(vidhik_jobs, "SMALL_JOB_CHARS", 10)
+    yield fake
+    for gate in list(fake.gates.values()):
+        gate.set()
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_small_jobs_jump_ahead_of_queued_bulk_jobs(audits):
+    scheduler = AuditJobScheduler(workers=1)
+    first = scheduler.submit_text("bulk draft one")
+    wait_until(lambda: audits.started == ["bulk draft one"])
+
+    second = scheduler.submit_text("bulk draft two")
+    small = scheduler.submit_text("small")
+    assert scheduler.queue_position(small) == 0
+    assert scheduler.queue_position(second) == 1
+
+    for text in ("bulk draft one", "small", "bulk draft two"):
+        audits.gate(text).set()
+    for job_id in (first, small, second):
+        assert scheduler.get(job_id).wait(timeout=5)
+    assert audits.started == ["bulk draft one", "small", "bulk draft two"]
+    assert scheduler.get(small).report["text"] == "small"
+
+
+def test_bulk_jobs_leave_a_worker_for_small_ones(audits):
+    scheduler = AuditJobScheduler(workers=2)
+    assert scheduler.bulk_limit == 1
+    bulk = [scheduler.submit_text(f"bulk draft {i}") for i in range(3)]
+    wait_until(lambda: len(audits.started) == 1)
+    time.sleep(0.1)
+    assert [scheduler.get(job_id).status for job_id in bulk] == [RUNNING, QUEUED, QUEUED]
+
+    small = scheduler.submit_text("small")
+    audits.gate("small").set()
+    assert scheduler.get(small).wait(timeout=5)
+    assert scheduler.get(small).status == DONE
+    assert scheduler.get(bulk[0]).status == RUNNING
+
+
+def test_failed_extraction_fails_the_job(audits, monkeypatch):
+    def broken_extract(data, mime_type, progress_callback=None):
+        raise ValueError("corrupt PDF")
+
+    monkeypatch.setattr(vidhik_jobs, "extract_document_text", broken_extract)
+    scheduler = AuditJobScheduler(workers=1)
+    job = scheduler.get(scheduler.submit_document(b"%PDF-", "application/pdf"))
+    assert job.wait(timeout=5)
+    assert (job.status, job.error, job.progress["stage"]) == (FAILED, "corrupt PDF", FAILED)
+
+    # The worker carries on with the next job
+    audits.gate("small").set()
+    assert scheduler.get(scheduler.submit_text("small")).wait(timeout=5)
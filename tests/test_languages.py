@@ -0,0 +1,71 @@
+import os
+import pickle
+
+import faiss
+
+import vidhik_engine
+from vidhik_engine import LANGUAGE_MODELS, VersionedIndex, analyze_policy, detect_language, get_engine
+
+HINDI_PROVISIONS = [
+    "कोई भी व्यक्ति बिना अनुमति के सरकारी भूमि पर निर्माण नहीं करेगा।",
+    "आवेदक को तीस दिनों के भीतर शुल्क जमा करना होगा।",
+    "जिला मजिस्ट्रेट को निरीक्षण करने का अधिकार होगा।",
+]
+
+
+def test_detect_language_routes_by_script():
+    assert detect_language(HINDI_PROVISIONS[0]) == "hi"
+    assert detect_language("No person shall build on government land.") == "en"
+    # Mostly Latin text with a Devanagari name stays English
+    assert detect_language("The Collector of जिला Dehradun may inspect the site.") == "en"
+    assert detect_language("12.3 (a) -- §") == "en"
+
+
+def test_hindi_clauses_without_a_hindi_db_are_partial(legal_db):
+    assert not os.path.exists(vidhik_engine.HINDI_FAISS_INDEX_PATH)
+    report = analyze_policy(legal_db[11] + "\n\n" + HINDI_PROVISIONS[1])
+    conflict_report = report["Raw Reports"]["Conflict Report"]
+    assert conflict_report["Status"] == "Partial"
+    assert conflict_report["Clauses by Language"] == {"en": 1, "hi": 1}
+    assert conflict_report["Clauses Without a Legal DB"] == 1
+    assert list(conflict_report["Index Versions"]) == ["en"]
+    assert "no legal DB is installed for hi" in report["Actionable Recommendations"]
+
+
+def test_hindi_clauses_are_searched_in_the_hindi_db(legal_db, monkeypatch, tmp_path):
+    index_path, metadata_path = str(tmp_path / "hi.faiss"), str(tmp_path / "hi_metadata.pkl")
+    vectors = get_engine(LANGUAGE_MODELS["hi"]).encode(HINDI_PROVISIONS)
+    index = faiss.IndexFlatL2(vectors.shape[1])
+    index.add(vectors)
+    faiss.write_index(index, index_path)
+    with open(metadata_path, "wb") as f:
+        pickle.dump(HINDI_PROVISIONS, f)
+    monkeypatch.setitem(vidhik_engine.LANGUAGE_INDEXES, "hi", VersionedIndex(index_path, metadata_path,
+                                                                              poll_interval=0))
+
+    report = analyze_policy(legal_db[11] + "\n\n" + HINDI_PROVISIONS[1])
+    conflict_report = report["Raw Reports"]["Conflict Report"]
+    assert conflict_report["Status"] == "Success"
+    assert sorted(conflict_report["Index Versions"]) == ["en", "hi"]
+    hindi = [conflict for conflict in conflict_report["Conflicting Laws"] if conflict["Language"] == "hi"]
+    assert hindi[0]["Clause"] == 2
+    assert hindi[0]["Provision ID"] == 1
+    assert hindi[0]["Legal Provision"] == HINDI_PROVISIONS[1]
+
+
+def test_reload_covers_every_installed_language(monkeypatch, tmp_path):
+    class RecordingIndex:
+        def __init__(self, index_path):
+            self.index_path = index_path
+            self.reloads = 0
+
+        def request_reload(self):
+            self.reloads += 1
+
+    installed = tmp_path / "installed.faiss"
+    installed.write_bytes(b"")
+    indexes = {"en": RecordingIndex(str(tmp_path / "en.faiss")), "hi": RecordingIndex(str(installed)),
+               "mr": RecordingIndex(str(tmp_path / "missing.faiss"))}
+    monkeypatch.setattr(vidhik_engine, "LANGUAGE_INDEXES", indexes)
+    vidhik_engine.request_reload()
+    assert {language: index.reloads for language, index in indexes.items()} == {"en": 1, "hi": 1, "mr": 0}
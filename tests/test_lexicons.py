@@ -0,0 +1,97 @@
+import importlib
+import json
+import os
+
+import vidhik_engine
+import vidhik_lexicons
+from vidhik_lexicons import LexiconRegistry, bias_matchers, pii_patterns
+
+POLICY = "Aadhaar 2345 6789 0123 must be shown by the common man. Contact a@b.com."
+
+
+def write_lexicon(directory, name, document):
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+        json.dump(document, f)
+
+
+def bias_document(phrases, version="1"):
+    return {"kind": "bias", "language": "en", "version": version, "categories": {"Test Bias": phrases}}
+
+
+def test_default_directory_does_not_depend_on_working_directory(monkeypatch, tmp_path):
+    monkeypatch.delenv("VIDHIK_LEXICON_DIR")
+    monkeypatch.chdir(tmp_path)
+    try:
+        module = importlib.reload(vidhik_lexicons)
+        assert os.path.isabs(module.LEXICON_DIR)
+        lexicons = LexiconRegistry(module.LEXICON_DIR, poll_interval=0).current()
+        assert lexicons.bias and lexicons.pii
+    finally:
+        monkeypatch.undo()
+        importlib.reload(vidhik_lexicons)
+
+
+def test_shipped_lexicons_load():
+    lexicons = LexiconRegistry(os.environ["VIDHIK_LEXICON_DIR"], poll_interval=0).current()
+    assert {"en", "hi"} <= set(lexicons.bias)
+    assert [pii_type for pii_type, _ in pii_patterns(lexicons, "en")][0] == "Email Address"
+    assert lexicons.placeholders["Aadhaar Number"] == "AADHAAR"
+
+
+def test_files_of_one_language_are_merged(tmp_path):
+    write_lexicon(tmp_path, "a.json", bias_document(["first phrase"]))
+    write_lexicon(tmp_path, "b.json", bias_document(["second phrase"]))
+    lexicons = LexiconRegistry(str(tmp_path), poll_interval=0).current()
+    found = [phrase for matcher in bias_matchers(lexicons, "en")
+             for phrase, _ in matcher.find("The second phrase follows the first phrase.")]
+    assert found == ["first phrase", "second phrase"]
+
+
+def test_changed_files_are_reloaded(tmp_path):
+    write_lexicon(tmp_path, "bias.json", bias_document(["old phrase"], version="1"))
+    registry = LexiconRegistry(str(tmp_path), poll_interval=0)
+    assert "bias.en@1" in registry.current().version
+
+    write_lexicon(tmp_path, "bias.json", bias_document(["new phrase", "another phrase"], version="2"))
+    lexicons = registry.current()
+    assert "bias.en@2" in lexicons.version
+    assert bias_matchers(lexicons, "en")[0].find("a new phrase") == [("new phrase", "Test Bias")]
+
+
+def test_broken_file_keeps_the_current_set(tmp_path):
+    write_lexicon(tmp_path, "bias.json", bias_document(["old phrase"]))
+    registry = LexiconRegistry(str(tmp_path), poll_interval=0)
+    lexicons = registry.current()
+
+    with open(os.path.join(tmp_path, "bias.json"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert registry.current() is lexicons
+
+
+def test_missing_lexicons_are_a_scan_error(legal_db, monkeypatch, tmp_path):
+    registry = LexiconRegistry(str(tmp_path), poll_interval=0)
+    monkeypatch.setattr(vidhik_engine, "get_lexicons", registry.current)
+
+    for mode in ("quick", "standard"):
+        report = vidhik_engine.analyze_policy(POLICY, mode=mode)
+        assert report["Overall Status"] == "Scan Error"
+        assert report["Raw Reports"]["Bias Report"]["Status"] == "Failed"
+        assert report["Raw Reports"]["PII Report"]["status"] == "Error"
+        assert "Scanner Error" in report["Actionable Recommendations"]
+
+
+def test_broken_first_load_is_a_scan_error(monkeypatch, tmp_path):
+    with open(os.path.join(tmp_path, "bias.json"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+    registry = LexiconRegistry(str(tmp_path), poll_interval=0)
+    monkeypatch.setattr(vidhik_engine, "get_lexicons", registry.current)
+
+    assert vidhik_engine.analyze_policy(POLICY, mode="quick")["Overall Status"] == "Scan Error"
+
+
+def test_loaded_lexicons_find_everything():
+    report = vidhik_engine.analyze_policy(POLICY, mode="quick")
+    assert report["Overall Status"] == "High Risk"
+    assert report["Raw Reports"]["Bias Report"]["Status"] == "Success"
+    assert {item["type"] for item in report["Raw Reports"]["PII Report"]["detected_items"]} >= \
+        {"Aadhaar Number", "Email Address"}
@@ -0,0 +1,66 @@
+import pytest
+
+import vidhik_engine
+from vidhik_engine import analyze_policy
+from vidhik_graph import build_neighbour_graph, load_neighbour_graph
+
+DRAFT = "Applicant Aadhaar 2345 6789 0123 is on file."
+
+
+class RecordingStore:
+    def __init__(self):
+        self.recorded = []
+
+    def record(self, report_hash, status, **kwargs):
+        self.recorded.append(report_hash)
+
+
+@pytest.fixture
+def audit_store(monkeypatch):
+    store = RecordingStore()
+    monkeypatch.setattr(vidhik_engine, "AUDIT_DB_PATH", "audit.db")
+    monkeypatch.setattr(vidhik_engine, "get_audit_store", lambda: store)
+    return store
+
+
+def test_quick_mode_skips_retrieval_and_history(audit_store, monkeypatch):
+    def no_retrieval(*args, **kwargs):
+        raise AssertionError("quick mode must not load the model or the legal DB")
+
+    monkeypatch.setattr(vidhik_engine, "current_snapshot", no_retrieval)
+    monkeypatch.setattr(vidhik_engine, "get_engine", no_retrieval)
+    report = analyze_policy(DRAFT, mode="quick")
+
+    assert report["Audit Metadata"]["Analysis Mode"] == "quick"
+    assert report["Raw Reports"]["Conflict Report"]["Status"] == "Not Run"
+    assert report["Raw Reports"]["PII Report"]["pii_found"]
+    assert report["Overall Status"] == "High Risk"
+    assert audit_store.recorded == []
+
+
+def test_full_audits_are_recorded(legal_db, audit_store):
+    report = analyze_policy(legal_db[7])
+    assert audit_store.recorded == [report["Audit Metadata"]["Report Hash"]]
+
+
+def test_deep_mode_lists_more_related_provisions(legal_db, monkeypatch, tmp_path):
+    snapshot = vidhik_engine.current_snapshot()
+    graph_path = str(tmp_path / "graph.npz")
+    build_neighbour_graph(snapshot.index, graph_path, k=12, min_similarity=0)
+    snapshot = snapshot._replace(neighbours=load_neighbour_graph(graph_path))
+    monkeypatch.setattr(vidhik_engine, "current_snapshot",
+                        lambda language=vidhik_engine.DEFAULT_LANGUAGE: snapshot if language == "en" else None)
+
+    draft = "\n\n".join(legal_db[3:60:9])
+    related = {}
+    for mode in ("standard", "deep"):
+        conflicts = analyze_policy(draft, mode=mode)["Raw Reports"]["Conflict Report"]["Conflicting Laws"]
+        assert conflicts
+        related[mode] = max(len(conflict["Related Provisions"]) for conflict in conflicts)
+    assert related == {"standard": vidhik_engine.RELATED_PROVISIONS["standard"],
+                       "deep": vidhik_engine.RELATED_PROVISIONS["deep"]}
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        analyze_policy(DRAFT, mode="thorough")
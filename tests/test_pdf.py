@@ -0,0 +1,42 @@
+import threading
+
+import pytest
+
+import vidhik_pdf
+from vidhik_pdf import PdfRenderCache
+
+REPORT = {"Overall Status": "Clean", "Actionable Recommendations": "### ✅ Bias Analysis", "Raw Reports": {}}
+
+
+def test_render_is_cached_per_report():
+    pytest.importorskip("reportlab")
+    cache = PdfRenderCache()
+    future = cache.submit(REPORT)
+    assert future.result(timeout=30).startswith(b"%PDF")
+    assert cache.submit(REPORT) is future
+
+
+def test_failed_render_is_retried(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def build_pdf(report):
+        calls.append(report)
+        release.wait(5)
+        if len(calls) == 1:
+            raise RuntimeError("render failed")
+        return b"%PDF-retry"
+
+    monkeypatch.setattr(vidhik_pdf, "build_pdf", build_pdf)
+    cache = PdfRenderCache()
+    failed = cache.submit(REPORT)
+    # Still rendering: the same future is handed out
+    assert cache.submit(REPORT) is failed
+    release.set()
+    with pytest.raises(RuntimeError):
+        failed.result(timeout=5)
+
+    retried = cache.submit(REPORT)
+    assert retried is not failed
+    assert retried.result(timeout=5) == b"%PDF-retry"
+    assert len(calls) == 2
@@ -0,0 +1,102 @@
+import pytest
+
+import vidhik_engine
+from vidhik_engine import detect_pii, redact_pii, restore_redacted
+from vidhik_lexicons import LexiconRegistry, compile_lexicons
+
+DRAFT = ("Contact the nodal officer at officer@uk.gov.in or 9876543210. "
+         "Applicant Aadhaar 2345 6789 0123 and PAN ABCDE1234F are on file.")
+
+
+def test_placeholder_redaction_removes_every_value():
+    redaction = redact_pii(DRAFT)
+    text = redaction["redacted_text"]
+    for value in ("officer@uk.gov.in", "9876543210", "2345 6789 0123", "ABCDE1234F"):
+        assert value not in text
+    for label in ("[EMAIL]", "[PHONE]", "[AADHAAR]", "[PAN]"):
+        assert label in text
+    assert redaction["redaction_count"] == 4
+
+
+def test_redaction_round_trips_through_the_mapping():
+    for mode in ("placeholder", "mask"):
+        redaction = redact_pii(DRAFT, detect_pii(DRAFT), mode=mode)
+        assert restore_redacted(redaction["redacted_text"], redaction["mapping"]) == DRAFT
+
+
+def test_mask_keeps_separators_and_last_four():
+    text = redact_pii("Aadhaar 2345 6789 0123", mode="mask")["redacted_text"]
+    assert text == "Aadhaar XXXX XXXX 0123"
+
+
+def test_overlapping_matches_are_redacted_once():
+    # A 16-digit card number also contains phone-number-like digit runs
+    redaction = redact_pii("Card 4111 1111 1111 1111 on file")
+    assert redaction["redacted_text"] == "Card [CARD] on file"
+
+
+def test_hash_mode_requires_a_secret(monkeypatch):
+    monkeypatch.setattr(vidhik_engine, "REDACTION_SECRET", "")
+    with pytest.raises(ValueError):
+        redact_pii(DRAFT, mode="hash")
+    assert "hash" not in vidhik_engine.redaction_modes()
+
+
+def test_hash_mode_is_keyed(monkeypatch):
+    first = redact_pii(DRAFT, mode="hash", secret="key-1")["redacted_text"]
+    second = redact_pii(DRAFT, mode="hash", secret="key-2")["redacted_text"]
+    assert "2345 6789 0123" not in first
+    assert first != second
+    monkeypatch.setattr(vidhik_engine, "REDACTION_SECRET", "key-1")
+    assert "hash" in vidhik_engine.redaction_modes()
+    assert redact_pii(DRAFT, mode="hash")["redacted_text"] == first
+
+
+def test_unknown_pii_types_get_a_derived_label():
+    pii_results = {"status": "PII Found",
+                   "detected_items": [{"type": "Voter ID", "value": "ABC1234567", "start": 6, "end": 16}]}
+    assert redact_pii("Voter ABC1234567", pii_results)["redacted_text"] == "Voter [VOTER_ID]"
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        redact_pii(DRAFT, mode="shred")
+
+
+@pytest.mark.parametrize("pii_report", [
+    # "Database Error" and "Processing Error" reports: the scan never ran
+    {"Status": "Not Run", "pii_found": False, "detected_items": []},
+    # "Scan Error" report: the scan failed
+    {"pii_found": False, "detected_items": [], "status": "Error"},
+])
+def test_error_reports_are_not_trusted(pii_report):
+    redaction = redact_pii(DRAFT, pii_report)
+    assert redaction["redaction_count"] == 4
+    assert "2345 6789 0123" not in redaction["redacted_text"]
+
+
+def test_clean_report_is_trusted():
+    clean = {"pii_found": False, "detected_items": [], "status": "Clean"}
+    assert redact_pii(DRAFT, clean)["redacted_text"] == DRAFT
+
+
+def test_rescan_uses_the_patterns_of_each_language():
+    text = "आवेदक का आधार २३४५ ६७८९ ०१२३ है और ईमेल officer@uk.gov.in है।"
+    redacted = redact_pii(text, {"Status": "Not Run", "detected_items": []})["redacted_text"]
+    assert redacted == "आवेदक का आधार [AADHAAR] है और ईमेल [EMAIL] है।"
+
+
+def test_rescan_without_patterns_is_refused(monkeypatch, tmp_path):
+    monkeypatch.setattr(vidhik_engine, "get_lexicons", LexiconRegistry(str(tmp_path), poll_interval=0).current)
+    with pytest.raises(ValueError):
+        redact_pii(DRAFT)
+
+
+def test_placeholders_come_from_the_lexicons(monkeypatch):
+    lexicons = compile_lexicons([("pii.json", {
+        "kind": "pii", "language": "*",
+        "patterns": {"Aadhaar Number": r"\b[2-9][0-9]{3}\s[0-9]{4}\s[0-9]{4}\b"},
+        "placeholders": {"Aadhaar Number": "UID"},
+    })])
+    monkeypatch.setattr(vidhik_engine, "get_lexicons", lambda: lexicons)
+    assert redact_pii("Aadhaar 2345 6789 0123")["redacted_text"] == "Aadhaar [UID]"
@@ -0,0 +1,30 @@
+import vidhik_engine
+from vidhik_engine import ConflictFinding, RISK_HIGH, calculate_overall_status, generate_recommendations
+
+NO_PII = {"pii_found": False, "detected_items": []}
+
+
+def test_scores_are_numbers_in_reports(legal_db):
+    report = vidhik_engine.analyze_policy("\n\n".join(legal_db[3:60:9]))
+    conflicts = report["Raw Reports"]["Conflict Report"]["Conflicting Laws"]
+    assert conflicts
+    for conflict in conflicts:
+        assert isinstance(conflict["Similarity Score"], float)
+        assert isinstance(conflict["Provision ID"], int)
+        for related in conflict.get("Related Provisions", []):
+            assert isinstance(related["Similarity Score"], float)
+
+
+def test_status_and_recommendations_accept_report_entries():
+    laws = [{"Risk Level": "HIGH", "Similarity Score": "0.812", "Legal Provision": "Section 4 of the Act"}]
+    assert calculate_overall_status(laws, [], NO_PII) == "High Risk"
+    assert calculate_overall_status([], [], NO_PII) == "Clean"
+    recommendations = generate_recommendations(laws, [], NO_PII)
+    assert "similarity 0.812: Section 4 of the Act" in recommendations
+
+
+def test_recommendations_for_records_default_to_loaded_db(legal_db):
+    finding = ConflictFinding(1, 0, 0.9, RISK_HIGH, "en")
+    assert calculate_overall_status([finding], [], NO_PII) == "High Risk"
+    recommendations = generate_recommendations([finding], [], NO_PII)
+    assert f"similarity 0.900: {legal_db[0][:40]}" in recommendations
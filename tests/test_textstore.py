@@ -0,0 +1,51 @@
+import pickle
+
+import pytest
+
+from vidhik_textstore import PREVIEW_CHARS, CompressedTextStore, load_metadata, preview_text, write_text_store
+
+TEXTS = [f"धारा {i}: प्रत्येक नागरिक को सूचना का अधिकार होगा। Section {i} of the Right to Information Act. " * (i % 5 + 1)
+         for i in range(70)] + ["", "short"]
+
+
+def test_round_trip_across_blocks(tmp_path):
+    path = str(tmp_path / "texts.vts")
+    stats = write_text_store(TEXTS, path, codec="zlib", block_size=16)
+    assert stats["count"] == len(TEXTS)
+
+    store = load_metadata(path)
+    assert isinstance(store, CompressedTextStore)
+    assert len(store) == len(TEXTS)
+    assert list(store) == TEXTS
+    # Out of order access decodes (and caches) blocks independently
+    assert [store[i] for i in (65, 3, 40, -1)] == [TEXTS[65], TEXTS[3], TEXTS[40], TEXTS[-1]]
+    with pytest.raises(IndexError):
+        store[len(TEXTS)]
+
+
+def test_previews_from_store_and_pickle(tmp_path):
+    store_path = str(tmp_path / "texts.vts")
+    pickle_path = str(tmp_path / "texts.pkl")
+    write_text_store(TEXTS, store_path, codec="zlib")
+    with open(pickle_path, "wb") as f:
+        pickle.dump(TEXTS, f)
+
+    for metadata in (load_metadata(store_path), load_metadata(pickle_path)):
+        assert preview_text(metadata, 10) == TEXTS[10][:PREVIEW_CHARS]
+        assert preview_text(metadata, 10, 20) == TEXTS[10][:20]
+        assert preview_text(metadata, 10, 500) == TEXTS[10][:500]
+        assert preview_text(metadata, len(TEXTS) - 2) == ""
+
+
+def test_truncated_store_is_rejected(tmp_path):
+    path = str(tmp_path / "texts.vts")
+    write_text_store(TEXTS, path, codec="zlib")
+    with open(path, "rb") as f:
+        data = f.read()
+
+    for length in (10, 200, len(data) - 1):
+        truncated = str(tmp_path / f"truncated-{length}.vts")
+        with open(truncated, "wb") as f:
+            f.write(data[:length])
+        with pytest.raises(ValueError):
+            CompressedTextStore(truncated)
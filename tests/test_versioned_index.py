@@ -0,0 +1,79 @@
+import os
+import pickle
+
+import faiss
+import numpy as np
+
+from vidhik_engine import VersionedIndex
+
+DIM = 8
+
+
+def write_db(directory, count, seed):
+    """Writes an index and metadata of `count` provisions the way a deploy does (rename into place)."""
+    vectors = np.random.default_rng(seed).normal(size=(count, DIM)).astype("float32")
+    index = faiss.IndexFlatIP(DIM)
+    index.add(vectors)
+    index_path = os.path.join(directory, "db.faiss")
+    metadata_path = os.path.join(directory, "db_metadata.pkl")
+    faiss.write_index(index, f"{index_path}.tmp")
+    os.replace(f"{index_path}.tmp", index_path)
+    with open(f"{metadata_path}.tmp", "wb") as f:
+        pickle.dump([f"provision {seed}-{i}" for i in range(count)], f)
+    os.replace(f"{metadata_path}.tmp", metadata_path)
+    return index_path, metadata_path, vectors
+
+
+def test_swap_publishes_a_new_version(tmp_path):
+    index_path, metadata_path, _ = write_db(tmp_path, 10, seed=1)
+    versioned = VersionedIndex(index_path, metadata_path, poll_interval=0)
+    first = versioned.current()
+    assert (first.version, first.index.ntotal) == (1, 10)
+    assert not versioned.reload()  # unchanged files are not re-read
+
+    write_db(tmp_path, 12, seed=2)
+    assert versioned.reload()
+    second = versioned.current()
+    assert (second.version, second.index.ntotal, second.metadata[0]) == (2, 12, "provision 2-0")
+    assert second.fingerprint != first.fingerprint
+
+
+def test_half_copied_set_keeps_the_old_snapshot(tmp_path, monkeypatch):
+    index_path, metadata_path, _ = write_db(tmp_path, 10, seed=1)
+    versioned = VersionedIndex(index_path, metadata_path, poll_interval=0)
+    snapshot = versioned.current()
+
+    # The new index has arrived but its metadata has not
+    vectors = np.random.default_rng(3).normal(size=(14, DIM)).astype("float32")
+    index = faiss.IndexFlatIP(DIM)
+    index.add(vectors)
+    faiss.write_index(index, index_path)
+    assert not versioned.reload()
+    assert versioned.current() is snapshot
+
+    # The broken set is not read again until it changes
+    reads = []
+    read_index = faiss.read_index
+    monkeypatch.setattr(faiss, "read_index", lambda path, *args: reads.append(path) or read_index(path, *args))
+    assert not versioned.reload()
+    assert reads == []
+
+    with open(metadata_path, "wb") as f:
+        pickle.dump([f"provision 3-{i}" for i in range(14)], f)
+    assert versioned.reload()
+    assert versioned.current().index.ntotal == 14
+
+
+def test_in_flight_search_keeps_its_snapshot(tmp_path):
+    index_path, metadata_path, vectors = write_db(tmp_path, 10, seed=1)
+    versioned = VersionedIndex(index_path, metadata_path, poll_interval=0)
+    snapshot = versioned.current()
+
+    write_db(tmp_path, 6, seed=2)
+    assert versioned.reload()
+    assert versioned.current() is not snapshot
+
+    # A search that grabbed the old snapshot still sees the old provisions
+    _, ids = snapshot.searcher.search(vectors[7:8], 1)
+    assert ids[0, 0] == 7
+    assert snapshot.metadata[ids[0, 0]] == "provision 1-7"
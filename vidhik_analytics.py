@@ -0,0 +1,392 @@
+# --- vidhik_analytics.py (Columnar Parquet export of audit findings) ---
+"""
+Columnar export of analyze_policy reports for fleet-wide analytics.
+
+Each report is flattened into Arrow record batches, one row per finding:
+
+    audits       one row per report (status, mode, duration, finding counts)
+    conflicts    one row per conflicting provision
+    bias         one row per flagged phrase
+    pii          one row per detected PII item (type and offsets, never the value)
+
+Provision IDs are rows of one version of the legal DB, so conflict rows carry
+the DB's fingerprint and are only grouped with rows from the same DB.
+
+Rows are buffered and appended to Parquet datasets under ANALYTICS_DIR by a
+background thread (or an explicit flush), hive-partitioned by audit date and
+department:
+
+    data/analytics/conflicts/audit_date=2025-11-15/department=IT%20Department/part-<id>-0.parquet
+
+Aggregate queries then scan only the needed columns and partitions, with
+vectorised Arrow compute, instead of parsing JSON reports one by one.
+
+Backfill from downloaded JSON reports, or run the built-in queries:
+    python vidhik_analytics.py export reports/*.json
+    python vidhik_analytics.py top-provisions --limit 20
+    python vidhik_analytics.py pii-rate
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from vidhik_audit_store import DEFAULT_DEPARTMENT
+
+ANALYTICS_DIR = os.environ.get("VIDHIK_ANALYTICS_DIR", "data/analytics")
+# Buffered reports are written once there are this many, or at least every FLUSH_SECONDS
+FLUSH_REPORTS = int(os.environ.get("VIDHIK_ANALYTICS_FLUSH_REPORTS", "50"))
+FLUSH_SECONDS = float(os.environ.get("VIDHIK_ANALYTICS_FLUSH_SECONDS", "60"))
+# Reports arriving while this many are waiting to be written are dropped
+MAX_BUFFERED_REPORTS = int(os.environ.get("VIDHIK_ANALYTICS_MAX_BUFFERED_REPORTS", "1000"))
+# Characters of provision text kept with each conflict row
+PROVISION_PREVIEW_CHARS = 200
+
+_PARTITION_FIELDS = [("audit_date", pa.string()), ("department", pa.string())]
+_COMMON_FIELDS = [("report_hash", pa.string()), ("audited_at", pa.timestamp("s"))]
+
+SCHEMAS = {
+    "audits": pa.schema(_COMMON_FIELDS + [
+        ("overall_status", pa.string()),
+        ("analysis_mode", pa.string()),
+        ("lexicon_version", pa.string()),
+        ("duration_ms", pa.float64()),
+        ("conflicts", pa.int32()),
+        ("bias_findings", pa.int32()),
+        ("pii_items", pa.int32()),
+    ] + _PARTITION_FIELDS),
+    "conflicts": pa.schema(_COMMON_FIELDS + [
+        ("rank", pa.int32()),
+        ("clause", pa.int32()),
+        ("language", pa.string()),
+        ("db_fingerprint", pa.string()),
+        ("provision_id", pa.int64()),
+        ("provision_preview", pa.string()),
+        ("similarity", pa.float32()),
+        ("risk_level", pa.string()),
+    ] + _PARTITION_FIELDS),
+    "bias": pa.schema(_COMMON_FIELDS + [
+        ("phrase", pa.string()),
+        ("lexicon", pa.string()),
+    ] + _PARTITION_FIELDS),
+    "pii": pa.schema(_COMMON_FIELDS + [
+        ("pii_type", pa.string()),
+        ("start", pa.int64()),
+        ("end", pa.int64()),
+    ] + _PARTITION_FIELDS),
+}
+
+PARTITIONING = ds.partitioning(pa.schema(_PARTITION_FIELDS), flavor="hive")
+
+
+def _float_or_none(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def report_rows(report):
+    """
+    Flattens one analyze_policy report into rows for each table.
+
+    Args:
+        report (dict): Report returned by analyze_policy (with its Audit Metadata)
+
+    Returns:
+        dict: Table name -> list of row dicts matching SCHEMAS
+    """
+    metadata = report.get("Audit Metadata", {})
+    raw_reports = report.get("Raw Reports", {})
+    conflicts = raw_reports.get("Conflict Report", {}).get("Conflicting Laws", [])
+    fingerprints = raw_reports.get("Conflict Report", {}).get("Legal DB Fingerprints", {})
+    bias = raw_reports.get("Bias Report", {}).get("flagged_phrases", [])
+    pii = raw_reports.get("PII Report", {}).get("detected_items", [])
+
+    audited_at = datetime.strptime(metadata["Audited At"], "%Y-%m-%dT%H:%M:%S") \
+        if metadata.get("Audited At") else datetime.now().replace(microsecond=0)
+    common = {
+        "report_hash": metadata.get("Report Hash"),
+        "audited_at": audited_at,
+        "audit_date": audited_at.strftime("%Y-%m-%d"),
+        "department": metadata.get("Department") or DEFAULT_DEPARTMENT,
+    }
+
+    rows = {
+        "audits": [{
+            **common,
+            "overall_status": report.get("Overall Status"),
+            "analysis_mode": metadata.get("Analysis Mode"),
+            "lexicon_version": metadata.get("Lexicon Version"),
+            "duration_ms": metadata.get("Duration (ms)"),
+            "conflicts": len(conflicts),
+            "bias_findings": len(bias),
+            "pii_items": len(pii),
+        }],
+        "conflicts": [{
+            **common,
+            "rank": conflict.get("Rank"),
+            "clause": conflict.get("Clause"),
+            "language": conflict.get("Language"),
+            "db_fingerprint": fingerprints.get(conflict.get("Language")),
+            "provision_id": conflict.get("Provision ID"),
+            "provision_preview": str(conflict.get("Legal Provision", ""))[:PROVISION_PREVIEW_CHARS],
+            "similarity": _float_or_none(conflict.get("Similarity Score")),
+            "risk_level": conflict.get("Risk Level"),
+        } for conflict in conflicts],
+        "bias": [{**common, "phrase": item.get("phrase"), "lexicon": item.get("lexicon")} for item in bias],
+        "pii": [{**common, "pii_type": item.get("type"), "start": item.get("start"), "end": item.get("end")}
+                for item in pii],
+    }
+    return rows
+
+
+class AnalyticsWriter:
+    """
+    Buffers flattened reports and appends them to the partitioned Parquet
+    datasets in batches: one Arrow conversion per table per flush, and a few
+    reasonably sized files rather than one tiny file per audit.
+
+    Thread-safe. append() only buffers; a daemon thread writes the buffer once
+    flush_reports reports are waiting, and otherwise every flush_seconds, so
+    audits are neither held up by nor lost for want of a later write. The
+    buffer is swapped out under the lock and written outside it. Rows whose
+    write fails are dropped, and at most max_buffered_reports are held.
+    """
+
+    def __init__(self, root=ANALYTICS_DIR, flush_reports=FLUSH_REPORTS, flush_seconds=FLUSH_SECONDS,
+                 max_buffered_reports=MAX_BUFFERED_REPORTS):
+        self.root = root
+        self.flush_reports = flush_reports
+        self.flush_seconds = flush_seconds
+        self.max_buffered_reports = max_buffered_reports
+        self.dropped_reports = 0
+        self._rows = {table: [] for table in SCHEMAS}
+        self._buffered_reports = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher = None
+
+    def append(self, report):
+        """Buffers one report (dropping it if the buffer is full) for the background flush."""
+        rows = report_rows(report)
+        with self._lock:
+            if self._buffered_reports >= self.max_buffered_reports:
+                self.dropped_reports += 1
+                if self.dropped_reports == 1 or self.dropped_reports % self.max_buffered_reports == 0:
+                    print(f"Analytics buffer is full ({self._buffered_reports} reports waiting to be written); "
+                          f"{self.dropped_reports} report(s) dropped so far")
+                return
+            for table, table_rows in rows.items():
+                self._rows[table].extend(table_rows)
+            self._buffered_reports += 1
+            full = self._buffered_reports >= self.flush_reports
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_periodically,
+                                                 name="vidhik-analytics-flush", daemon=True)
+                self._flusher.start()
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """
+        Writes all buffered rows to Parquet now. Rows that fail to write are dropped.
+
+        Returns:
+            int: Number of reports written
+        """
+        with self._write_lock:
+            with self._lock:
+                rows, reports = self._rows, self._buffered_reports
+                self._rows = {table: [] for table in SCHEMAS}
+                self._buffered_reports = 0
+            if reports:
+                try:
+                    self._write(rows)
+                except Exception as e:
+                    print(f"Error writing analytics export to {self.root}: {e}. Dropped {reports} report(s).")
+                    return 0
+            return reports
+
+    def request_flush(self):
+        """Asks the background thread to write the buffer now, without waiting for the write."""
+        self._wakeup.set()
+
+    def _flush_periodically(self):
+        while True:
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            self.flush()
+
+    def _write(self, rows):
+        write_id = uuid.uuid4().hex
+        for table, table_rows in rows.items():
+            if not table_rows:
+                continue
+            ds.write_dataset(
+                pa.Table.from_pylist(table_rows, schema=SCHEMAS[table]),
+                os.path.join(self.root, table),
+                format="parquet",
+                partitioning=PARTITIONING,
+                basename_template=f"part-{write_id}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+
+
+def dataset(table, root=ANALYTICS_DIR):
+    """
+    Opens one exported table as a partitioned Arrow dataset.
+
+    Returns:
+        pyarrow.dataset.Dataset: The dataset, or None if nothing has been exported yet
+    """
+    path = os.path.join(root, table)
+    if not os.path.isdir(path):
+        return None
+    return ds.dataset(path, schema=SCHEMAS[table], format="parquet", partitioning=PARTITIONING)
+
+
+def _date_filter(since=None, until=None):
+    expression = None
+    for value, op in ((since, pc.greater_equal), (until, pc.less_equal)):
+        if value:
+            clause = op(pc.field("audit_date"), value)
+            expression = clause if expression is None else expression & clause
+    return expression
+
+
+def most_conflicted_provisions(limit=20, since=None, until=None, department=None, root=ANALYTICS_DIR):
+    """
+    Provisions that conflicted with the most audited drafts. Provisions are
+    keyed by language, legal DB fingerprint and provision ID, since IDs of
+    different DB versions refer to different provisions.
+
+    Args:
+        limit (int): Number of provisions to return
+        since (str): Optional first audit date (YYYY-MM-DD), inclusive
+        until (str): Optional last audit date (YYYY-MM-DD), inclusive
+        department (str): Optional; restrict to one department
+
+    Returns:
+        list: Dicts with language, db_fingerprint, provision_id, provision_preview, conflicts, reports
+            and max_similarity
+    """
+    conflicts = dataset("conflicts", root)
+    if conflicts is None:
+        return []
+    expression = _date_filter(since, until)
+    if department:
+        clause = pc.field("department") == department
+        expression = clause if expression is None else expression & clause
+    table = conflicts.to_table(
+        columns=["report_hash", "language", "db_fingerprint", "provision_id", "provision_preview", "similarity"],
+        filter=expression
+    )
+    if table.num_rows == 0:
+        return []
+    grouped = table.group_by(["language", "db_fingerprint", "provision_id"]).aggregate([
+        ("report_hash", "count"),
+        ("report_hash", "count_distinct"),
+        ("similarity", "max"),
+        ("provision_preview", "first"),
+    ])
+    top = grouped.sort_by([("report_hash_count_distinct", "descending"),
+                           ("similarity_max", "descending")]).slice(0, limit)
+    return [{
+        "language": row["language"],
+        "db_fingerprint": row["db_fingerprint"],
+        "provision_id": row["provision_id"],
+        "provision_preview": row["provision_preview_first"],
+        "conflicts": row["report_hash_count"],
+        "reports": row["report_hash_count_distinct"],
+        "max_similarity": round(row["similarity_max"], 3) if row["similarity_max"] is not None else None,
+    } for row in top.to_pylist()]
+
+
+def pii_rate_by_department(since=None, until=None, root=ANALYTICS_DIR):
+    """
+    Share of audits per department whose draft contained PII.
+
+    Returns:
+        list: Dicts with department, audits, audits_with_pii, pii_rate (percent) and pii_items; most audits first
+    """
+    audits = dataset("audits", root)
+    if audits is None:
+        return []
+    table = audits.to_table(columns=["department", "pii_items"], filter=_date_filter(since, until))
+    if table.num_rows == 0:
+        table = table.append_column("has_pii", pa.array([], pa.int32()))
+    else:
+        table = table.append_column("has_pii", pc.cast(pc.greater(table["pii_items"], 0), pa.int32()))
+    grouped = table.group_by("department").aggregate([
+        ("pii_items", "count"),
+        ("has_pii", "sum"),
+        ("pii_items", "sum"),
+    ]).sort_by([("pii_items_count", "descending")])
+    return [{
+        "department": row["department"],
+        "audits": row["pii_items_count"],
+        "audits_with_pii": row["has_pii_sum"],
+        "pii_rate": round(100.0 * row["has_pii_sum"] / row["pii_items_count"], 1),
+        "pii_items": row["pii_items_sum"],
+    } for row in grouped.to_pylist()]
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_analytics_writer():
+    """Returns the process-wide AnalyticsWriter; buffered rows are flushed at exit."""
+    global _writer
+
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AnalyticsWriter()
+                atexit.register(_writer.flush)
+    return _writer
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export audit reports to Parquet and query them")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Append JSON reports to the Parquet datasets")
+    export_parser.add_argument("reports", nargs="+")
+    top_parser = subparsers.add_parser("top-provisions", help="Most frequently conflicting provisions")
+    top_parser.add_argument("--limit", type=int, default=20)
+    top_parser.add_argument("--department")
+    pii_parser = subparsers.add_parser("pii-rate", help="Share of audits with PII, per department")
+    for sub in (top_parser, pii_parser):
+        sub.add_argument("--since", help="First audit date, YYYY-MM-DD")
+        sub.add_argument("--until", help="Last audit date, YYYY-MM-DD")
+    parser.add_argument("--root", default=ANALYTICS_DIR)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        writer = AnalyticsWriter(args.root, flush_reports=len(args.reports) + 1,
+                                 max_buffered_reports=len(args.reports))
+        for path in args.reports:
+            with open(path, "r", encoding="utf-8") as f:
+                writer.append(json.load(f))
+        writer.flush()
+        print(f"Exported {len(args.reports)} reports to {args.root}")
+    else:
+        start = time.perf_counter()
+        if args.command == "top-provisions":
+            rows = most_conflicted_provisions(args.limit, args.since, args.until, args.department, args.root)
+        else:
+            rows = pii_rate_by_department(args.since, args.until, args.root)
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+        print(f"({len(rows)} rows in {(time.perf_counter() - start) * 1000:.0f} ms)")
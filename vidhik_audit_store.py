@@ -0,0 +1,190 @@
+# --- vidhik_audit_store.py (Append-only audit history with running aggregates) ---
+"""
+Local, append-only history of every analyze_policy result.
+
+Each audit is appended to an SQLite database in WAL mode (so the sidebar can
+read while sessions write). Running totals per department, plus one row for
+all departments, are updated in the same transaction as the insert. Reading
+the compliance summary is therefore a single primary-key lookup, however many
+audits have been recorded.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+AUDIT_DB_PATH = os.environ.get("VIDHIK_AUDIT_DB", "data/vidhik_audit_history.db")
+
+# Pass as the department to read the totals over every department
+ALL_DEPARTMENTS = None
+DEFAULT_DEPARTMENT = "Unassigned"
+# Key of the row that aggregates every audit. Departments are stripped and
+# blank ones recorded as DEFAULT_DEPARTMENT, so no department can use it.
+_ALL_DEPARTMENTS_KEY = ""
+
+# How each engine status counts towards compliance
+OUTCOME_BY_STATUS = {
+    "Clean": "passed",
+    "Medium Risk": "warning",
+    "High Risk": "failed",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    report_hash TEXT NOT NULL,
+    department TEXT NOT NULL,
+    overall_status TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration_ms REAL,
+    chars INTEGER,
+    conflicts INTEGER,
+    bias_findings INTEGER,
+    pii_items INTEGER
+);
+CREATE INDEX IF NOT EXISTS audits_report_hash ON audits (report_hash);
+CREATE TABLE IF NOT EXISTS audit_totals (
+    department TEXT PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0,
+    passed INTEGER NOT NULL DEFAULT 0,
+    warning INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    duration_ms_sum REAL NOT NULL DEFAULT 0,
+    last_audit_at REAL
+);
+"""
+
+UPSERT_TOTALS = """
+INSERT INTO audit_totals (department, total, passed, warning, failed, errors, duration_ms_sum, last_audit_at)
+VALUES (?, 1, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (department) DO UPDATE SET
+    total = total + 1,
+    passed = passed + excluded.passed,
+    warning = warning + excluded.warning,
+    failed = failed + excluded.failed,
+    errors = errors + excluded.errors,
+    duration_ms_sum = duration_ms_sum + excluded.duration_ms_sum,
+    last_audit_at = excluded.last_audit_at
+"""
+
+
+class AuditStore:
+    """
+    SQLite-backed audit history. Safe to share between threads: each thread
+    gets its own connection, and SQLite serialises the writers.
+    """
+
+    def __init__(self, path=AUDIT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def record(self, report_hash, overall_status, department=None, duration_ms=None, chars=None,
+               conflicts=0, bias_findings=0, pii_items=0, created_at=None):
+        """
+        Appends one audit and updates the running totals in the same transaction.
+
+        Returns:
+            int: Row ID of the recorded audit
+        """
+        department = (department or "").strip() or DEFAULT_DEPARTMENT
+        created_at = created_at if created_at is not None else time.time()
+        outcome = OUTCOME_BY_STATUS.get(overall_status, "error")
+        counts = (outcome == "passed", outcome == "warning", outcome == "failed", outcome == "error")
+
+        connection = self._connection()
+        with _transaction(connection):
+            cursor = connection.execute(
+                "INSERT INTO audits (created_at, report_hash, department, overall_status, outcome, "
+                "duration_ms, chars, conflicts, bias_findings, pii_items) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (created_at, report_hash, department, overall_status, outcome,
+                 duration_ms, chars, conflicts, bias_findings, pii_items)
+            )
+            for key in (department, _ALL_DEPARTMENTS_KEY):
+                connection.execute(UPSERT_TOTALS, (key, *counts, duration_ms or 0.0, created_at))
+        return cursor.lastrowid
+
+    def totals(self, department=ALL_DEPARTMENTS):
+        """
+        Returns the running totals for one department (default: all departments).
+
+        Args:
+            department (str): Department name, or ALL_DEPARTMENTS
+
+        Returns:
+            dict: total, passed, warning, failed, errors, average duration and last audit time
+        """
+        key = _ALL_DEPARTMENTS_KEY if department is ALL_DEPARTMENTS else department.strip() or DEFAULT_DEPARTMENT
+        row = self._connection().execute(
+            "SELECT total, passed, warning, failed, errors, duration_ms_sum, last_audit_at "
+            "FROM audit_totals WHERE department = ?", (key,)
+        ).fetchone()
+        return _totals_dict(department, row)
+
+    def department_breakdown(self):
+        """Returns the running totals of every department, busiest first."""
+        rows = self._connection().execute(
+            "SELECT department, total, passed, warning, failed, errors, duration_ms_sum, last_audit_at "
+            "FROM audit_totals WHERE department != ? ORDER BY total DESC", (_ALL_DEPARTMENTS_KEY,)
+        ).fetchall()
+        return [_totals_dict(row[0], row[1:]) for row in rows]
+
+
+class _transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on error (connections run in autocommit mode)."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def _totals_dict(department, row):
+    total, passed, warning, failed, errors, duration_ms_sum, last_audit_at = row or (0, 0, 0, 0, 0, 0.0, None)
+    completed = total - errors
+    return {
+        "department": department,
+        "total": total,
+        "passed": passed,
+        "warning": warning,
+        "failed": failed,
+        "errors": errors,
+        "compliance_rate": round(100.0 * passed / completed, 1) if completed else None,
+        "average_duration_ms": round(duration_ms_sum / total, 1) if total else None,
+        "last_audit_at": last_audit_at,
+    }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_audit_store():
+    """Returns the process-wide AuditStore, opening it on first use."""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AuditStore()
+    return _store
@@ -0,0 +1,203 @@
+# --- vidhik_binary_index.py (Two-tier binary prefilter + float rerank retrieval) ---
+"""
+Two-tier retrieval for large legal corpora on small CPU nodes.
+
+Tier 1 keeps sign-binarised embeddings (1 bit per dimension, 32x smaller than
+float32) in a FAISS binary index and picks a few hundred candidates by Hamming
+distance. Tier 2 reranks only those candidates exactly, using the original
+float vectors read from a memory-mapped .npy file, so only the pages holding
+the candidates are ever resident.
+
+Reranking uses the metric of the original index (inner product or squared L2)
+so scores and thresholds in analyze_policy mean the same thing in both modes.
+
+Build the tier next to the existing index:
+    python vidhik_binary_index.py build
+Benchmark recall, memory and latency against exact search on synthetic data:
+    python vidhik_binary_index.py benchmark --sizes 100000 1000000
+"""
+import argparse
+import os
+import time
+
+import faiss
+import numpy as np
+
+BINARY_INDEX_PATH = os.environ.get("VIDHIK_BINARY_INDEX_PATH", "data/vidhik_legal_db_binary.faiss")
+FLOAT_VECTORS_PATH = os.environ.get("VIDHIK_FLOAT_VECTORS_PATH", "data/vidhik_legal_db_vectors.npy")
+
+# Hamming candidates reranked per query
+DEFAULT_CANDIDATES = 256
+# Vectors reconstructed per batch when building the tier
+BUILD_BATCH_SIZE = 65536
+
+
+def binarize(vectors):
+    """
+    Sign-binarises float vectors into packed bits (1 where the component is positive).
+
+    Args:
+        vectors (np.ndarray): float32 array of shape (n, d)
+
+    Returns:
+        np.ndarray: uint8 array of shape (n, ceil(d / 8))
+    """
+    return np.packbits(np.asarray(vectors) > 0, axis=1)
+
+
+def build_binary_tier(index, binary_index_path=BINARY_INDEX_PATH, vectors_path=FLOAT_VECTORS_PATH):
+    """
+    Builds the binary prefilter index and the memory-mapped float store from a FAISS index.
+
+    Args:
+        index (faiss.Index): Index whose vectors can be reconstructed (e.g. a flat index)
+        binary_index_path (str): Output path for the binary FAISS index
+        vectors_path (str): Output path for the float32 .npy vector store
+
+    Returns:
+        dict: Sizes of the written artifacts in bytes
+    """
+    n, d = index.ntotal, index.d
+    binary_index = faiss.IndexBinaryFlat(((d + 7) // 8) * 8)
+
+    tmp_vectors_path = f"{vectors_path}.tmp.npy"
+    vectors = np.lib.format.open_memmap(tmp_vectors_path, mode="w+", dtype="float32", shape=(n, d))
+    for start in range(0, n, BUILD_BATCH_SIZE):
+        batch = index.reconstruct_n(start, min(BUILD_BATCH_SIZE, n - start))
+        vectors[start:start + len(batch)] = batch
+        binary_index.add(binarize(batch))
+    vectors.flush()
+    del vectors
+
+    # Write both files before renaming either, so a watcher never pairs a new
+    # binary index with an old float store
+    tmp_binary_path = f"{binary_index_path}.tmp"
+    faiss.write_index_binary(binary_index, tmp_binary_path)
+    os.replace(tmp_vectors_path, vectors_path)
+    os.replace(tmp_binary_path, binary_index_path)
+
+    return {
+        "vectors": n,
+        "binary_index_bytes": os.path.getsize(binary_index_path),
+        "float_store_bytes": os.path.getsize(vectors_path),
+    }
+
+
+class TwoTierSearcher:
+    """
+    Hamming-distance prefilter followed by an exact float rerank.
+
+    Exposes the same search(x, k) -> (D, I) interface as a FAISS index, with
+    distances in the metric of the index the tier was built from.
+    """
+
+    def __init__(self, binary_index, vectors, metric_type=faiss.METRIC_L2, candidates=DEFAULT_CANDIDATES):
+        self.binary_index = binary_index
+        self.vectors = vectors
+        self.metric_type = metric_type
+        self.candidates = candidates
+        self.ntotal = binary_index.ntotal
+        self.d = vectors.shape[1]
+
+    def search(self, x, k):
+        x = np.ascontiguousarray(x, dtype="float32")
+        n_candidates = min(max(self.candidates, k), self.ntotal)
+        _, candidate_ids = self.binary_index.search(binarize(x), n_candidates)
+
+        D = np.full((len(x), k), np.inf if self.metric_type == faiss.METRIC_L2 else -np.inf, dtype="float32")
+        I = np.full((len(x), k), -1, dtype="int64")
+        for row, (query, ids) in enumerate(zip(x, candidate_ids)):
+            ids = np.sort(ids[ids >= 0])  # sorted ids read the memmap sequentially
+            candidates = np.asarray(self.vectors[ids])
+            if self.metric_type == faiss.METRIC_INNER_PRODUCT:
+                scores = candidates @ query
+                order = np.argsort(-scores)[:k]
+            else:
+                scores = ((candidates - query) ** 2).sum(axis=1)
+                order = np.argsort(scores)[:k]
+            D[row, :len(order)] = scores[order]
+            I[row, :len(order)] = ids[order]
+        return D, I
+
+
+def load_two_tier(binary_index_path=BINARY_INDEX_PATH, vectors_path=FLOAT_VECTORS_PATH,
+                  metric_type=faiss.METRIC_L2, candidates=DEFAULT_CANDIDATES):
+    """
+    Loads a two-tier searcher; the float store stays memory-mapped on disk.
+
+    Returns:
+        TwoTierSearcher: Searcher over the binary index and float store
+    """
+    binary_index = faiss.read_index_binary(binary_index_path)
+    vectors = np.load(vectors_path, mmap_mode="r")
+    if binary_index.ntotal != len(vectors):
+        raise ValueError(f"binary index has {binary_index.ntotal} vectors but float store has {len(vectors)}")
+    return TwoTierSearcher(binary_index, vectors, metric_type, candidates)
+
+
+def _synthetic_corpus(n, d, seed=0, clusters=2000):
+    """Clustered, L2-normalised vectors; roughly how sentence embeddings of statutes are distributed."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, d)).astype("float32")
+    vectors = np.empty((n, d), dtype="float32")
+    for start in range(0, n, BUILD_BATCH_SIZE):
+        size = min(BUILD_BATCH_SIZE, n - start)
+        batch = centres[rng.integers(0, clusters, size)] + 0.6 * rng.standard_normal((size, d)).astype("float32")
+        vectors[start:start + size] = batch / np.linalg.norm(batch, axis=1, keepdims=True)
+    return vectors
+
+
+def benchmark(sizes, d=384, k=5, n_queries=200, candidates=DEFAULT_CANDIDATES, workdir="/tmp/vidhik_binary_bench"):
+    """Prints recall@k, memory and per-query latency of two-tier search versus exact flat search."""
+    os.makedirs(workdir, exist_ok=True)
+    print(f"{'provisions':>10} {'recall@' + str(k):>9} {'flat MB':>9} {'binary MB':>10} "
+          f"{'flat ms/q':>10} {'2-tier ms/q':>12}")
+    for n in sizes:
+        corpus = _synthetic_corpus(n, d)
+        queries = corpus[np.random.default_rng(1).integers(0, n, n_queries)]
+        # Perturb each query by ~70% of its norm (cosine ~0.8 to its source provision)
+        noise = np.random.default_rng(2).standard_normal(queries.shape).astype("float32")
+        queries = queries + 0.7 * noise / np.sqrt(d)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+        flat = faiss.IndexFlatL2(d)
+        flat.add(corpus)
+        del corpus
+        binary_path = os.path.join(workdir, f"binary_{n}.faiss")
+        vectors_path = os.path.join(workdir, f"vectors_{n}.npy")
+        build_binary_tier(flat, binary_path, vectors_path)
+        searcher = load_two_tier(binary_path, vectors_path, flat.metric_type, candidates)
+
+        start = time.perf_counter()
+        _, exact = flat.search(queries, k)
+        flat_ms = (time.perf_counter() - start) * 1000 / n_queries
+
+        start = time.perf_counter()
+        _, approx = searcher.search(queries, k)
+        tier_ms = (time.perf_counter() - start) * 1000 / n_queries
+
+        recall = np.mean([len(set(a) & set(e)) / k for a, e in zip(approx, exact)])
+        flat_mb = n * d * 4 / 1e6
+        binary_mb = n * searcher.binary_index.code_size / 1e6
+        print(f"{n:>10} {recall:>9.3f} {flat_mb:>9.1f} {binary_mb:>10.1f} {flat_ms:>10.2f} {tier_ms:>12.2f}")
+        del flat, searcher
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or benchmark the binary retrieval tier")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Build the tier from the FAISS index")
+    build_parser.add_argument("--index", default="data/vidhik_legal_db.faiss")
+    bench_parser = subparsers.add_parser("benchmark", help="Compare against exact search on synthetic data")
+    bench_parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    bench_parser.add_argument("--dim", type=int, default=384)
+    bench_parser.add_argument("--k", type=int, default=5)
+    bench_parser.add_argument("--candidates", type=int, default=DEFAULT_CANDIDATES)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        stats = build_binary_tier(faiss.read_index(args.index))
+        print(f"Built binary tier for {stats['vectors']} provisions: "
+              f"{stats['binary_index_bytes']:,} bytes binary index, {stats['float_store_bytes']:,} bytes float store")
+    else:
+        benchmark(args.sizes, d=args.dim, k=args.k, candidates=args.candidates)
@@ -0,0 +1,240 @@
+# --- vidhik_compaction.py (Near-duplicate compaction of the legal DB) ---
+"""
+Compaction pass for the legal DB.
+
+Statute corpora repeat themselves: identical definitions across Acts, and
+amended sections stored next to their originals. This pass clusters
+provisions whose embeddings are within a cosine threshold of each other and
+keeps one representative per cluster (the first provision of the cluster,
+in corpus order). It writes:
+
+- a smaller FAISS index with the same metric, holding only the representatives,
+- metadata for the representatives (pickle or compressed text store, matching the input),
+- a sources map in CSR form (`indptr`, `sources`): for each representative,
+  the IDs of every original provision it stands for, plus a preview of each
+  of those provisions (`source_texts`, `source_text_offsets`). The original
+  IDs refer to the uncompacted DB, which is not deployed, so reports show
+  the previews rather than the IDs.
+
+Clustering is a single leader pass. Each provision joins the most similar
+existing representative at or above the threshold, or becomes a new
+representative. Cost is one nearest-representative search per provision.
+
+The outputs use the engine's file names in a separate directory. Move them
+into data/ to deploy; the index watcher swaps them in once all three
+agree. Rebuild the binary tier and neighbour graph afterwards, since both
+are sized to the index.
+    python vidhik_compaction.py --threshold 0.97
+"""
+import argparse
+import os
+import pickle
+
+import faiss
+import numpy as np
+
+from vidhik_textstore import PREVIEW_CHARS, load_metadata, preview_text, write_text_store
+
+SOURCES_PATH = "data/vidhik_legal_db_sources.npz"
+COMPACT_DIR = "data/compact"
+
+# Cosine similarity at or above which two provisions are treated as one
+DEFAULT_THRESHOLD = 0.97
+# Provisions reconstructed and clustered per batch
+BATCH_SIZE = 4096
+
+
+def _unit(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def cluster_provisions(index, threshold=DEFAULT_THRESHOLD, batch_size=BATCH_SIZE):
+    """
+    Assigns every provision of an index to a cluster by a leader pass.
+
+    Args:
+        index (faiss.Index): Index whose vectors can be reconstructed (e.g. a flat index)
+        threshold (float): Cosine similarity needed to join an existing cluster
+        batch_size (int): Provisions processed per batch
+
+    Returns:
+        tuple: (assignment, leaders, leader_vectors): cluster number of each
+            provision, the original ID of each cluster's representative, and
+            the representatives' original vectors
+    """
+    n, d = index.ntotal, index.d
+    representatives = faiss.IndexFlatIP(d)  # unit vectors, so inner product is cosine
+    assignment = np.empty(n, dtype="int64")
+    leaders, leader_vectors = [], []
+
+    for start in range(0, n, batch_size):
+        batch = index.reconstruct_n(start, min(batch_size, n - start))
+        unit = _unit(batch)
+
+        # Provisions close enough to a representative from an earlier batch join it
+        if representatives.ntotal:
+            D, I = representatives.search(unit, 1)
+            matched = D[:, 0] >= threshold
+            assignment[start + np.flatnonzero(matched)] = I[matched, 0]
+        else:
+            matched = np.zeros(len(unit), dtype=bool)
+
+        # The rest are clustered against each other, in corpus order
+        pending = np.flatnonzero(~matched)
+        similarity = unit[pending] @ unit[pending].T
+        batch_leaders = []  # positions in `pending`
+        for j, row in enumerate(pending):
+            if batch_leaders:
+                scores = similarity[j, batch_leaders]
+                best = int(np.argmax(scores))
+                if scores[best] >= threshold:
+                    assignment[start + row] = assignment[start + pending[batch_leaders[best]]]
+                    continue
+            assignment[start + row] = len(leaders)
+            leaders.append(start + row)
+            batch_leaders.append(j)
+
+        if batch_leaders:
+            representatives.add(unit[pending[batch_leaders]])
+            leader_vectors.append(batch[pending[batch_leaders]])
+
+    leader_vectors = np.vstack(leader_vectors) if leader_vectors else np.zeros((0, d), dtype="float32")
+    return assignment, np.asarray(leaders, dtype="int64"), leader_vectors
+
+
+def compact_legal_db(index, metadata, threshold=DEFAULT_THRESHOLD, output_dir=COMPACT_DIR,
+                     index_name="vidhik_legal_db.faiss", metadata_name="vidhik_legal_db_metadata.pkl",
+                     sources_name=os.path.basename(SOURCES_PATH)):
+    """
+    Writes a compacted copy of the legal DB (index, metadata and sources map).
+
+    Args:
+        index (faiss.Index): Index whose vectors can be reconstructed
+        metadata (sequence): Provision texts, in index order
+        threshold (float): Cosine similarity at or above which provisions are merged
+        output_dir (str): Directory for the compacted files
+        index_name (str): File name of the compacted index
+        metadata_name (str): File name of the compacted metadata (.vts writes a compressed text store)
+        sources_name (str): File name of the sources map
+
+    Returns:
+        dict: Provision counts before and after, and the written paths
+    """
+    assignment, leaders, leader_vectors = cluster_provisions(index, threshold)
+
+    compact = faiss.IndexFlat(index.d, index.metric_type)
+    compact.add(leader_vectors)
+
+    # CSR: sources[indptr[c]:indptr[c + 1]] are the original IDs merged into representative c
+    sources = np.argsort(assignment, kind="stable")
+    indptr = np.zeros(len(leaders) + 1, dtype="int64")
+    np.cumsum(np.bincount(assignment, minlength=len(leaders)), out=indptr[1:])
+
+    os.makedirs(output_dir, exist_ok=True)
+    index_path = os.path.join(output_dir, index_name)
+    metadata_path = os.path.join(output_dir, metadata_name)
+    sources_path = os.path.join(output_dir, sources_name)
+
+    faiss.write_index(compact, f"{index_path}.tmp")
+    os.replace(f"{index_path}.tmp", index_path)
+    texts = [metadata[int(i)] for i in leaders]
+    if metadata_path.endswith(".vts"):
+        write_text_store(texts, metadata_path)
+    else:
+        with open(f"{metadata_path}.tmp", "wb") as f:
+            pickle.dump(texts, f)
+        os.replace(f"{metadata_path}.tmp", metadata_path)
+    # Previews of the original provisions, as one UTF-8 blob in `sources` order
+    encoded = [preview_text(metadata, int(i), PREVIEW_CHARS).encode("utf-8") for i in sources]
+    source_text_offsets = np.zeros(len(encoded) + 1, dtype="int64")
+    np.cumsum([len(text) for text in encoded], out=source_text_offsets[1:])
+    source_texts = np.frombuffer(b"".join(encoded), dtype="uint8")
+    with open(f"{sources_path}.tmp", "wb") as f:
+        np.savez(f, indptr=indptr, sources=sources.astype("int32"),
+                 source_texts=source_texts, source_text_offsets=source_text_offsets)
+    os.replace(f"{sources_path}.tmp", sources_path)
+
+    return {
+        "provisions": index.ntotal,
+        "representatives": compact.ntotal,
+        "index_path": index_path,
+        "metadata_path": metadata_path,
+        "sources_path": sources_path,
+    }
+
+
+class ProvisionSources:
+    """
+    Read-only CSR map from each representative to the original provisions it
+    stands for, with a preview of each.
+    """
+
+    def __init__(self, indptr, sources, texts, text_offsets):
+        self.indptr = indptr
+        self.sources = sources
+        self.texts = texts
+        self.text_offsets = text_offsets
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def of(self, provision_id):
+        """Returns the original provision IDs merged into this representative (itself first)."""
+        return self.sources[self.indptr[provision_id]:self.indptr[provision_id + 1]]
+
+    def texts_of(self, provision_id):
+        """
+        Returns previews of the original provisions merged into this representative (itself first).
+
+        Returns:
+            list: Preview strings
+        """
+        offsets = self.text_offsets[self.indptr[provision_id]:self.indptr[provision_id + 1] + 1]
+        return [self.texts[start:end].tobytes().decode("utf-8") for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def load_sources(sources_path=SOURCES_PATH):
+    """
+    Loads a sources map written by compact_legal_db.
+
+    Returns:
+        ProvisionSources: The map
+
+    Raises:
+        ValueError: If the map has no previews or its arrays are inconsistent
+    """
+    with np.load(sources_path) as data:
+        missing = {"indptr", "sources", "source_texts", "source_text_offsets"} - set(data.files)
+        if missing:
+            raise ValueError(f"sources map is missing {', '.join(sorted(missing))}; rebuild it with compact_legal_db")
+        texts, text_offsets = data["source_texts"], data["source_text_offsets"]
+        sources = ProvisionSources(data["indptr"], data["sources"], texts, text_offsets)
+    if sources.indptr[-1] != len(sources.sources):
+        raise ValueError(f"sources map has {sources.indptr[-1]} entries in indptr but {len(sources.sources)} stored")
+    if len(text_offsets) != len(sources.sources) + 1 or text_offsets[-1] != len(texts):
+        raise ValueError("sources map previews do not line up with its source IDs")
+    return sources
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge near-duplicate provisions of the legal DB")
+    parser.add_argument("--index", default="data/vidhik_legal_db.faiss")
+    parser.add_argument("--metadata", default="data/vidhik_legal_db_metadata.pkl",
+                        help="Pickled texts or a .vts compressed text store")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--output-dir", default=COMPACT_DIR)
+    args = parser.parse_args()
+
+    legal_index = faiss.read_index(args.index)
+    provision_texts = load_metadata(args.metadata)
+    if legal_index.ntotal != len(provision_texts):
+        parser.error(f"index has {legal_index.ntotal} vectors but metadata has {len(provision_texts)} entries")
+
+    stats = compact_legal_db(legal_index, provision_texts, args.threshold, args.output_dir,
+                             metadata_name=os.path.basename(args.metadata))
+    removed = stats["provisions"] - stats["representatives"]
+    print(f"Compacted {stats['provisions']} provisions to {stats['representatives']} "
+          f"({removed} near duplicates merged, {100.0 * removed / max(1, stats['provisions']):.1f}%).")
+    print(f"Wrote {stats['index_path']}, {stats['metadata_path']} and {stats['sources_path']}.")
+    print("Rebuild the binary tier and neighbour graph after deploying the compacted files.")
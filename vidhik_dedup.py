@@ -0,0 +1,181 @@
+# --- vidhik_dedup.py (Near-duplicate draft detection with MinHash + LSH) ---
+"""
+Near-duplicate detection for policy drafts.
+
+Departments circulate many near-identical versions of the same GO. Each
+audited draft is summarised by a MinHash signature over its word 5-gram
+shingles and filed into LSH buckets (16 bands of 8 rows), so a new draft
+finds earlier versions with high estimated Jaccard similarity without
+comparing against every past submission. The engine keeps the per-clause
+search hits of each audited draft alongside its signature, so a matching
+draft only needs its changed clauses embedded and searched.
+"""
+import hashlib
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_WORDS = 5
+# Estimated Jaccard similarity above which a draft counts as a near duplicate
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get("VIDHIK_NEAR_DUPLICATE_THRESHOLD", "0.9"))
+# Past drafts kept in the index (least recently matched are dropped first)
+MAX_DRAFTS = int(os.environ.get("VIDHIK_MAX_INDEXED_DRAFTS", "10000"))
+# Shingles hashed per chunk when computing a signature, to bound memory
+SIGNATURE_CHUNK = 8192
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20251115)
+# Coefficients below 2^32 keep a * h + b (h < 2^32) inside uint64 without overflow
+_PERM_A = _rng.integers(1, 1 << 32, NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 32, NUM_PERMUTATIONS, dtype=np.uint64)
+
+_WORD = re.compile(r"\w+")
+
+
+def clause_key(clause_text):
+    """Returns a compact key identifying a clause's normalised text."""
+    normalised = " ".join(clause_text.lower().split())
+    return hashlib.blake2b(normalised.encode("utf-8"), digest_size=16).digest()
+
+
+def shingle_hashes(text, size=SHINGLE_WORDS):
+    """Returns the distinct 32-bit hashes of the text's lower-cased word n-grams."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = (" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return np.fromiter({zlib.crc32(gram.encode("utf-8")) for gram in grams}, dtype=np.uint64)
+
+
+def minhash_signature(text):
+    """
+    Computes the MinHash signature of a text.
+
+    Returns:
+        np.ndarray: uint64 array of NUM_PERMUTATIONS minimum hash values
+    """
+    hashes = shingle_hashes(text)
+    signature = np.full(NUM_PERMUTATIONS, _MERSENNE_PRIME, dtype=np.uint64)
+    for start in range(0, len(hashes), SIGNATURE_CHUNK):
+        chunk = hashes[start:start + SIGNATURE_CHUNK, None]
+        permuted = (chunk * _PERM_A + _PERM_B) % _MERSENNE_PRIME
+        np.minimum(signature, permuted.min(axis=0), out=signature)
+    return signature
+
+
+def estimated_similarity(signature_a, signature_b):
+    """Estimates the Jaccard similarity of two drafts from their signatures."""
+    return float(np.mean(signature_a == signature_b))
+
+
+class IndexedDraft:
+    """A past draft: its signature plus whatever the engine cached for reuse."""
+
+    __slots__ = ("draft_id", "signature", "band_keys", "payload")
+
+    def __init__(self, draft_id, signature, band_keys, payload):
+        self.draft_id = draft_id
+        self.signature = signature
+        self.band_keys = band_keys
+        self.payload = payload
+
+
+class DraftIndex:
+    """
+    In-memory LSH index of past drafts, bounded to max_drafts entries.
+    Thread-safe; lookups only compare signatures that share a bucket.
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, max_drafts=MAX_DRAFTS):
+        self.threshold = threshold
+        self.max_drafts = max_drafts
+        self._drafts = OrderedDict()
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _band_keys(signature):
+        return [(band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()) for band in range(LSH_BANDS)]
+
+    def add(self, draft_id, signature, payload):
+        """Indexes (or replaces) a draft and its payload."""
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            self._remove(draft_id)
+            self._drafts[draft_id] = IndexedDraft(draft_id, signature, band_keys, payload)
+            for key in band_keys:
+                self._buckets.setdefault(key, set()).add(draft_id)
+            while len(self._drafts) > self.max_drafts:
+                self._remove(next(iter(self._drafts)))
+
+    def get(self, draft_id):
+        """Returns the indexed draft with this ID (e.g. an exact resubmission), or None."""
+        with self._lock:
+            draft = self._drafts.get(draft_id)
+            if draft is not None:
+                self._drafts.move_to_end(draft_id)
+        return draft
+
+    def find(self, signature, exclude=None):
+        """
+        Finds the most similar indexed draft above the threshold.
+
+        Args:
+            signature (np.ndarray): MinHash signature of the new draft
+            exclude (str): Draft ID to ignore (e.g. the draft itself)
+
+        Returns:
+            tuple: (IndexedDraft, estimated similarity), or (None, 0.0) if there is no near duplicate
+        """
+        best, best_similarity = None, 0.0
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+            candidates.discard(exclude)
+            for draft_id in candidates:
+                draft = self._drafts[draft_id]
+                similarity = estimated_similarity(signature, draft.signature)
+                if similarity > best_similarity:
+                    best, best_similarity = draft, similarity
+            if best is None or best_similarity < self.threshold:
+                return None, best_similarity
+            self._drafts.move_to_end(best.draft_id)
+        return best, best_similarity
+
+    def __len__(self):
+        return len(self._drafts)
+
+    def _remove(self, draft_id):
+        draft = self._drafts.pop(draft_id, None)
+        if draft is None:
+            return
+        for key in draft.band_keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(draft_id)
+                if not bucket:
+                    del self._buckets[key]
+
+
+_draft_index = None
+_draft_index_lock = threading.Lock()
+
+
+def get_draft_index():
+    """Returns the process-wide DraftIndex."""
+    global _draft_index
+
+    if _draft_index is None:
+        with _draft_index_lock:
+            if _draft_index is None:
+                _draft_index = DraftIndex()
+    return _draft_index
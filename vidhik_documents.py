@@ -0,0 +1,76 @@
+# --- vidhik_documents.py (Text extraction for uploaded policy documents) ---
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+TEXT_MIME_TYPES = ["text/plain"]
+PDF_MIME_TYPES = ["application/pdf"]
+WORD_MIME_TYPES = ["application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                   "application/msword"]
+
+# Extracted text of recent uploads, keyed by content hash, so auditing the same
+# file again (or from another session) skips parsing it
+TEXT_CACHE_SIZE = 16
+_text_cache = OrderedDict()
+_text_cache_lock = threading.Lock()
+
+
+def extract_document_text(data, mime_type, progress_callback=None):
+    """
+    Extract the plain text of an uploaded policy document.
+
+    Args:
+        data (bytes): Raw file contents
+        mime_type (str): MIME type reported by the uploader
+        progress_callback (callable): Optional; called with a progress dict
+            ({"stage": "extracting", "done": pages, "total": pages}) as pages are read
+
+    Returns:
+        str: Extracted text
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    key = (hashlib.blake2b(data, digest_size=16).digest(), mime_type)
+    with _text_cache_lock:
+        text = _text_cache.get(key)
+        if text is not None:
+            _text_cache.move_to_end(key)
+    if text is not None:
+        if progress_callback:
+            progress_callback({"stage": "extracting", "done": 1, "total": 1})
+        return text
+
+    text = _extract_text(data, mime_type, progress_callback)
+    with _text_cache_lock:
+        _text_cache[key] = text
+        while len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    return text
+
+
+def _extract_text(data, mime_type, progress_callback):
+    if mime_type in TEXT_MIME_TYPES:
+        return str(data, "utf-8")
+
+    if mime_type in PDF_MIME_TYPES:
+        import PyPDF2
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        pages = []
+        total = len(reader.pages)
+        for page in reader.pages:
+            pages.append(page.extract_text() or "")
+            if progress_callback:
+                progress_callback({"stage": "extracting", "done": len(pages), "total": total})
+        return "\n".join(pages)
+
+    if mime_type in WORD_MIME_TYPES:
+        import docx
+        doc = docx.Document(io.BytesIO(data))
+        text = "\n".join([p.text for p in doc.paragraphs])
+        if progress_callback:
+            progress_callback({"stage": "extracting", "done": 1, "total": 1})
+        return text
+
+    raise ValueError(f"Unsupported document type: {mime_type}")
@@ -1,124 +1,558 @@
 # --- vidhik_engine.py (Complete Implementation with Overall Status) ---
 import faiss
-import pickle
+import hashlib
+import hmac
+import io
 import os
+import re
+import threading
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
-# --- EMBEDDING MODEL INITIALIZATION ---
-# Initialize the embedding model globally
-model = SentenceTransformer('all-MiniLM-L6-v2')
+from vidhik_audit_store import AUDIT_DB_PATH, get_audit_store
+try:
+    # pyarrow is optional; without it audits are simply not exported for analytics
+    from vidhik_analytics import ANALYTICS_DIR, get_analytics_writer
+except ImportError:
+    ANALYTICS_DIR, get_analytics_writer = None, None
+from vidhik_binary_index import BINARY_INDEX_PATH, FLOAT_VECTORS_PATH, load_two_tier
+from vidhik_compaction import load_sources
+from vidhik_dedup import clause_key, get_draft_index, minhash_signature
+from vidhik_graph import load_neighbour_graph
+from vidhik_lexicons import DEFAULT_LANGUAGE, LEXICON_DIR, bias_matchers, get_lexicons, pii_patterns
+from vidhik_textstore import PREVIEW_CHARS, load_metadata, preview_text
+
+# --- EMBEDDING MODEL CONFIGURATION ---
+# The model is loaded once per process by the shared engine (see get_engine).
+# 'stub' selects the offline HashingEmbedder (load tests, machines without the model).
+EMBEDDING_MODEL_NAME = os.environ.get("VIDHIK_EMBEDDING_MODEL", 'all-MiniLM-L6-v2')
+STUB_EMBEDDING_DIM = int(os.environ.get("VIDHIK_STUB_EMBEDDING_DIM", "384"))
+
+# Number of forward passes allowed to run at the same time, across all models
+# (they share one executor). Torch intra-op threads are split between them so
+# that workers x threads matches the cores.
+CPU_COUNT = os.cpu_count() or 1
+INFERENCE_WORKERS = int(os.environ.get("VIDHIK_INFERENCE_WORKERS", max(1, min(4, CPU_COUNT // 4))))
+TORCH_THREADS = int(os.environ.get("VIDHIK_TORCH_THREADS", max(1, CPU_COUNT // INFERENCE_WORKERS)))
+
+# --- LANGUAGE ROUTING ---
+# Clauses written mostly in Devanagari are routed to a multilingual model and a
+# Hindi/multilingual legal index; everything else uses the English model and DB.
+# The Hindi model and index are only loaded when a Hindi clause is audited.
+HINDI_EMBEDDING_MODEL_NAME = os.environ.get(
+    "VIDHIK_HINDI_EMBEDDING_MODEL",
+    "stub" if EMBEDDING_MODEL_NAME == "stub" else "paraphrase-multilingual-MiniLM-L12-v2"
+)
 
 # --- PATH CONFIGURATION ---
 # Note: Paths are set relative to the root directory where the app is executed
-FAISS_INDEX_PATH = "data/vidhik_legal_db.faiss"
-FAISS_METADATA_PATH = "data/vidhik_legal_db_metadata.pkl"
+FAISS_INDEX_PATH = os.environ.get("VIDHIK_FAISS_INDEX_PATH", "data/vidhik_legal_db.faiss")
+FAISS_METADATA_PATH = os.environ.get("VIDHIK_FAISS_METADATA_PATH", "data/vidhik_legal_db_metadata.pkl")
+# Compressed provision texts (see vidhik_textstore.py); preferred over the pickle when present
+FAISS_TEXT_STORE_PATH = os.environ.get("VIDHIK_FAISS_TEXT_STORE_PATH", "data/vidhik_legal_db_metadata.vts")
+
+# Retrieval mode: 'flat' searches the FAISS index directly; 'binary' uses the
+# two-tier binary prefilter + float rerank built by vidhik_binary_index.py (whose
+# BINARY_INDEX_PATH and FLOAT_VECTORS_PATH locate the tier). In binary mode the
+# float index is memory-mapped, not read into memory, since searches never use it.
+RETRIEVAL_MODE = os.environ.get("VIDHIK_RETRIEVAL_MODE", "flat")
+# faiss flag that maps a flat index's vectors instead of reading them (older faiss reads them)
+_MMAP_INDEX_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+# Provision neighbour graph built by vidhik_graph.py; conflicts are expanded with
+# their related provisions when it is present
+NEIGHBOUR_GRAPH_PATH = os.environ.get("VIDHIK_NEIGHBOUR_GRAPH_PATH", "data/vidhik_legal_db_graph.npz")
+# Sources map written by vidhik_compaction.py: the original provisions behind each
+# representative of a compacted DB
+FAISS_SOURCES_PATH = os.environ.get("VIDHIK_FAISS_SOURCES_PATH", "data/vidhik_legal_db_sources.npz")
+# Legal DB for Hindi clauses, embedded with HINDI_EMBEDDING_MODEL_NAME
+HINDI_FAISS_INDEX_PATH = os.environ.get("VIDHIK_HINDI_FAISS_INDEX_PATH", "data/vidhik_legal_db_hi.faiss")
+HINDI_FAISS_METADATA_PATH = os.environ.get("VIDHIK_HINDI_FAISS_METADATA_PATH", "data/vidhik_legal_db_hi_metadata.pkl")
+HINDI_FAISS_TEXT_STORE_PATH = os.environ.get("VIDHIK_HINDI_FAISS_TEXT_STORE_PATH", "data/vidhik_legal_db_hi_metadata.vts")
+
+# How often (seconds) the background watcher checks the data directory for a
+# refreshed legal DB. Set to 0 to disable watching and rely on request_reload().
+INDEX_POLL_SECONDS = float(os.environ.get("VIDHIK_INDEX_POLL_SECONDS", "30"))
 
 # Global variables to store the loaded index and metadata
+# (kept in sync with the active snapshot for backwards compatibility)
 loaded_index = None
 loaded_metadata = None
 
-def load_faiss_artifacts():
+# An immutable (index, metadata) pair loaded together from disk. Searches grab
+# one snapshot and use it throughout, so they never mix versions. `searcher`
+# is what analyze_policy queries: the index itself, or the two-tier searcher.
+# `neighbours` is the provision neighbour graph and `sources` the compaction
+# sources map; either is None when it was not built. `version` counts reloads
+# in this process; `fingerprint` identifies the index file's contents, so it is
+# the same for the same legal DB in every process and on every machine.
+IndexSnapshot = namedtuple("IndexSnapshot",
+                           ["index", "metadata", "version", "loaded_at", "searcher", "neighbours", "sources",
+                            "fingerprint"])
+# Bytes hashed per read when fingerprinting the index file
+FINGERPRINT_CHUNK = 1 << 20
+
+
+def _artifact_signature(paths):
     """
-    Loads the FAISS index and associated metadata (text chunks) from disk.
-    Uses global variables to ensure artifacts are only loaded once.
+    Returns a cheap signature (mtime + size) of the given artifact files,
+    or None if any of them is missing.
     """
-    global loaded_index
-    global loaded_metadata
-    
-    if loaded_index is None:
+    signature = []
+    try:
+        for path in paths:
+            stat = os.stat(path)
+            signature.extend((stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        return None
+    return tuple(signature)
+
+
+def _file_fingerprint(path):
+    """Returns a short hex digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(FINGERPRINT_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class VersionedIndex:
+    """
+    Versioned handle around the FAISS index and its metadata.
+
+    The active snapshot is replaced with a single reference assignment, so
+    in-flight searches finish on the version they started with while new
+    searches pick up the new one. Reloads run in a background thread; the old
+    snapshot keeps serving until the new one has loaded and validated.
+    """
+
+    def __init__(self, index_path, metadata_path, text_store_path=None, binary_index_path=None,
+                 vectors_path=None, graph_path=None, sources_path=None, poll_interval=INDEX_POLL_SECONDS):
+        self.index_path = index_path
+        self.metadata_path = metadata_path
+        self.text_store_path = text_store_path
+        self.binary_index_path = binary_index_path
+        self.vectors_path = vectors_path
+        self.graph_path = graph_path
+        self.sources_path = sources_path
+        self.poll_interval = poll_interval
+        self._snapshot = None
+        self._signature = None
+        # Signature of the last artifact set that failed to load
+        self._failed_signature = None
+        self._version = 0
+        self._reload_lock = threading.Lock()
+        self._reload_event = threading.Event()
+        self._watcher_lock = threading.Lock()
+        self._watcher = None
+
+    def current(self):
+        """
+        Returns the active IndexSnapshot, loading it on first use.
+        Returns None if the artifacts could not be loaded.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.reload()
+            snapshot = self._snapshot
+        return snapshot
+
+    def reload(self, background=False):
+        """
+        Loads the artifacts from disk and swaps them in if they are valid.
+
+        Args:
+            background (bool): Run the load in a daemon thread and return immediately
+
+        Returns:
+            bool: True if a new snapshot was swapped in (always False when background=True)
+        """
+        if background:
+            threading.Thread(target=self.reload, name="vidhik-index-reload", daemon=True).start()
+            return False
+
+        with self._reload_lock:
+            signature = _artifact_signature(self._artifact_paths())
+            if signature is not None and signature == self._signature and self._snapshot is not None:
+                return False
+            if signature is not None and signature == self._failed_signature:
+                return False  # same broken set as last time; wait for the files to change
+            snapshot = self._load(signature)
+            if snapshot is None:
+                # Remember the broken set so it is not re-read until it changes again
+                self._failed_signature = signature
+                return False
+            self._publish(snapshot, signature)
+            return True
+
+    def request_reload(self):
+        """Signals the watcher thread to reload now instead of waiting for the next poll."""
+        self.start_watcher()
+        self._reload_event.set()
+
+    def start_watcher(self):
+        """Starts the background thread that reloads the artifacts when they change on disk."""
+        if self._watcher is not None:
+            return
+        with self._watcher_lock:
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, name="vidhik-index-watcher", daemon=True)
+                self._watcher.start()
+
+    def _watch(self):
+        while True:
+            timeout = self.poll_interval if self.poll_interval > 0 else None
+            self._reload_event.wait(timeout)
+            self._reload_event.clear()
+            if _artifact_signature(self._artifact_paths()) != self._signature:
+                self.reload()
+
+    def _resolve_metadata_path(self):
+        if self.text_store_path and os.path.exists(self.text_store_path):
+            return self.text_store_path
+        return self.metadata_path
+
+    def _binary_tier_paths(self):
+        """Returns the two-tier artifact paths if configured and built, else an empty list."""
+        paths = [self.binary_index_path, self.vectors_path]
+        if all(paths) and all(os.path.exists(path) for path in paths):
+            return paths
+        return []
+
+    def _graph_paths(self):
+        """Returns [graph_path] if configured and built, else an empty list."""
+        if self.graph_path and os.path.exists(self.graph_path):
+            return [self.graph_path]
+        return []
+
+    def _sources_paths(self):
+        """Returns [sources_path] if configured and present, else an empty list."""
+        if self.sources_path and os.path.exists(self.sources_path):
+            return [self.sources_path]
+        return []
+
+    def _artifact_paths(self):
+        return ([self.index_path, self._resolve_metadata_path()] + self._binary_tier_paths()
+                + self._graph_paths() + self._sources_paths())
+
+    def _load(self, signature):
+        paths = self._artifact_paths()
+        metadata_path = paths[1]
+        binary_tier_paths = self._binary_tier_paths()
         try:
-            # Load the binary FAISS index
-            loaded_index = faiss.read_index(FAISS_INDEX_PATH)
-            
-            # Load the corresponding metadata (document IDs/text)
-            with open(FAISS_METADATA_PATH, 'rb') as f:
-                loaded_metadata = pickle.load(f)
-                
-            print("Vidhik AI FAISS database loaded successfully.")
-            return loaded_index, loaded_metadata
-            
+            # Load the binary FAISS index; with the binary tier it is only mapped, for its
+            # size, metric and reconstruct(), so the float vectors are not held in memory twice
+            index = faiss.read_index(self.index_path, _MMAP_INDEX_FLAGS if binary_tier_paths else 0)
+            fingerprint = _file_fingerprint(self.index_path)
+
+            # Load the corresponding metadata (document IDs/text), either the
+            # pickled list or the memory-mapped compressed text store
+            metadata = load_metadata(metadata_path)
         except FileNotFoundError:
             # Handles missing files, which causes a Streamlit error if not handled
-            print(f"CRITICAL ERROR: FAISS files not found at {FAISS_INDEX_PATH} and {FAISS_METADATA_PATH}. Cannot run live conflict detection.")
-            return None, None
+            print(f"CRITICAL ERROR: FAISS files not found at {self.index_path} and {metadata_path}. Cannot run live conflict detection.")
+            return None
         except Exception as e:
             print(f"Error loading FAISS artifacts: {e}")
-            return None, None
-    else:
-        # Return already loaded objects
-        return loaded_index, loaded_metadata
+            return None
+
+        # A half-copied refresh shows up as a count mismatch; keep serving the old version
+        if index.ntotal != len(metadata):
+            print(f"Error loading FAISS artifacts: index has {index.ntotal} vectors but metadata has {len(metadata)} entries. Keeping the current version.")
+            return None
+
+        searcher = index
+        if binary_tier_paths:
+            try:
+                searcher = load_two_tier(*binary_tier_paths, metric_type=index.metric_type)
+                if searcher.ntotal != index.ntotal:
+                    raise ValueError(f"tier has {searcher.ntotal} vectors but index has {index.ntotal}")
+            except Exception as e:
+                print(f"Error loading binary retrieval tier, falling back to flat search: {e}")
+                searcher = index
+
+        neighbours = None
+        graph_paths = self._graph_paths()
+        if graph_paths:
+            try:
+                neighbours = load_neighbour_graph(graph_paths[0])
+                if len(neighbours) != index.ntotal:
+                    raise ValueError(f"graph has {len(neighbours)} provisions but index has {index.ntotal}")
+            except Exception as e:
+                print(f"Error loading provision neighbour graph, conflicts will not be expanded: {e}")
+                neighbours = None
+
+        sources = None
+        sources_paths = self._sources_paths()
+        if sources_paths:
+            try:
+                sources = load_sources(sources_paths[0])
+                if len(sources) != index.ntotal:
+                    raise ValueError(f"map has {len(sources)} representatives but index has {index.ntotal}")
+            except Exception as e:
+                print(f"Error loading compaction sources map, merged provisions will not be listed: {e}")
+                sources = None
+
+        # Re-check that the files did not change while they were being read
+        if _artifact_signature(paths) != signature:
+            print("FAISS artifacts changed during load; will retry on the next poll.")
+            return None
+
+        return IndexSnapshot(index, metadata, self._version + 1, time.time(), searcher, neighbours, sources,
+                             fingerprint)
+
+    def _publish(self, snapshot, signature):
+        global loaded_index
+        global loaded_metadata
+
+        self._version = snapshot.version
+        self._signature = signature
+        self._snapshot = snapshot
+        loaded_index, loaded_metadata = snapshot.index, snapshot.metadata
+        print(f"Vidhik AI FAISS database loaded successfully (version {snapshot.version}).")
+
+
+if RETRIEVAL_MODE == "binary":
+    legal_index = VersionedIndex(FAISS_INDEX_PATH, FAISS_METADATA_PATH, FAISS_TEXT_STORE_PATH,
+                                 BINARY_INDEX_PATH, FLOAT_VECTORS_PATH, graph_path=NEIGHBOUR_GRAPH_PATH,
+                                 sources_path=FAISS_SOURCES_PATH)
+else:
+    legal_index = VersionedIndex(FAISS_INDEX_PATH, FAISS_METADATA_PATH, FAISS_TEXT_STORE_PATH,
+                                 graph_path=NEIGHBOUR_GRAPH_PATH, sources_path=FAISS_SOURCES_PATH)
+
+hindi_legal_index = VersionedIndex(HINDI_FAISS_INDEX_PATH, HINDI_FAISS_METADATA_PATH, HINDI_FAISS_TEXT_STORE_PATH)
+
+# Embedding model and legal DB for each clause language
+LANGUAGE_MODELS = {"en": EMBEDDING_MODEL_NAME, "hi": HINDI_EMBEDDING_MODEL_NAME}
+LANGUAGE_INDEXES = {"en": legal_index, "hi": hindi_legal_index}
+
+
+def load_faiss_artifacts():
+    """
+    Loads the FAISS index and associated metadata (text chunks) from disk.
+    The artifacts are loaded once and then kept up to date by a background
+    watcher, so a refreshed legal DB is picked up without a restart.
+
+    Returns:
+        tuple: (index, metadata) from the same snapshot, or (None, None) on failure
+    """
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return None, None
+    return snapshot.index, snapshot.metadata
+
+
+def current_snapshot(language=DEFAULT_LANGUAGE):
+    """
+    Returns the active IndexSnapshot for a clause language (or None if its legal DB
+    is not installed or failed to load). Use one snapshot per language for a whole
+    analysis so the index, metadata and searcher match.
+    """
+    versioned_index = LANGUAGE_INDEXES.get(language)
+    if versioned_index is None:
+        return None
+    # Optional language DBs that were never installed are skipped quietly
+    if language != DEFAULT_LANGUAGE and not os.path.exists(versioned_index.index_path):
+        return None
+    snapshot = versioned_index.current()
+    versioned_index.start_watcher()
+    return snapshot
+
+
+def request_reload():
+    """
+    Asks the engine to reload the legal DB of every clause language in the background.
+    Searches keep using the current version until the new one is ready.
+    """
+    for language, versioned_index in LANGUAGE_INDEXES.items():
+        # Optional language DBs that were never installed are skipped quietly
+        if language == DEFAULT_LANGUAGE or os.path.exists(versioned_index.index_path):
+            versioned_index.request_reload()
+
+
+class HashingEmbedder:
+    """
+    Offline stand-in for the SentenceTransformer: hashes word unigrams and
+    bigrams into a signed, L2-normalised vector. Texts sharing words get
+    similar vectors, which is enough for load tests and smoke runs without
+    downloading the model.
+    """
+
+    def __init__(self, dim=STUB_EMBEDDING_DIM):
+        self.dim = dim
+
+    def encode(self, texts, convert_to_numpy=True):
+        embeddings = np.zeros((len(texts), self.dim), dtype='float32')
+        for row, text in enumerate(texts):
+            words = text.lower().split()
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                h = zlib.crc32(feature.encode("utf-8"))
+                embeddings[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+            norm = np.linalg.norm(embeddings[row])
+            if norm > 0:
+                embeddings[row] /= norm
+        return embeddings
+
+
+_inference_executor = None
+_inference_executor_lock = threading.Lock()
+
+
+def get_inference_executor():
+    """
+    Returns the process-wide executor that runs every forward pass. All models
+    share it, so loading the Hindi model does not add INFERENCE_WORKERS more
+    passes (each with TORCH_THREADS threads) on top of the English ones.
+    """
+    global _inference_executor
+
+    if _inference_executor is None:
+        with _inference_executor_lock:
+            if _inference_executor is None:
+                _inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS,
+                                                         thread_name_prefix="vidhik-inference")
+    return _inference_executor
+
+
+class VidhikEngine:
+    """
+    Process-wide engine shared by all Streamlit sessions.
 
-def detect_bias_phrases(text):
+    Owns the embedding model and runs it on the shared inference executor:
+    callers queue behind INFERENCE_WORKERS forward passes (for all models
+    together) instead of all running model.encode at once, so throughput
+    plateaus under load instead of collapsing.
+    """
+
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME, torch_threads=TORCH_THREADS, index=None,
+                 executor=None):
+        self.model_name = model_name
+        self.torch_threads = torch_threads
+        self.index = index if index is not None else legal_index
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._executor = executor if executor is not None else get_inference_executor()
+        # FAISS searches run on the session threads; keep their OpenMP pools small too
+        faiss.omp_set_num_threads(torch_threads)
+
+    @property
+    def model(self):
+        """The embedding model, loaded exactly once on first use."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    if self.model_name == "stub":
+                        self._model = HashingEmbedder()
+                    else:
+                        import torch
+                        from sentence_transformers import SentenceTransformer
+                        torch.set_num_threads(self.torch_threads)
+                        self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def encode(self, texts):
+        """
+        Embeds texts on the shared inference executor.
+
+        Args:
+            texts (list): Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape (len(texts), dim)
+        """
+        return self._executor.submit(self._encode, texts).result()
+
+    def _encode(self, texts):
+        embeddings = self.model.encode(texts, convert_to_numpy=True)
+        return np.asarray(embeddings, dtype='float32')
+
+
+_engines = {}
+_engine_lock = threading.Lock()
+
+
+def get_engine(model_name=EMBEDDING_MODEL_NAME):
+    """
+    Returns the process-wide VidhikEngine for an embedding model, creating it
+    once on first call (the Hindi engine only exists once a Hindi clause is audited).
+    """
+    engine = _engines.get(model_name)
+    if engine is None:
+        with _engine_lock:
+            engine = _engines.get(model_name)
+            if engine is None:
+                engine = _engines[model_name] = VidhikEngine(model_name)
+    return engine
+
+
+_DEVANAGARI = re.compile(r"[\u0900-\u097F]")
+_LATIN = re.compile(r"[A-Za-z]")
+
+
+def detect_language(text):
+    """
+    Routes a clause by script: 'hi' if it has more Devanagari than Latin
+    characters, else 'en' (the default, also for text with no letters).
+    """
+    devanagari = len(_DEVANAGARI.findall(text))
+    return "hi" if devanagari and devanagari > len(_LATIN.findall(text)) else DEFAULT_LANGUAGE
+
+
+def detect_bias_phrases(text, language=DEFAULT_LANGUAGE, lexicons=None):
     """
     Detect potentially biased language in the policy text.
     
     Args:
         text (str): Policy text to analyze for bias
+        language (str): Language whose lexicons to apply (see vidhik_lexicons.py)
+        lexicons (LexiconSet): Optional; defaults to the active lexicons
         
     Returns:
         list: List of flagged phrases with their bias categories
     """
-    # Bias lexicon - expand this based on your requirements
-    bias_lexicons = {
-        "Gender Bias": [
-            "he should", "she should", "the common man", "mankind", 
-            "manpower", "businessman", "waitress", "stewardess"
-        ],
-        "Ability Bias": [
-            "handicapped", "crippled", "retarded", "lame", "insane",
-            "wheelchair bound", "suffers from", "victim of"
-        ],
-        "Age Bias": [
-            "young people", "old people", "the elderly", "senile",
-            "too old to", "digital native", "millennial"
-        ],
-        "Racial/Cultural Bias": [
-            "exotic", "oriental", "articulate", "urban", "ghetto",
-            "tribal knowledge", "spirit animal"
-        ]
-    }
+    # Lexicons live in data/lexicons and are compiled once (see vidhik_lexicons.py)
+    lexicons = lexicons or get_lexicons()
     
     flagged_phrases = []
-    text_lower = text.lower()
-    
-    for category, phrases in bias_lexicons.items():
-        for phrase in phrases:
-            if phrase.lower() in text_lower:
-                flagged_phrases.append({
-                    "phrase": phrase,
-                    "lexicon": category,
-                    "recommendation": f"Consider replacing '{phrase}' with more inclusive language"
-                })
+    for matcher in bias_matchers(lexicons, language):
+        for phrase, category in matcher.find(text):
+            flagged_phrases.append({
+                "phrase": phrase,
+                "lexicon": category,
+                "recommendation": f"Consider replacing '{phrase}' with more inclusive language"
+            })
     
     return flagged_phrases
 
-def detect_pii(text):
+def detect_pii(text, language=DEFAULT_LANGUAGE, lexicons=None):
     """
     Detect potential Personally Identifiable Information (PII) in the policy text.
     
     Args:
         text (str): Policy text to analyze for PII
+        language (str): Language whose patterns to apply, besides the language-independent ones
+        lexicons (LexiconSet): Optional; defaults to the active lexicons
         
     Returns:
         dict: PII detection results
     """
-    # Simple PII patterns - expand with regex for more sophisticated detection
-    pii_patterns = {
-        "Email Address": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        "Phone Number": r'\b(\+?91[\-\s]?)?[789]\d{9}\b',  # Indian phone numbers
-        "Aadhaar Number": r'\b[2-9]{1}[0-9]{3}\s[0-9]{4}\s[0-9]{4}\b',
-        "PAN Number": r'[A-Z]{5}[0-9]{4}[A-Z]{1}',
-        "Credit Card": r'\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b'
-    }
+    # Patterns live in data/lexicons and are compiled once (see vidhik_lexicons.py)
+    lexicons = lexicons or get_lexicons()
     
-    import re
     detected_pii = []
     
-    for pii_type, pattern in pii_patterns.items():
-        matches = re.findall(pattern, text)
-        if matches:
-            detected_pii.extend([{"type": pii_type, "value": match} for match in matches])
+    for pii_type, pattern in pii_patterns(lexicons, language):
+        # finditer keeps the span offsets (and the full match even when the pattern has groups)
+        for match in pattern.finditer(text):
+            detected_pii.append({
+                "type": pii_type,
+                "value": match.group(0),
+                "start": match.start(),
+                "end": match.end()
+            })
     
     return {
         "pii_found": len(detected_pii) > 0,
@@ -126,51 +560,619 @@ def detect_pii(text):
         "status": "PII Found" if detected_pii else "Clean"
     }
 
-def calculate_overall_status(conflicting_laws, bias_phrases, pii_results):
+# --- PII REDACTION ---
+# Typed placeholders written in place of each PII category come from the PII
+# lexicon files ("placeholders", see data/lexicons/pii.json); types without one
+# get a label derived from their name.
+
+# Key for 'hash' redaction mode. Without it, short identifiers such as Aadhaar
+# numbers can be recovered from their hashes by brute force, so the mode is
+# refused when no key is set.
+REDACTION_SECRET = os.environ.get("VIDHIK_REDACTION_SECRET", "")
+
+REDACTION_MODES = ("placeholder", "mask", "hash")
+
+
+# Statuses of a PII report whose detected items can be trusted to cover the text.
+# Reports of a failed or skipped scan have no items, which must not read as "nothing to redact".
+_COMPLETE_PII_STATUSES = ("PII Found", "Clean")
+
+
+def _redaction_spans(text, pii_results, lexicons):
+    """
+    Returns non-overlapping PII spans sorted by offset. Where two patterns
+    overlap (e.g. a card number that also looks like a phone number), the
+    earliest, then longest, match wins.
+    """
+    if (pii_results is None or pii_results.get("status") not in _COMPLETE_PII_STATUSES
+            or any("start" not in item for item in pii_results.get("detected_items", []))):
+        languages = sorted(set(_clause_languages(text, split_clauses(text))))
+        pii_results = _detect_pii_all_languages(text, lexicons, languages)
+
+    spans = sorted(
+        ((item["start"], item["end"], item["type"]) for item in pii_results["detected_items"]),
+        key=lambda span: (span[0], -span[1])
+    )
+    resolved = []
+    last_end = 0
+    for start, end, pii_type in spans:
+        if start >= last_end:
+            resolved.append((start, end, pii_type))
+            last_end = end
+    return resolved
+
+
+def redaction_modes():
+    """Returns the redaction modes available in this deployment ('hash' needs VIDHIK_REDACTION_SECRET)."""
+    return tuple(mode for mode in REDACTION_MODES if mode != "hash" or REDACTION_SECRET)
+
+
+def _placeholder_label(pii_type, placeholders):
+    label = placeholders.get(pii_type)
+    if label is None:
+        label = re.sub(r"[^A-Z0-9]+", "_", pii_type.upper()).strip("_") or "PII"
+    return label
+
+
+def _redaction_token(value, label, mode, secret):
+    if mode == "mask":
+        # Keep separators and the last four characters so officers can still tell entries apart
+        keep_from = len(value) - 4
+        return "".join(c if i >= keep_from or not c.isalnum() else "X" for i, c in enumerate(value))
+    if mode == "hash":
+        digest = hmac.new(secret.encode("utf-8"), value.encode("utf-8"), hashlib.sha256).hexdigest()
+        return f"[{label}:{digest[:12]}]"
+    return f"[{label}]"
+
+
+def write_redacted(text, write, pii_results=None, mode="placeholder", secret=None):
+    """
+    Streams a redacted copy of text to a writer in one linear pass.
+
+    Unchanged text between PII spans is written as slices, so the output is
+    never built by repeated string replacement.
+
+    Args:
+        text (str): Original document text
+        write (callable): Writer such as file.write or io.StringIO().write
+        pii_results (dict): Output of detect_pii or a report's "PII Report"; the text is scanned
+            again unless its status is 'PII Found' or 'Clean' (a failed or skipped scan lists nothing)
+        mode (str): 'placeholder' ([AADHAAR]), 'mask' (XXXX XXXX 1234) or 'hash' ([AADHAAR:1a2b...])
+        secret (str): HMAC key for 'hash' mode (default: VIDHIK_REDACTION_SECRET)
+
+    Returns:
+        list: Mapping entries for authorised reversal, one per redacted span
+
+    Raises:
+        ValueError: If the mode is unknown, 'hash' is used without a secret, or the text
+            has to be scanned again and no PII patterns are loaded
+    """
+    if mode not in REDACTION_MODES:
+        raise ValueError(f"Unknown redaction mode '{mode}'. Use one of: {', '.join(REDACTION_MODES)}")
+    if secret is None:
+        secret = REDACTION_SECRET
+    if mode == "hash" and not secret:
+        raise ValueError("'hash' redaction needs a secret key (set VIDHIK_REDACTION_SECRET); "
+                         "unkeyed hashes of short identifiers can be reversed by brute force")
+    lexicons = get_lexicons()
+
+    mapping = []
+    position = 0
+    redacted_position = 0
+    for start, end, pii_type in _redaction_spans(text, pii_results, lexicons):
+        if start > position:
+            write(text[position:start])
+            redacted_position += start - position
+
+        original = text[start:end]
+        token = _redaction_token(original, _placeholder_label(pii_type, lexicons.placeholders), mode, secret)
+        write(token)
+        mapping.append({
+            "type": pii_type,
+            "original": original,
+            "replacement": token,
+            "start": start,
+            "end": end,
+            "redacted_start": redacted_position,
+            "redacted_end": redacted_position + len(token)
+        })
+        redacted_position += len(token)
+        position = end
+
+    if position < len(text):
+        write(text[position:])
+    return mapping
+
+
+def redact_pii(text, pii_results=None, mode="placeholder", secret=None):
+    """
+    Produce a redacted copy of the policy text from the PII scanner's span offsets.
+
+    Args:
+        text (str): Original document text
+        pii_results (dict): Output of detect_pii or a report's "PII Report"; the text is scanned
+            again unless its status is 'PII Found' or 'Clean' (a failed or skipped scan lists nothing)
+        mode (str): 'placeholder', 'mask' or 'hash' (see write_redacted)
+        secret (str): HMAC key for 'hash' mode
+
+    Returns:
+        dict: Redacted text, the reversal mapping and the number of redactions
+
+    Raises:
+        ValueError: If the mode is unknown, 'hash' is used without a secret, or the text
+            has to be scanned again and no PII patterns are loaded
+    """
+    buffer = io.StringIO()
+    mapping = write_redacted(text, buffer.write, pii_results, mode, secret)
+    return {
+        "redacted_text": buffer.getvalue(),
+        "mapping": mapping,
+        "redaction_count": len(mapping)
+    }
+
+
+def restore_redacted(redacted_text, mapping):
+    """
+    Reverse a redaction using the mapping returned by redact_pii/write_redacted.
+    Only authorised officers should hold the mapping, since it contains the original values.
+
+    Args:
+        redacted_text (str): Redacted document text
+        mapping (list): Mapping entries, in document order
+
+    Returns:
+        str: The original document text
+    """
+    pieces = []
+    position = 0
+    for entry in mapping:
+        pieces.append(redacted_text[position:entry["redacted_start"]])
+        pieces.append(entry["original"])
+        position = entry["redacted_end"]
+    pieces.append(redacted_text[position:])
+    return "".join(pieces)
+
+
+def write_redacted_file(text, path, pii_results=None, mode="placeholder", secret=None):
+    """
+    Write a redacted copy of the document straight to a .txt or .docx file.
+
+    Args:
+        text (str): Original document text
+        path (str): Output path; the extension selects TXT or DOCX output
+        pii_results (dict): Output of detect_pii or a report's "PII Report"; the text is scanned
+            again unless its status is 'PII Found' or 'Clean' (a failed or skipped scan lists nothing)
+        mode (str): 'placeholder', 'mask' or 'hash' (see write_redacted)
+        secret (str): HMAC key for 'hash' mode
+
+    Returns:
+        list: Mapping entries for authorised reversal
+    """
+    if path.lower().endswith(".docx"):
+        import docx
+
+        buffer = io.StringIO()
+        mapping = write_redacted(text, buffer.write, pii_results, mode, secret)
+        document = docx.Document()
+        for line in buffer.getvalue().split("\n"):
+            document.add_paragraph(line)
+        document.save(path)
+        return mapping
+
+    with open(path, "w", encoding="utf-8") as f:
+        return write_redacted(text, f.write, pii_results, mode, secret)
+
+# --- CLAUSE SEGMENTATION ---
+# Clauses longer than this are split at sentence boundaries, and sentences
+# longer than this are wrapped at whitespace
+MAX_CLAUSE_CHARS = 1000
+# Clauses embedded per forward pass
+EMBEDDING_BATCH_SIZE = 32
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.;:!?\u0964])\s+")
+
+
+def split_clauses(text):
+    """
+    Split a policy into clauses: paragraphs separated by blank lines, with
+    long paragraphs further split at sentence boundaries. No clause is longer
+    than MAX_CLAUSE_CHARS: longer sentences are wrapped at the last whitespace
+    before the limit, or cut at the limit if there is none.
+
+    Args:
+        text (str): Policy text
+
+    Returns:
+        list: (start, end) character offsets of each non-empty clause; a text
+            with no content yields a single span covering it
+    """
+    spans = []
+    paragraph_start = 0
+    for match in list(_PARAGRAPH_BREAK.finditer(text)) + [None]:
+        paragraph_end = match.start() if match else len(text)
+        _append_clause_spans(text, paragraph_start, paragraph_end, spans)
+        if match:
+            paragraph_start = match.end()
+    return spans or [(0, len(text))]
+
+
+def _append_clause_spans(text, start, end, spans):
+    # Trim surrounding whitespace
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start >= end:
+        return
+    if end - start <= MAX_CLAUSE_CHARS:
+        spans.append((start, end))
+        return
+
+    # Pack whole sentences into clauses of at most MAX_CLAUSE_CHARS
+    clause_start, clause_end = start, None
+    sentence_start = start
+    for match in list(_SENTENCE_END.finditer(text, start, end)) + [None]:
+        sentence_end = match.start() if match else end
+        if clause_end is not None and sentence_end - clause_start > MAX_CLAUSE_CHARS:
+            spans.append((clause_start, clause_end))
+            clause_start = sentence_start
+        # A single sentence longer than the limit is wrapped
+        while sentence_end - clause_start > MAX_CLAUSE_CHARS:
+            cut = _wrap_point(text, clause_start, clause_start + MAX_CLAUSE_CHARS)
+            spans.append((clause_start, cut))
+            clause_start = cut
+            while text[clause_start].isspace():
+                clause_start += 1
+        clause_end = sentence_end
+        if match:
+            sentence_start = match.end()
+    spans.append((clause_start, clause_end))
+
+
+def _wrap_point(text, start, limit):
+    # End of the last word that fits in text[start:limit], or the limit itself
+    for i in range(limit, start, -1):
+        if text[i].isspace():
+            while text[i - 1].isspace():
+                i -= 1
+            return i
+    return limit
+
+# --- CONFLICT FINDINGS ---
+# Conflicts are held as compact records while the report is assembled; the
+# provision preview is looked up by ID when the report is rendered (see
+# format_conflicts), and the full text only on demand (see provision_text).
+# Scores stay numeric in the report and are formatted where they are displayed.
+
+RISK_LOW, RISK_MEDIUM, RISK_HIGH = 0, 1, 2
+RISK_LABELS = ("LOW", "MEDIUM", "HIGH")
+# Related provisions (from the neighbour graph) listed under each conflict
+RELATED_PROVISIONS_PER_CONFLICT = 3
+# Reports carry provision previews, which the text store serves without
+# decompressing anything; the full text is looked up by ID when displayed
+RELATED_PREVIEW_CHARS = PREVIEW_CHARS
+# Decimal places kept of similarity scores in reports
+SCORE_DIGITS = 4
+
+# clause_id is the 1-based clause number, provision_id the row in the metadata of
+# the legal DB for `language` (each clause language is searched in its own DB)
+ConflictFinding = namedtuple("ConflictFinding", ["clause_id", "provision_id", "score", "risk_code", "language"])
+
+
+def risk_code(similarity_score):
+    """Maps a similarity score to RISK_HIGH, RISK_MEDIUM or RISK_LOW."""
+    if similarity_score > 0.7:
+        return RISK_HIGH
+    if similarity_score > 0.5:
+        return RISK_MEDIUM
+    return RISK_LOW
+
+
+def format_conflicts(findings, snapshots, related_limit=RELATED_PROVISIONS_PER_CONFLICT):
+    """
+    Renders conflict findings as the report's "Conflicting Laws" entries.
+
+    Args:
+        findings (list): ConflictFinding records, best match first
+        snapshots (dict): Language -> IndexSnapshot the findings came from; provision
+            previews are read from its metadata, and its neighbour graph and compaction
+            sources map (if built) add related and merged provisions
+        related_limit (int): Maximum related provisions listed per conflict
+
+    Returns:
+        list: One dict per finding (Rank, Similarity Score, Clause, Language, Provision ID,
+            Legal Provision preview, Risk Level and, if available, Merged Provisions and Related Provisions)
+    """
+    conflicts = []
+    found = {(finding.language, finding.provision_id) for finding in findings}
+    for rank, finding in enumerate(findings, start=1):
+        snapshot = snapshots[finding.language]
+        conflict = {
+            "Rank": rank,
+            "Similarity Score": round(finding.score, SCORE_DIGITS),
+            "Clause": finding.clause_id,
+            "Language": finding.language,
+            "Provision ID": finding.provision_id,
+            "Legal Provision": preview_text(snapshot.metadata, finding.provision_id),
+            "Risk Level": RISK_LABELS[finding.risk_code]
+        }
+        if snapshot.sources is not None:
+            # Previews of the near duplicates compacted into this provision (it is listed first)
+            merged = snapshot.sources.texts_of(finding.provision_id)
+            if len(merged) > 1:
+                conflict["Merged Provisions"] = merged[1:]
+        if snapshot.neighbours is not None:
+            exclude = {provision_id for language, provision_id in found if language == finding.language}
+            conflict["Related Provisions"] = _related_provisions(finding.provision_id, snapshot.metadata,
+                                                                 snapshot.neighbours, exclude, related_limit)
+        conflicts.append(conflict)
+    return conflicts
+
+
+def _related_provisions(provision_id, metadata, neighbours, exclude, limit):
+    """Looks up a provision's nearest other provisions in the graph, skipping ones already reported."""
+    related = []
+    ids, scores = neighbours.neighbours(provision_id)
+    for related_id, score in zip(ids.tolist(), scores.tolist()):
+        if related_id in exclude:
+            continue
+        related.append({
+            "Provision ID": related_id,
+            "Similarity Score": round(score, SCORE_DIGITS),
+            "Legal Provision": preview_text(metadata, related_id, RELATED_PREVIEW_CHARS)
+        })
+        if len(related) == limit:
+            break
+    return related
+
+
+def provision_text(provision_id, language=DEFAULT_LANGUAGE, index_version=None):
+    """
+    Looks up the full text of a provision listed in a report.
+
+    Args:
+        provision_id (int): "Provision ID" of a conflict or related provision
+        language (str): "Language" of the conflict
+        index_version (int): The report's "Index Versions" entry for the language, if known
+
+    Returns:
+        str: The provision text, or None if the legal DB is not loaded or has been
+            reloaded since the report was made (provision IDs may have changed)
+    """
+    snapshot = current_snapshot(language)
+    if snapshot is None or (index_version is not None and snapshot.version != index_version):
+        return None
+    if not 0 <= provision_id < len(snapshot.metadata):
+        return None
+    return str(snapshot.metadata[provision_id])
+
+
+def calculate_overall_status(conflicting_laws, bias_phrases, pii_results, scan_errors=None):
     """
     Calculate overall status based on analysis results.
     
     Args:
-        conflicting_laws (list): List of conflicting legal provisions
+        conflicting_laws (list): ConflictFinding records or "Conflicting Laws" report entries,
+            or None if the conflict search was not run
         bias_phrases (list): List of flagged biased phrases
         pii_results (dict): PII detection results
+        scan_errors (list): Names of the scanners that failed, if any; their empty results
+            cannot show the policy is clean
         
     Returns:
-        str: Overall status ('High Risk', 'Medium Risk', 'Low Risk', 'Clean')
+        str: Overall status ('High Risk', 'Medium Risk', 'Low Risk', 'Clean', 'Scan Error')
     """
+    conflicting_laws = conflicting_laws or []
+    
     # Count risk factors
-    high_risk_conflicts = len([law for law in conflicting_laws if law.get("Risk Level") == "HIGH"])
+    has_high_risk_conflicts = any(_risk_label(law) == "HIGH" for law in conflicting_laws)
     has_pii = pii_results.get("pii_found", False)
     has_bias = len(bias_phrases) > 0
     has_any_conflicts = len(conflicting_laws) > 0
     
     # Determine overall status
-    if high_risk_conflicts > 0 or has_pii:
+    if has_high_risk_conflicts or has_pii:
         return "High Risk"
+    elif scan_errors:
+        return "Scan Error"
     elif has_any_conflicts or has_bias:
         return "Medium Risk"
     else:
         return "Clean"
 
-def analyze_policy(new_policy_text, similarity_threshold=0.3):
+# --- ANALYSIS MODES ---
+# quick:    bias and PII scanners only; never loads the model or the legal DB, so
+#           it can re-run on every edit. Quick scans are not recorded in the audit history.
+# standard: the full audit.
+# deep:     the full audit with more provisions retrieved per clause and more
+#           related provisions listed per conflict.
+ANALYSIS_MODES = ("quick", "standard", "deep")
+SEARCH_K = {"standard": 5, "deep": 20}
+RELATED_PROVISIONS = {"standard": RELATED_PROVISIONS_PER_CONFLICT, "deep": 8}
+
+
+def analyze_policy(new_policy_text, similarity_threshold=0.3, department=None, progress_callback=None,
+                   mode="standard"):
     """
     Core function for policy analysis. This function:
-    1. Loads the FAISS database (via load_faiss_artifacts).
-    2. Embeds the new_policy_text.
-    3. Searches the FAISS index for conflicts (high similarity).
+    1. Loads the FAISS database snapshot (via current_snapshot).
+    2. Splits the new_policy_text into clauses and embeds them in batches, routing
+       each clause by script to the English or Hindi model and legal DB.
+    3. Searches the FAISS index for conflicts (high similarity) per clause,
+       reusing cached hits for clauses unchanged since a near-duplicate draft.
     4. Compiles the comprehensive audit report (legal, ethical, PII).
+    5. Records the result in the audit history (see vidhik_audit_store.py).
 
     Args:
         new_policy_text (str): The text of the policy/clause to analyze.
         similarity_threshold (float): Threshold for considering matches as conflicts (lower = more strict)
+        department (str): Submitting department, used for per-department compliance figures
+        progress_callback (callable): Optional; called with a progress dict
+            ({"stage", "done", "total", "findings"}) as clauses are embedded and scanned
+        mode (str): One of ANALYSIS_MODES; 'quick' returns a partial report (bias and PII only)
         
     Returns:
         dict: A comprehensive audit report in JSON format.
+
+    Raises:
+        ValueError: If mode is not one of ANALYSIS_MODES
+    """
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"Unknown analysis mode '{mode}'; expected one of {', '.join(ANALYSIS_MODES)}")
+
+    started_at = time.time()
+    start = time.perf_counter()
+    report_hash = hashlib.sha256(new_policy_text.encode("utf-8")).hexdigest()
+    # One lexicon version for the whole audit, even if the files are reloaded meanwhile
+    lexicons = get_lexicons()
+    if mode == "quick":
+        report = _run_quick_scan(new_policy_text, lexicons)
+    else:
+        report = _run_analysis(new_policy_text, similarity_threshold, report_hash, lexicons, progress_callback, mode)
+    duration_ms = (time.perf_counter() - start) * 1000
+    report["Audit Metadata"] = {
+        "Report Hash": report_hash,
+        "Department": department,
+        "Analysis Mode": mode,
+        "Lexicon Version": lexicons.version,
+        "Audited At": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started_at)),
+        "Duration (ms)": round(duration_ms, 1)
+    }
+    if mode != "quick":
+        _record_audit(report, report_hash, department, duration_ms, len(new_policy_text), started_at)
+        _export_analytics(report)
+    return report
+
+
+def _record_audit(report, report_hash, department, duration_ms, chars, started_at):
+    """Appends the report to the audit history; failures are logged, never raised."""
+    if not AUDIT_DB_PATH:
+        return
+    raw_reports = report.get("Raw Reports", {})
+    try:
+        get_audit_store().record(
+            report_hash,
+            report.get("Overall Status", "Unknown"),
+            department=department,
+            duration_ms=duration_ms,
+            chars=chars,
+            conflicts=len(raw_reports.get("Conflict Report", {}).get("Conflicting Laws", [])),
+            bias_findings=len(raw_reports.get("Bias Report", {}).get("flagged_phrases", [])),
+            pii_items=len(raw_reports.get("PII Report", {}).get("detected_items", [])),
+            created_at=started_at
+        )
+    except Exception as e:
+        print(f"Error recording audit history: {e}")
+
+
+def _export_analytics(report):
+    """Queues the report's findings for the Parquet analytics export; failures are logged, never raised."""
+    if not ANALYTICS_DIR or get_analytics_writer is None:
+        return
+    try:
+        get_analytics_writer().append(report)
+    except Exception as e:
+        print(f"Error exporting audit for analytics: {e}")
+
+
+def _scan_text(text, lexicons, languages=(DEFAULT_LANGUAGE,)):
     """
-    # Load FAISS artifacts
-    index, metadata = load_faiss_artifacts()
+    Runs the bias and PII scanners with the lexicons of each language in the text.
+    A scanner that fails, or has no lexicons loaded at all, is logged and reported
+    as empty and failed.
+
+    Returns:
+        tuple: (bias results, PII results, names of the failed scanners)
+    """
+    scan_errors = []
+    try:
+        if not lexicons.bias:
+            raise ValueError(f"no bias lexicons are loaded from {LEXICON_DIR}")
+        bias_results = []
+        for language in languages:
+            bias_results.extend(detect_bias_phrases(text, language, lexicons))
+    except Exception as e:
+        bias_results = []
+        scan_errors.append("Bias")
+        print(f"Error during bias detection: {e}")
     
-    if index is None or metadata is None:
+    try:
+        pii_results = _detect_pii_all_languages(text, lexicons, languages)
+    except Exception as e:
+        pii_results = {"pii_found": False, "detected_items": [], "status": "Error"}
+        scan_errors.append("PII")
+        print(f"Error during PII detection: {e}")
+    return bias_results, pii_results, scan_errors
+
+
+def _detect_pii_all_languages(text, lexicons, languages):
+    """
+    Runs detect_pii with the patterns of each language and merges the results.
+
+    Raises:
+        ValueError: If no PII patterns are loaded, so a clean result would mean nothing
+    """
+    if not lexicons.pii:
+        raise ValueError(f"no PII patterns are loaded from {LEXICON_DIR}")
+    pii_results = detect_pii(text, languages[0], lexicons)
+    seen = {(item["type"], item["start"], item["end"]) for item in pii_results["detected_items"]}
+    for language in languages[1:]:
+        # Language-independent patterns run again for each language; keep their matches once
+        for item in detect_pii(text, language, lexicons)["detected_items"]:
+            if (item["type"], item["start"], item["end"]) not in seen:
+                seen.add((item["type"], item["start"], item["end"]))
+                pii_results["detected_items"].append(item)
+    pii_results["pii_found"] = len(pii_results["detected_items"]) > 0
+    pii_results["status"] = "PII Found" if pii_results["pii_found"] else "Clean"
+    return pii_results
+
+
+def _scan_error_notes(scan_errors):
+    """Recommendations section listing the scanners that failed (empty if none did)."""
+    if not scan_errors:
+        return ""
+    return (f"\n\n### ⚠️ Scanner Error\n- The {' and '.join(scan_errors)} scan(s) failed, so their findings are "
+            f"missing from this report. Check the lexicon files in {LEXICON_DIR} and run the audit again.")
+
+
+def _run_quick_scan(new_policy_text, lexicons):
+    """Runs only the text scanners and returns a partial report (no conflict search)."""
+    languages = _clause_languages(new_policy_text, split_clauses(new_policy_text))
+    bias_results, pii_results, scan_errors = _scan_text(new_policy_text, lexicons, sorted(set(languages)))
+    return {
+        "Overall Status": calculate_overall_status(None, bias_results, pii_results, scan_errors),
+        "Actionable Recommendations": (generate_recommendations(None, bias_results, pii_results, None)
+                                       + _scan_error_notes(scan_errors)),
+        "Raw Reports": {
+            "Conflict Report": {"Status": "Not Run", "Conflicting Laws": []},
+            "Bias Report": {"Status": "Failed" if "Bias" in scan_errors else "Success", "flagged_phrases": bias_results},
+            "PII Report": pii_results
+        }
+    }
+
+
+def _clause_languages(text, clauses):
+    return [detect_language(text[start:end]) for start, end in clauses]
+
+
+def _run_analysis(new_policy_text, similarity_threshold, report_hash, lexicons, progress_callback=None,
+                  mode="standard"):
+    """Runs the audit pipeline behind analyze_policy and returns the report."""
+    search_k = SEARCH_K[mode]
+
+    # 1. Split the policy into clauses; each is embedded separately because the
+    # model only reads the first few hundred tokens of any input. Each clause is
+    # routed by language to its own model and legal DB.
+    clauses = split_clauses(new_policy_text)
+    clause_texts = [new_policy_text[start:end] for start, end in clauses]
+    clause_languages = _clause_languages(new_policy_text, clauses)
+    languages = sorted(set(clause_languages))
+
+    # Load FAISS artifacts, one snapshot per language
+    snapshots = {language: current_snapshot(language) for language in languages}
+    
+    if DEFAULT_LANGUAGE in snapshots and snapshots[DEFAULT_LANGUAGE] is None:
         # Return a failure report if the database is missing
         return {
             "Overall Status": "Database Error",
@@ -181,63 +1183,120 @@ def analyze_policy(new_policy_text, similarity_threshold=0.3):
                 "PII Report": {"Status": "Not Run", "pii_found": False, "detected_items": []}
             }
         }
-    
-    # 1. Embed the policy text
-    try:
-        new_embedding = model.encode([new_policy_text])
-        new_embedding = np.array(new_embedding).astype('float32')
-    except Exception as e:
-        return {
-            "Overall Status": "Processing Error",
-            "Actionable Recommendations": f"### Embedding Error\n- Failed to encode policy text: {str(e)}",
-            "Raw Reports": {
-                "Conflict Report": {"Status": "Failed", "Conflicting Laws": []},
-                "Bias Report": {"Status": "Not Run", "flagged_phrases": []},
-                "PII Report": {"Status": "Not Run", "pii_found": False, "detected_items": []}
-            }
-        }
-    
-    # 2. Search FAISS for similar legal provisions
-    try:
-        k = 5  # Number of similar documents to retrieve
-        D, I = index.search(new_embedding, k)
-        
-        conflicting_laws = []
-        for i, (distance, idx) in enumerate(zip(D[0], I[0])):
-            # Convert cosine similarity distance to similarity score (assuming cosine similarity)
-            similarity_score = 1 - distance if distance <= 2 else 0  # Simple conversion for cosine distance
-            
-            if similarity_score > similarity_threshold and idx < len(metadata):
-                law_text = metadata[idx]
-                conflicting_laws.append({
-                    "Rank": i + 1,
-                    "Similarity Score": f"{similarity_score:.3f}",
-                    "Legal Provision": law_text,
-                    "Risk Level": "HIGH" if similarity_score > 0.7 else "MEDIUM" if similarity_score > 0.5 else "LOW"
+    # Other languages' DBs are optional; their clauses are reported as not searched
+    snapshots = {language: snapshot for language, snapshot in snapshots.items() if snapshot is not None}
+    index_versions = {language: snapshot.version for language, snapshot in snapshots.items()}
+
+    # 2. Look for an earlier audit of the same or a near-identical draft; its
+    # per-clause search hits are reused for unchanged clauses (same index version only)
+    clause_keys = [clause_key(clause) for clause in clause_texts]
+    draft_index = get_draft_index()
+    near_duplicate = draft_index.get(report_hash)
+    if near_duplicate is not None:
+        signature, near_duplicate_similarity = near_duplicate.signature, 1.0
+    else:
+        signature = minhash_signature(new_policy_text)
+        near_duplicate, near_duplicate_similarity = draft_index.find(signature)
+    cached_hits, cached_versions = {}, {}
+    if near_duplicate is not None and near_duplicate.payload["search_k"] >= search_k:
+        cached_hits = near_duplicate.payload["clause_hits"]
+        cached_versions = near_duplicate.payload["index_versions"]
+    clause_hits = [None] * len(clause_texts)
+    for i, (key, language) in enumerate(zip(clause_keys, clause_languages)):
+        hits = cached_hits.get(key)
+        if hits is not None and language in index_versions and cached_versions.get(language) == index_versions[language]:
+            clause_hits[i] = hits[:search_k]
+    pending = [i for i, hits in enumerate(clause_hits) if hits is None]
+    # Clauses in a language whose legal DB is not installed are not embedded at all
+    unsearched = [i for i in pending if clause_languages[i] not in snapshots]
+    done = len(clause_texts) - len(pending)
+
+    # 3. Embed the remaining clauses in batches per language and search FAISS for similar legal provisions
+    search_failed = False
+    for language, snapshot in snapshots.items():
+        route = [i for i in pending if clause_languages[i] == language]
+        for batch_start in range(0, len(route), EMBEDDING_BATCH_SIZE):
+            batch_ids = route[batch_start:batch_start + EMBEDDING_BATCH_SIZE]
+            try:
+                new_embedding = get_engine(LANGUAGE_MODELS[language]).encode([clause_texts[i] for i in batch_ids])
+            except Exception as e:
+                return {
+                    "Overall Status": "Processing Error",
+                    "Actionable Recommendations": f"### Embedding Error\n- Failed to encode policy text: {str(e)}",
+                    "Raw Reports": {
+                        "Conflict Report": {"Status": "Failed", "Conflicting Laws": []},
+                        "Bias Report": {"Status": "Not Run", "flagged_phrases": []},
+                        "PII Report": {"Status": "Not Run", "pii_found": False, "detected_items": []}
+                    }
+                }
+
+            try:
+                D, I = snapshot.searcher.search(new_embedding, search_k)
+                
+                for clause_id, distances, indices in zip(batch_ids, D, I):
+                    hits = []
+                    for distance, idx in zip(distances, indices):
+                        # Convert cosine similarity distance to similarity score (assuming cosine similarity)
+                        similarity_score = 1 - distance if distance <= 2 else 0  # Simple conversion for cosine distance
+                        if 0 <= idx < len(snapshot.metadata):
+                            hits.append((int(idx), float(similarity_score)))
+                    clause_hits[clause_id] = hits
+            except Exception as e:
+                search_failed = True
+                print(f"Error during FAISS search: {e}")
+
+            done += len(batch_ids)
+            if progress_callback:
+                progress_callback({
+                    "stage": "embedding",
+                    "done": done,
+                    "total": len(clause_texts) - len(unsearched),
+                    "findings": sum(len(hits) for hits in clause_hits if hits)
                 })
-    except Exception as e:
-        conflicting_laws = []
-        print(f"Error during FAISS search: {e}")
+
+    if not search_failed:
+        draft_index.add(report_hash, signature, {
+            "index_versions": index_versions,
+            "search_k": search_k,
+            "clause_hits": {key: hits for key, hits in zip(clause_keys, clause_hits) if hits is not None}
+        })
+
+    # Keep each provision once, under the clause that matches it best
+    best_hits = {}  # (language, provision index) -> (similarity score, clause number)
+    for clause_number, (hits, language) in enumerate(zip(clause_hits, clause_languages), start=1):
+        for idx, similarity_score in hits or ():
+            if similarity_score > similarity_threshold:
+                key = (language, idx)
+                if key not in best_hits or similarity_score > best_hits[key][0]:
+                    best_hits[key] = (similarity_score, clause_number)
+
+    conflicts = sorted(
+        (ConflictFinding(clause_number, idx, similarity_score, risk_code(similarity_score), language)
+         for (language, idx), (similarity_score, clause_number) in best_hits.items()),
+        key=lambda finding: finding.score, reverse=True
+    )
     
-    # 3. Run bias detection
-    try:
-        bias_results = detect_bias_phrases(new_policy_text)
-    except Exception as e:
-        bias_results = []
-        print(f"Error during bias detection: {e}")
+    # 4. Run bias and PII detection
+    bias_results, pii_results, scan_errors = _scan_text(new_policy_text, lexicons, languages)
     
-    # 4. Run PII detection
-    try:
-        pii_results = detect_pii(new_policy_text)
-    except Exception as e:
-        pii_results = {"pii_found": False, "detected_items": [], "status": "Error"}
-        print(f"Error during PII detection: {e}")
+    if progress_callback:
+        progress_callback({
+            "stage": "scanning",
+            "done": 1,
+            "total": 1,
+            "findings": len(conflicts) + len(bias_results) + len(pii_results["detected_items"])
+        })
     
     # 5. Calculate overall status
-    overall_status = calculate_overall_status(conflicting_laws, bias_results, pii_results)
+    overall_status = calculate_overall_status(conflicts, bias_results, pii_results, scan_errors)
     
     # 6. Generate actionable recommendations
-    recommendations = generate_recommendations(conflicting_laws, bias_results, pii_results)
+    recommendations = generate_recommendations(conflicts, bias_results, pii_results, snapshots)
+    if unsearched:
+        missing = sorted({clause_languages[i] for i in unsearched})
+        recommendations += (f"\n\n### ⚠️ Language Coverage\n- {len(unsearched)} clause(s) were not checked for legal "
+                            f"conflicts: no legal DB is installed for {', '.join(missing)}")
+    recommendations += _scan_error_notes(scan_errors)
     
     # 7. Compile final report
     report = {
@@ -245,28 +1304,43 @@ def analyze_policy(new_policy_text, similarity_threshold=0.3):
         "Actionable Recommendations": recommendations,
         "Raw Reports": {
             "Conflict Report": {
-                "Status": "Success" if index is not None else "Failed",
+                "Status": "Partial" if unsearched else "Success",
                 "Similarity Threshold Used": similarity_threshold,
-                "Conflicting Laws": conflicting_laws
+                "Clauses by Language": {language: clause_languages.count(language) for language in languages},
+                "Clauses Without a Legal DB": len(unsearched),
+                "Index Versions": index_versions,
+                "Legal DB Fingerprints": {language: snapshot.fingerprint for language, snapshot in snapshots.items()},
+                "Conflicting Laws": format_conflicts(conflicts, snapshots, RELATED_PROVISIONS[mode])
             },
             "Bias Report": {
-                "Status": "Success",
+                "Status": "Failed" if "Bias" in scan_errors else "Success",
                 "flagged_phrases": bias_results
             },
-            "PII Report": pii_results
+            "PII Report": pii_results,
+            "Near-Duplicate Check": {
+                "Status": ("New draft" if near_duplicate is None else
+                           "Exact duplicate" if near_duplicate.draft_id == report_hash else "Near duplicate"),
+                "Similar To": near_duplicate.draft_id if near_duplicate is not None else None,
+                "Estimated Similarity": round(near_duplicate_similarity, 3),
+                "Clauses Reused": len(clause_texts) - len(pending),
+                "Clauses Analysed": len(pending) - len(unsearched)
+            }
         }
     }
     
     return report
 
-def generate_recommendations(conflicting_laws, bias_phrases, pii_results):
+def generate_recommendations(conflicting_laws, bias_phrases, pii_results, snapshots=None):
     """
     Generate actionable recommendations based on analysis results.
     
     Args:
-        conflicting_laws (list): List of conflicting legal provisions
+        conflicting_laws (list): ConflictFinding records or "Conflicting Laws" report entries, best
+            match first, or None if the conflict search was not run
         bias_phrases (list): List of flagged biased phrases
         pii_results (dict): PII detection results
+        snapshots (dict): Language -> IndexSnapshot whose metadata the records refer to
+            (default: the currently loaded legal DBs)
         
     Returns:
         str: Formatted recommendations string
@@ -274,20 +1348,23 @@ def generate_recommendations(conflicting_laws, bias_phrases, pii_results):
     recommendations = []
     
     # Legal conflict recommendations
-    if conflicting_laws:
+    if conflicting_laws is None:
+        recommendations.append("### ⏭️ Legal Conflict Analysis")
+        recommendations.append("- Not run in quick scan mode; run a full audit to check for legal conflicts")
+    elif conflicting_laws:
         recommendations.append("### ⚖️ Recommendations for Legal Conflicts")
-        high_risk = [law for law in conflicting_laws if law["Risk Level"] == "HIGH"]
-        medium_risk = [law for law in conflicting_laws if law["Risk Level"] == "MEDIUM"]
+        high_risk = [law for law in conflicting_laws if _risk_label(law) == "HIGH"]
+        medium_risk = [law for law in conflicting_laws if _risk_label(law) == "MEDIUM"]
         
         if high_risk:
             recommendations.append("- **HIGH RISK CONFLICTS DETECTED**: Immediate review required")
             for law in high_risk[:2]:  # Show top 2 high-risk conflicts
-                recommendations.append(f"  - Conflict with similarity {law['Similarity Score']}: {law['Legal Provision'][:100]}...")
+                recommendations.append(f"  - Conflict with similarity {_score_text(law)}: {_provision_text(snapshots, law, 100)}...")
         
         if medium_risk:
             recommendations.append("- **Medium risk conflicts found**: Consider reviewing")
             for law in medium_risk[:2]:  # Show top 2 medium-risk conflicts
-                recommendations.append(f"  - Potential conflict: {law['Legal Provision'][:80]}...")
+                recommendations.append(f"  - Potential conflict: {_provision_text(snapshots, law, 80)}...")
         
         recommendations.append(f"\n**Total conflicts found**: {len(conflicting_laws)}")
     else:
@@ -319,6 +1396,31 @@ def generate_recommendations(conflicting_laws, bias_phrases, pii_results):
     
     return "\n".join(recommendations)
 
+# Conflicts reach the status and recommendation helpers either as ConflictFinding
+# records (from analyze_policy) or as "Conflicting Laws" entries of a report
+
+def _risk_label(law):
+    if isinstance(law, ConflictFinding):
+        return RISK_LABELS[law.risk_code]
+    return law.get("Risk Level")
+
+
+def _score_text(law):
+    score = law.score if isinstance(law, ConflictFinding) else law.get("Similarity Score")
+    try:
+        return f"{float(score):.3f}"
+    except (TypeError, ValueError):
+        return str(score)
+
+
+def _provision_text(snapshots, law, length):
+    if not isinstance(law, ConflictFinding):
+        return str(law.get("Legal Provision", ""))[:length]
+    snapshot = snapshots.get(law.language) if snapshots is not None else current_snapshot(law.language)
+    if snapshot is None:
+        return f"Provision {law.provision_id}"
+    return preview_text(snapshot.metadata, law.provision_id, length)
+
 # Example usage and test
 if __name__ == "__main__":
     # Test the function with sample policy text
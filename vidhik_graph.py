@@ -0,0 +1,131 @@
+# --- vidhik_graph.py (Precomputed provision neighbour graph) ---
+"""
+k-nearest-neighbour graph over the provisions of the legal DB.
+
+Built once, next to the index, by searching every provision against the
+index itself. Each provision keeps its closest other provisions above a
+similarity floor (typically its definitions, exceptions and penalties), so
+the graph is stored in CSR form: `indptr` (n + 1 offsets), `indices` (int32
+provision IDs) and `scores` (float16 similarities). analyze_policy expands a
+conflicting provision to its related ones with two array slices instead of
+another ANN query.
+
+Build the graph next to the existing index:
+    python vidhik_graph.py build --k 8
+"""
+import argparse
+import os
+
+import numpy as np
+
+NEIGHBOUR_GRAPH_PATH = "data/vidhik_legal_db_graph.npz"
+
+# Neighbours kept per provision, and the similarity below which they are dropped
+DEFAULT_NEIGHBOURS = 8
+DEFAULT_MIN_SIMILARITY = 0.5
+# Provisions searched per batch while building
+BUILD_BATCH_SIZE = 4096
+
+
+def _similarity(distances):
+    # Same conversion as analyze_policy, so scores are comparable with conflict scores
+    return np.where(distances <= 2, 1 - distances, 0).astype("float32")
+
+
+def build_neighbour_graph(index, graph_path=NEIGHBOUR_GRAPH_PATH, k=DEFAULT_NEIGHBOURS,
+                          min_similarity=DEFAULT_MIN_SIMILARITY):
+    """
+    Builds the provision neighbour graph from a FAISS index and writes it as CSR arrays.
+
+    Args:
+        index (faiss.Index): Index whose vectors can be reconstructed (e.g. a flat index)
+        graph_path (str): Output .npz path
+        k (int): Maximum neighbours per provision
+        min_similarity (float): Neighbours at or below this similarity are not stored
+
+    Returns:
+        dict: Provision count, edge count and size of the written file in bytes
+    """
+    n = index.ntotal
+    counts = np.zeros(n, dtype="int64")
+    indices, scores = [], []
+    for start in range(0, n, BUILD_BATCH_SIZE):
+        batch = index.reconstruct_n(start, min(BUILD_BATCH_SIZE, n - start))
+        D, I = index.search(batch, min(k + 1, n))
+        similarity = _similarity(D)
+        own_ids = np.arange(start, start + len(batch))[:, None]
+        keep = (I >= 0) & (I != own_ids) & (similarity > min_similarity)
+        keep &= np.cumsum(keep, axis=1) <= k
+        # Boolean indexing walks row by row, so each row's neighbours stay contiguous and ordered
+        indices.append(I[keep].astype("int32"))
+        scores.append(similarity[keep].astype("float16"))
+        counts[start:start + len(batch)] = keep.sum(axis=1)
+
+    indptr = np.zeros(n + 1, dtype="int64")
+    np.cumsum(counts, out=indptr[1:])
+    indices = np.concatenate(indices) if indices else np.zeros(0, dtype="int32")
+    scores = np.concatenate(scores) if scores else np.zeros(0, dtype="float16")
+
+    # Write under a temporary name and rename, so the index watcher never reads a partial file
+    tmp_path = f"{graph_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, indptr=indptr, indices=indices, scores=scores)
+    os.replace(tmp_path, graph_path)
+
+    return {"provisions": n, "edges": len(indices), "graph_bytes": os.path.getsize(graph_path)}
+
+
+class NeighbourGraph:
+    """Read-only CSR neighbour lists; neighbours(i) is two array slices."""
+
+    def __init__(self, indptr, indices, scores):
+        self.indptr = indptr
+        self.indices = indices
+        self.scores = scores
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def neighbours(self, provision_id):
+        """
+        Returns the related provisions of one provision, most similar first.
+
+        Returns:
+            tuple: (np.ndarray of provision IDs, np.ndarray of similarity scores)
+        """
+        start, end = self.indptr[provision_id], self.indptr[provision_id + 1]
+        return self.indices[start:end], self.scores[start:end]
+
+
+def load_neighbour_graph(graph_path=NEIGHBOUR_GRAPH_PATH):
+    """
+    Loads a neighbour graph written by build_neighbour_graph.
+
+    Returns:
+        NeighbourGraph: The graph
+
+    Raises:
+        ValueError: If the CSR arrays are inconsistent
+    """
+    with np.load(graph_path) as data:
+        graph = NeighbourGraph(data["indptr"], data["indices"], data["scores"])
+    if graph.indptr[-1] != len(graph.indices) or len(graph.indices) != len(graph.scores):
+        raise ValueError(f"graph has {graph.indptr[-1]} edges in indptr but {len(graph.indices)} stored")
+    return graph
+
+
+if __name__ == "__main__":
+    import faiss
+
+    parser = argparse.ArgumentParser(description="Build the provision neighbour graph")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Build the graph from the FAISS index")
+    build_parser.add_argument("--index", default="data/vidhik_legal_db.faiss")
+    build_parser.add_argument("--output", default=NEIGHBOUR_GRAPH_PATH)
+    build_parser.add_argument("--k", type=int, default=DEFAULT_NEIGHBOURS)
+    build_parser.add_argument("--min-similarity", type=float, default=DEFAULT_MIN_SIMILARITY)
+    args = parser.parse_args()
+
+    stats = build_neighbour_graph(faiss.read_index(args.index), args.output, args.k, args.min_similarity)
+    print(f"Built neighbour graph for {stats['provisions']} provisions: "
+          f"{stats['edges']:,} edges, {stats['graph_bytes']:,} bytes")
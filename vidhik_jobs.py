@@ -0,0 +1,218 @@
+# --- vidhik_jobs.py (Background audit jobs with progress reporting) ---
+"""
+Background scheduler for policy audits.
+
+Uploads and pasted drafts become jobs with IDs that run on a bounded worker
+pool, so a long PDF audit no longer blocks a Streamlit script run and survives
+browser reconnects: any session can re-attach to a job by its ID. Small
+drafts are always taken ahead of bulk jobs, and bulk jobs may occupy at most
+all but one worker, so short audits stay fast while heavy ones run.
+
+Each job exposes per-stage progress (pages extracted, clauses embedded,
+findings so far) for the UI to poll.
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from vidhik_documents import extract_document_text
+from vidhik_engine import analyze_policy
+
+JOB_WORKERS = int(os.environ.get("VIDHIK_JOB_WORKERS", "2"))
+# Drafts up to this many characters (or uploads up to SMALL_JOB_BYTES) are 'small'
+SMALL_JOB_CHARS = 20000
+SMALL_JOB_BYTES = 200 * 1024
+# Finished jobs kept for re-attachment before the oldest are dropped
+MAX_FINISHED_JOBS = 200
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class AuditJob:
+    """A single queued audit and its progress; updated by a worker, read by the UI."""
+
+    def __init__(self, job_id, small, department=None, similarity_threshold=0.3,
+                 text=None, data=None, mime_type=None, name=None, mode="standard"):
+        self.id = job_id
+        self.small = small
+        self.department = department
+        self.similarity_threshold = similarity_threshold
+        self.mode = mode
+        self.name = name
+        self.text = text
+        self.status = QUEUED
+        self.progress = {"stage": QUEUED, "done": 0, "total": 0, "findings": 0}
+        self.report = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._data = data
+        self._mime_type = mime_type
+        self._finished = threading.Event()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """Blocks until the job finishes or the timeout passes; returns True if finished."""
+        return self._finished.wait(timeout)
+
+    def status_dict(self):
+        """Returns a JSON-friendly view of the job for the UI."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "mode": self.mode,
+            "small": self.small,
+            "progress": dict(self.progress),
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def _update_progress(self, progress):
+        # Replace rather than mutate, so readers never see a half-updated dict
+        self.progress = {**self.progress, **progress}
+
+    def _run(self):
+        self.status = RUNNING
+        self.started_at = time.time()
+        try:
+            if self.text is None:
+                self._update_progress({"stage": "extracting"})
+                self.text = extract_document_text(self._data, self._mime_type, self._update_progress)
+                self._data = None
+            if not self.text.strip():
+                raise ValueError("The document contains no text to analyse.")
+            self.report = analyze_policy(self.text, self.similarity_threshold, department=self.department,
+                                         progress_callback=self._update_progress, mode=self.mode)
+            self.status = DONE
+            self._update_progress({"stage": DONE})
+        except Exception as e:
+            self.error = str(e)
+            self.status = FAILED
+            self._update_progress({"stage": FAILED})
+        finally:
+            self.finished_at = time.time()
+            self._finished.set()
+
+
+class AuditJobScheduler:
+    """
+    Bounded worker pool for audit jobs with two priority classes.
+
+    Workers always take queued small jobs first. Bulk jobs run on at most
+    workers - 1 workers at a time, so at least one worker stays free for
+    small drafts (unless there is only one worker).
+    """
+
+    def __init__(self, workers=JOB_WORKERS, max_finished_jobs=MAX_FINISHED_JOBS):
+        self.workers = max(1, workers)
+        self.bulk_limit = max(1, self.workers - 1)
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs = OrderedDict()
+        self._small_queue = deque()
+        self._bulk_queue = deque()
+        self._bulk_running = 0
+        self._condition = threading.Condition()
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f"vidhik-audit-worker-{i}", daemon=True).start()
+
+    def submit_text(self, text, department=None, similarity_threshold=0.3, name=None, mode="standard"):
+        """
+        Queues an audit of pasted policy text.
+
+        Args:
+            mode (str): Analysis mode passed to analyze_policy ('standard' or 'deep')
+
+        Returns:
+            str: Job ID
+        """
+        return self._submit(AuditJob(uuid.uuid4().hex, len(text) <= SMALL_JOB_CHARS, department,
+                                     similarity_threshold, text=text, name=name, mode=mode))
+
+    def submit_document(self, data, mime_type, department=None, similarity_threshold=0.3, name=None,
+                        mode="standard"):
+        """
+        Queues an audit of an uploaded document; text extraction runs on the worker.
+
+        Args:
+            mode (str): Analysis mode passed to analyze_policy ('standard' or 'deep')
+
+        Returns:
+            str: Job ID
+        """
+        return self._submit(AuditJob(uuid.uuid4().hex, len(data) <= SMALL_JOB_BYTES, department,
+                                     similarity_threshold, data=data, mime_type=mime_type, name=name,
+                                     mode=mode))
+
+    def get(self, job_id):
+        """Returns the job with this ID, or None if it is unknown or has expired."""
+        with self._condition:
+            return self._jobs.get(job_id)
+
+    def queue_position(self, job_id):
+        """Returns how many jobs will start before this one (0 if running or finished)."""
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return 0
+            if job.small:
+                return list(self._small_queue).index(job)
+            return len(self._small_queue) + list(self._bulk_queue).index(job)
+
+    def _submit(self, job):
+        with self._condition:
+            self._jobs[job.id] = job
+            (self._small_queue if job.small else self._bulk_queue).append(job)
+            self._expire_finished()
+            self._condition.notify()
+        return job.id
+
+    def _expire_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def _next_job(self):
+        with self._condition:
+            while True:
+                if self._small_queue:
+                    return self._small_queue.popleft()
+                if self._bulk_queue and self._bulk_running < self.bulk_limit:
+                    self._bulk_running += 1
+                    return self._bulk_queue.popleft()
+                self._condition.wait()
+
+    def _work(self):
+        while True:
+            job = self._next_job()
+            job._run()
+            if not job.small:
+                with self._condition:
+                    self._bulk_running -= 1
+                    self._condition.notify_all()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Returns the process-wide AuditJobScheduler, starting it on first use."""
+    global _scheduler
+
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = AuditJobScheduler()
+    return _scheduler
@@ -0,0 +1,210 @@
+# --- vidhik_lexicons.py (Bias lexicons and PII patterns loaded from data files) ---
+"""
+Bias lexicons and PII patterns, loaded from versioned data files.
+
+Every JSON (or, if PyYAML is installed, YAML) file in the lexicon directory
+holds one kind of data for one language:
+
+    {"kind": "bias", "language": "en", "version": "2025.11.1",
+     "categories": {"Gender Bias": ["mankind", ...], ...}}
+    {"kind": "pii", "language": "*", "version": "2025.11.1",
+     "patterns": {"Email Address": "<regex>", ...},
+     "placeholders": {"Email Address": "EMAIL", ...}}
+
+Files of the same kind and language are merged, so a department can drop in
+its own lexicon next to the shared ones. Language "*" applies to every
+language. The files are compiled once into matchers. When they change on
+disk, the whole set is recompiled and swapped in with a single reference
+assignment. If a set fails to load, the previous one keeps serving; if no
+set has loaded yet, the active set is empty and the engine reports its bias
+and PII scans as failed rather than clean.
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+# The shipped lexicons, found relative to this file rather than the working directory
+LEXICON_DIR = os.environ.get(
+    "VIDHIK_LEXICON_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "lexicons")
+)
+DEFAULT_LANGUAGE = "en"
+ANY_LANGUAGE = "*"
+# How often (seconds) an access may stat the lexicon files for changes
+LEXICON_POLL_SECONDS = float(os.environ.get("VIDHIK_LEXICON_POLL_SECONDS", "5"))
+
+LEXICON_EXTENSIONS = (".json", ".yaml", ".yml")
+
+# Devanagari vowel signs are combining marks, which \w does not match; include the
+# block (minus the danda punctuation) so Hindi words are not split apart
+_WORD = re.compile(r"[\w\u0900-\u0963\u0966-\u097F]+")
+
+
+class BiasMatcher:
+    """
+    Finds lexicon phrases in text with one pass over its words.
+
+    Phrases are indexed by their first word, so the cost per text does not
+    grow with the size of the lexicon. Phrases match whole words only.
+    """
+
+    def __init__(self, lexicons):
+        self._by_first_word = {}
+        self.size = 0
+        for category, phrases in lexicons.items():
+            for phrase in phrases:
+                words = tuple(_WORD.findall(phrase.lower()))
+                if not words:
+                    continue
+                entry = (self.size, words, phrase, category)
+                self._by_first_word.setdefault(words[0], []).append(entry)
+                self.size += 1
+
+    def find(self, text):
+        """
+        Returns each lexicon phrase that occurs in the text, in lexicon order.
+
+        Returns:
+            list: (phrase, category) pairs
+        """
+        words = _WORD.findall(text.lower())
+        found = {}
+        for i, word in enumerate(words):
+            for order, phrase_words, phrase, category in self._by_first_word.get(word, ()):
+                if order not in found and tuple(words[i:i + len(phrase_words)]) == phrase_words:
+                    found[order] = (phrase, category)
+        return [found[order] for order in sorted(found)]
+
+
+# A compiled, immutable set of lexicons. `bias` maps language -> BiasMatcher,
+# `pii` maps language -> [(PII type, compiled pattern)], and `placeholders` maps
+# PII type -> redaction label (e.g. "AADHAAR") for every language.
+LexiconSet = namedtuple("LexiconSet", ["version", "bias", "pii", "placeholders", "loaded_at"])
+
+
+def _read_lexicon_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        import yaml
+        return yaml.safe_load(f)
+
+
+def compile_lexicons(documents):
+    """
+    Compiles parsed lexicon files into a LexiconSet.
+
+    Args:
+        documents (list): (file name, parsed dict) pairs
+
+    Returns:
+        LexiconSet: Matchers per language and the combined version string
+
+    Raises:
+        ValueError: If a file has an unknown kind or a pattern does not compile
+    """
+    bias_lexicons, pii_patterns, placeholders, versions = {}, {}, {}, []
+    for name, document in documents:
+        kind = document.get("kind")
+        language = document.get("language", DEFAULT_LANGUAGE)
+        versions.append(f"{kind}.{language}@{document.get('version', 'unversioned')}")
+        if kind == "bias":
+            merged = bias_lexicons.setdefault(language, {})
+            for category, phrases in document.get("categories", {}).items():
+                merged.setdefault(category, []).extend(phrases)
+        elif kind == "pii":
+            patterns = pii_patterns.setdefault(language, [])
+            for pii_type, pattern in document.get("patterns", {}).items():
+                try:
+                    patterns.append((pii_type, re.compile(pattern)))
+                except re.error as e:
+                    raise ValueError(f"{name}: invalid pattern for {pii_type}: {e}")
+            placeholders.update(document.get("placeholders", {}))
+        else:
+            raise ValueError(f"{name}: unknown lexicon kind '{kind}'")
+
+    version = ", ".join(sorted(set(versions)))
+    bias = {language: BiasMatcher(lexicons) for language, lexicons in bias_lexicons.items()}
+    return LexiconSet(version, bias, pii_patterns, placeholders, time.time())
+
+
+class LexiconRegistry:
+    """
+    Holds the active LexiconSet and recompiles it when the files change.
+    Checks are a stat of each file, done at most once per poll interval.
+    """
+
+    def __init__(self, directory=LEXICON_DIR, poll_interval=LEXICON_POLL_SECONDS):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._lexicons = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Returns the active LexiconSet, reloading it first if the files changed."""
+        if self._lexicons is None or time.monotonic() - self._checked_at >= self.poll_interval:
+            self._refresh()
+        return self._lexicons
+
+    def _files(self):
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith(LEXICON_EXTENSIONS))
+        except OSError:
+            return []
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _refresh(self):
+        with self._lock:
+            if self._lexicons is not None and time.monotonic() - self._checked_at < self.poll_interval:
+                return
+            self._checked_at = time.monotonic()
+            paths = self._files()
+            try:
+                signature = tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths)
+            except OSError:
+                return  # a file was replaced mid-scan; try again on the next poll
+            if signature == self._signature and self._lexicons is not None:
+                return
+            try:
+                documents = [(os.path.basename(path), _read_lexicon_file(path)) for path in paths]
+                lexicons = compile_lexicons(documents)
+            except Exception as e:
+                print(f"Error loading lexicons from {self.directory}: {e}. Keeping the current version.")
+                # Remember the broken files so they are not re-parsed until they change again
+                self._signature = signature
+                if self._lexicons is None:
+                    self._lexicons = compile_lexicons([])
+                return
+            if not paths:
+                print(f"Warning: no lexicon files found in {self.directory}; bias and PII scans will find nothing.")
+            self._signature = signature
+            self._lexicons = lexicons
+
+
+def bias_matchers(lexicons, language=DEFAULT_LANGUAGE):
+    """Returns the BiasMatchers for a language: its own, then the language-independent one."""
+    return [lexicons.bias[key] for key in dict.fromkeys((language, ANY_LANGUAGE)) if key in lexicons.bias]
+
+
+def pii_patterns(lexicons, language=DEFAULT_LANGUAGE):
+    """Returns the compiled PII patterns for a language, language-independent ones first."""
+    return [pattern for key in dict.fromkeys((ANY_LANGUAGE, language)) for pattern in lexicons.pii.get(key, ())]
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_lexicons():
+    """Returns the active LexiconSet from the process-wide registry."""
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = LexiconRegistry()
+    return _registry.current()
@@ -0,0 +1,379 @@
+# --- vidhik_loadtest.py (Local load generator for the Vidhik AI engine) ---
+"""
+Simulates concurrent auditors against the engine's public entry point
+(vidhik_engine.analyze_policy) and reports throughput, latency percentiles,
+CPU usage and RSS over time.
+
+Clients run as threads in one process (like Streamlit sessions sharing one
+server) or as separate processes (like several app replicas on one box).
+Policy drafts are generated with a realistic, long-tailed clause count, and a
+configurable share of submissions repeats an earlier draft. Simulated audits
+are recorded in a temporary audit history and analytics export, never the
+real ones, unless --record-history is given.
+
+Examples:
+    # Offline: stub embeddings over a synthetic 20k-provision corpus
+    python vidhik_loadtest.py --stub --synthetic-corpus 20000 --clients 1 4 16 --duration 30
+
+    # Real model and legal DB, 8 sessions in one process, p95 SLO of 2s
+    python vidhik_loadtest.py --clients 8 --duration 120 --slo-p95-ms 2000 --output load.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Clause templates drafted in the style of Uttarakhand GOs. Some carry PII or
+# biased wording so every scanner is exercised.
+CLAUSE_TEMPLATES = [
+    "All citizens of the state must register their personal details and bank account numbers on the {platform}.",
+    "Data collected via the {platform} will be stored on a private server maintained by the department for {years} years.",
+    "Personal data, including the Aadhaar ID, may be shared with any other state department upon simple request.",
+    "Access to {platform} services is restricted to citizens with high-speed internet connections.",
+    "The nodal officer, reachable at officer{n}@uk.gov.in or 98{n:08d}, shall resolve grievances within {days} days.",
+    "Applicants shall furnish PAN ABCDE{n:04d}F and Aadhaar 2{n:03d} 4567 8901 for verification.",
+    "The common man should understand that manpower shortages may delay processing.",
+    "Young people and the elderly shall be assisted at the nearest Common Service Centre.",
+    "Every district shall constitute a committee to review the implementation of this order every {days} days.",
+    "Funds for the scheme shall be released in {n} instalments subject to utilisation certificates.",
+    "Contractors found in breach of the terms shall be liable to a penalty of Rs. {n},000 per day.",
+    "This order shall come into force from the date of its publication in the Official Gazette.",
+    "The department may, by notification, amend the schedule appended to this order.",
+    "No fee shall be charged from persons belonging to economically weaker sections.",
+]
+PLATFORMS = ["DSDP", "e-District portal", "Apuni Sarkar portal", "CM Helpline system"]
+
+
+def generate_policy(rng, median_clauses=8, sigma=0.9, max_clauses=400):
+    """
+    Generates a synthetic policy draft with a log-normal number of clauses,
+    so most drafts are short and a few are very long.
+    """
+    n_clauses = min(max_clauses, max(1, int(rng.lognormvariate(0, sigma) * median_clauses)))
+    clauses = []
+    for i in range(n_clauses):
+        template = rng.choice(CLAUSE_TEMPLATES)
+        clause = template.format(platform=rng.choice(PLATFORMS), years=rng.randint(1, 10),
+                                 days=rng.choice([7, 15, 30, 90]), n=rng.randint(1, 99999))
+        clauses.append(f"[Clause {i + 1}.0] {clause}")
+    return "\n\n".join(clauses)
+
+
+def _client_loop(client_id, deadline, seed, repeat_share, completed):
+    """Runs one simulated auditor until the deadline and returns its samples."""
+    import vidhik_engine
+
+    rng = random.Random(seed + client_id)
+    submitted = []
+    samples = []
+    while time.time() < deadline:
+        if submitted and rng.random() < repeat_share:
+            text = rng.choice(submitted)
+        else:
+            text = generate_policy(rng)
+            submitted.append(text)
+
+        start = time.perf_counter()
+        error = None
+        try:
+            report = vidhik_engine.analyze_policy(text)
+            if report.get("Overall Status") in ("Database Error", "Processing Error", "Scan Error"):
+                error = report["Overall Status"]
+        except Exception as e:
+            error = repr(e)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        samples.append({"latency_ms": latency_ms, "chars": len(text), "error": error})
+        with completed.get_lock():
+            completed.value += 1
+    return samples
+
+
+def _warm_up(seed):
+    """Loads the model and legal DB with one audit, so loading is not timed."""
+    import vidhik_engine
+
+    try:
+        vidhik_engine.analyze_policy(generate_policy(random.Random(seed)))
+    except Exception as e:
+        print(f"Warm-up audit failed: {e}")
+
+
+def _rss_bytes(pids):
+    total = 0
+    for pid in pids:
+        if psutil is not None:
+            try:
+                total += psutil.Process(pid).memory_info().rss
+            except psutil.Error:
+                pass
+            continue
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            pass
+    return total
+
+
+def _cpu_seconds(pids):
+    """Total user+system CPU seconds of this process, its finished children and the given pids."""
+    if psutil is not None:
+        total = 0.0
+        for pid in pids:
+            try:
+                times = psutil.Process(pid).cpu_times()
+                total += times.user + times.system
+            except psutil.Error:
+                pass
+        return total
+    times = os.times()
+    total = times.user + times.system + times.children_user + times.children_system
+    ticks = os.sysconf("SC_CLK_TCK")
+    for pid in pids:
+        if pid == os.getpid():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            total += (int(fields[11]) + int(fields[12])) / ticks
+        except (OSError, IndexError, ValueError):
+            pass
+    return total
+
+
+class ResourceSampler(threading.Thread):
+    """Samples CPU utilisation, RSS and completed requests at a fixed interval."""
+
+    def __init__(self, completed, interval=1.0):
+        super().__init__(name="vidhik-loadtest-sampler", daemon=True)
+        self.completed = completed
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def _pids(self):
+        return [os.getpid()] + [child.pid for child in multiprocessing.active_children()]
+
+    def run(self):
+        start = time.time()
+        last_time, last_cpu, last_completed = start, _cpu_seconds(self._pids()), 0
+        while not self._stop_event.wait(self.interval):
+            now = time.time()
+            pids = self._pids()
+            cpu = _cpu_seconds(pids)
+            completed = self.completed.value
+            elapsed = max(now - last_time, 1e-9)
+            self.samples.append({
+                "t": round(now - start, 2),
+                "cpu_percent": round(100.0 * max(cpu - last_cpu, 0.0) / elapsed, 1),
+                "rss_mb": round(_rss_bytes(pids) / 1e6, 1),
+                "throughput_rps": round((completed - last_completed) / elapsed, 2),
+            })
+            last_time, last_cpu, last_completed = now, cpu, completed
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * (len(sorted_values) - 1)))))
+    return round(sorted_values[index], 2)
+
+
+def run_load(clients, mode, duration, repeat_share, seed=0, warmup=True):
+    """
+    Drives analyze_policy from `clients` concurrent auditors for `duration` seconds.
+
+    Returns:
+        dict: Throughput, latency percentiles, error count and the resource timeline
+    """
+    # Spawn (not fork) client processes so they don't inherit engine threads;
+    # each one loads its own model, like a separate app replica
+    context = multiprocessing.get_context("spawn")
+    completed = context.Value("i", 0)
+
+    # Pay model and index loading before the clock starts, like a warm server
+    pool = None
+    if mode == "threads":
+        if warmup:
+            _warm_up(seed)
+    else:
+        ready = context.Value("i", 0)
+        pool = context.Pool(clients, initializer=_init_process, initargs=(completed, ready, warmup, seed))
+        while ready.value < clients:
+            time.sleep(0.05)
+
+    sampler = ResourceSampler(completed)
+    deadline = time.time() + duration
+    sampler.start()
+    start = time.perf_counter()
+
+    if mode == "threads":
+        results = [None] * clients
+
+        def run(client_id):
+            results[client_id] = _client_loop(client_id, deadline, seed, repeat_share, completed)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        try:
+            results = pool.map(_process_client, [(i, deadline, seed, repeat_share) for i in range(clients)])
+        finally:
+            pool.terminate()
+
+    wall = time.perf_counter() - start
+    sampler.stop()
+
+    samples = [sample for client_samples in results for sample in client_samples]
+    latencies = sorted(sample["latency_ms"] for sample in samples if sample["error"] is None)
+    errors = [sample["error"] for sample in samples if sample["error"] is not None]
+    timeline = sampler.samples
+    return {
+        "clients": clients,
+        "mode": mode,
+        "duration_s": round(wall, 2),
+        "requests": len(samples),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p90": _percentile(latencies, 90),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": round(latencies[-1], 2) if latencies else None,
+        },
+        "cpu_percent_avg": round(sum(s["cpu_percent"] for s in timeline) / len(timeline), 1) if timeline else None,
+        "rss_mb_max": max((s["rss_mb"] for s in timeline), default=None),
+        "timeline": timeline,
+    }
+
+
+# Completed-request counter handed to each client process when the pool starts
+_process_completed = None
+
+
+def _init_process(completed, ready, warmup, seed):
+    global _process_completed
+    _process_completed = completed
+    if warmup:
+        _warm_up(seed)
+    with ready.get_lock():
+        ready.value += 1
+
+
+def _process_client(args):
+    client_id, deadline, seed, repeat_share = args
+    return _client_loop(client_id, deadline, seed, repeat_share, _process_completed)
+
+
+def build_synthetic_corpus(n, index_path, metadata_path, seed=0):
+    """
+    Builds a synthetic legal DB (flat FAISS index + metadata pickle) embedded
+    with the engine's offline HashingEmbedder.
+    """
+    import pickle
+
+    import faiss
+    from vidhik_engine import HashingEmbedder
+
+    rng = random.Random(seed)
+    provisions = [generate_policy(rng, median_clauses=1, sigma=0.3, max_clauses=3) for _ in range(n)]
+    embedder = HashingEmbedder()
+    index = faiss.IndexFlatL2(embedder.dim)
+    for start in range(0, n, 4096):
+        index.add(embedder.encode(provisions[start:start + 4096]))
+
+    faiss.write_index(index, index_path)
+    with open(metadata_path, "wb") as f:
+        pickle.dump(provisions, f)
+
+
+def _print_result(result, slo_p95_ms):
+    latency = result["latency_ms"]
+    verdict = ""
+    if slo_p95_ms is not None and latency["p95"] is not None:
+        verdict = "  SLO OK" if latency["p95"] <= slo_p95_ms else "  SLO MISSED"
+    print(f"{result['mode']:>9} {result['clients']:>7} {result['requests']:>8} {result['errors']:>6} "
+          f"{result['throughput_rps']:>8} {latency['p50']!s:>9} {latency['p95']!s:>9} {latency['p99']!s:>9} "
+          f"{result['cpu_percent_avg']!s:>7} {result['rss_mb_max']!s:>8}{verdict}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Vidhik AI engine with concurrent simulated auditors")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16],
+                        help="Concurrent clients; several values run a sweep")
+    parser.add_argument("--mode", choices=["threads", "processes"], default="threads")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per run")
+    parser.add_argument("--repeat-share", type=float, default=0.2,
+                        help="Fraction of submissions that resend an earlier draft")
+    parser.add_argument("--stub", action="store_true", help="Use the offline hashing embedder instead of the model")
+    parser.add_argument("--synthetic-corpus", type=int, default=0, metavar="N",
+                        help="Build and use a synthetic N-provision legal DB (requires --stub)")
+    parser.add_argument("--record-history", action="store_true",
+                        help="Record the simulated audits in the real audit history and analytics export "
+                             "(by default they go to a temporary directory)")
+    parser.add_argument("--slo-p95-ms", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write full results, including the resource timeline, as JSON")
+    args = parser.parse_args(argv)
+
+    # Configure the engine through its environment before it is first imported,
+    # so spawned client processes pick up the same settings
+    if args.synthetic_corpus and not args.stub:
+        parser.error("--synthetic-corpus requires --stub")
+    if args.stub:
+        os.environ["VIDHIK_EMBEDDING_MODEL"] = "stub"
+    directory = tempfile.mkdtemp(prefix="vidhik_loadtest_")
+    if not args.record_history:
+        # Thousands of fake audits would otherwise skew the real compliance figures
+        os.environ["VIDHIK_AUDIT_DB"] = os.path.join(directory, "vidhik_audit_history.db")
+        os.environ["VIDHIK_ANALYTICS_DIR"] = os.path.join(directory, "analytics")
+    if args.synthetic_corpus:
+        os.environ["VIDHIK_FAISS_INDEX_PATH"] = os.path.join(directory, "vidhik_legal_db.faiss")
+        os.environ["VIDHIK_FAISS_METADATA_PATH"] = os.path.join(directory, "vidhik_legal_db_metadata.pkl")
+        os.environ["VIDHIK_FAISS_TEXT_STORE_PATH"] = os.path.join(directory, "vidhik_legal_db_metadata.vts")
+        build_synthetic_corpus(args.synthetic_corpus, os.environ["VIDHIK_FAISS_INDEX_PATH"],
+                               os.environ["VIDHIK_FAISS_METADATA_PATH"], args.seed)
+
+    print(f"{'mode':>9} {'clients':>7} {'requests':>8} {'errors':>6} {'req/s':>8} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'cpu %':>7} {'rss MB':>8}")
+    results = []
+    for clients in args.clients:
+        result = run_load(clients, args.mode, args.duration, args.repeat_share, args.seed)
+        _print_result(result, args.slo_p95_ms)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Full results written to {args.output}")
+
+    slo_missed = args.slo_p95_ms is not None and any(
+        r["latency_ms"]["p95"] is None or r["latency_ms"]["p95"] > args.slo_p95_ms for r in results)
+    return 1 if slo_missed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
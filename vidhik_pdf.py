@@ -0,0 +1,260 @@
+# --- vidhik_pdf.py (PDF export for audit reports) ---
+"""
+Renders audit reports to PDF.
+
+Findings are laid out as paginated tables (split into fixed-size chunks with a
+repeated header row) instead of one JSON paragraph, so ReportLab can break
+them across pages and reports with thousands of findings render in bounded
+time and memory. PdfRenderCache renders off the request thread and keeps the
+result per report hash, so Streamlit reruns never rebuild the same PDF.
+"""
+import hashlib
+import io
+import json
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+# Rows per table chunk. Chunks are laid out independently and kept small
+# enough to rarely need splitting, since ReportLab re-wraps every cell of a
+# table each time it splits it across a page.
+TABLE_CHUNK_ROWS = 20
+# Rows rendered per findings list; the JSON export always has the full data
+MAX_ROWS_PER_SECTION = 1000
+# Cell text is truncated to keep row heights (and layout time) bounded
+MAX_CELL_CHARS = 300
+# Shorter cells are drawn as plain strings, which skips paragraph wrapping
+PLAIN_CELL_CHARS = 24
+
+# Preferred columns for the engine's findings lists; other lists use their own keys
+SECTION_COLUMNS = {
+    "Conflicting Laws": ["Rank", "Similarity Score", "Risk Level", "Legal Provision"],
+    "flagged_phrases": ["phrase", "lexicon", "recommendation"],
+    "detected_items": ["type", "value", "start"],
+}
+# Display formats of numeric columns (reports keep the raw numbers)
+COLUMN_FORMATS = {
+    "Similarity Score": "{:.3f}",
+}
+# Relative column widths for the lists above
+SECTION_WIDTHS = {
+    "Conflicting Laws": [0.08, 0.12, 0.12, 0.68],
+    "flagged_phrases": [0.25, 0.25, 0.5],
+    "detected_items": [0.3, 0.5, 0.2],
+}
+
+
+def report_digest(report):
+    """Returns a stable SHA-256 hex digest of a report, used as the PDF cache key."""
+    payload = json.dumps(report, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _cell(value, style):
+    from reportlab.platypus import Paragraph
+
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    if len(text) <= PLAIN_CELL_CHARS and "\n" not in text:
+        return text
+    if len(text) > MAX_CELL_CHARS:
+        text = text[:MAX_CELL_CHARS] + "..."
+    return Paragraph(escape(text), style)
+
+
+def _formatted(column, value):
+    if column in COLUMN_FORMATS and isinstance(value, (int, float)):
+        return COLUMN_FORMATS[column].format(value)
+    return value
+
+
+def _markdown_lines(text, styles):
+    """Turns the engine's markdown recommendations into one Paragraph per line."""
+    from reportlab.platypus import Paragraph
+
+    flowables = []
+    for line in text.split("\n"):
+        if not line.strip():
+            continue
+        line = escape(line.strip())
+        line = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", line)
+        if line.startswith("#"):
+            flowables.append(Paragraph(line.lstrip("#").strip(), styles["Heading4"]))
+        else:
+            flowables.append(Paragraph(line, styles["Normal"]))
+    return flowables
+
+
+def _findings_tables(name, rows, styles, width):
+    """Lays out a list of finding dicts as chunked tables with repeated headers."""
+    from reportlab.lib import colors
+    from reportlab.platypus import LongTable, Paragraph, Spacer, TableStyle
+
+    columns = SECTION_COLUMNS.get(name)
+    if columns is None:
+        columns = []
+        for row in rows[:20]:
+            columns.extend(key for key in row if key not in columns)
+    widths = [width * w for w in SECTION_WIDTHS.get(name, [1.0 / len(columns)] * len(columns))]
+
+    cell_style = styles["BodyText"]
+    header = [Paragraph(f"<b>{escape(str(column))}</b>", cell_style) for column in columns]
+    table_style = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e2e8f0")),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#94a3b8")),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("FONTSIZE", (0, 1), (-1, -1), cell_style.fontSize),
+    ])
+
+    flowables = []
+    shown = rows[:MAX_ROWS_PER_SECTION]
+    for chunk_start in range(0, len(shown), TABLE_CHUNK_ROWS):
+        data = [header]
+        for row in shown[chunk_start:chunk_start + TABLE_CHUNK_ROWS]:
+            data.append([_cell(_formatted(column, row.get(column, "")), cell_style) for column in columns])
+        table = LongTable(data, colWidths=widths, repeatRows=1)
+        table.setStyle(table_style)
+        flowables.append(table)
+
+    if len(rows) > len(shown):
+        flowables.append(Spacer(1, 6))
+        flowables.append(Paragraph(
+            f"{len(rows) - len(shown)} further rows omitted; see the JSON export for the full list.",
+            styles["Italic"]
+        ))
+    return flowables
+
+
+def _section_flowables(section, styles, width):
+    """Renders one raw report: scalar fields as a key/value table, finding lists as tables."""
+    from reportlab.lib import colors
+    from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+    if not isinstance(section, dict):
+        return [_cell(section, styles["Code"])]
+
+    flowables = []
+    scalars = [(key, value) for key, value in section.items() if not isinstance(value, list)]
+    if scalars:
+        table = Table(
+            [[_cell(str(key), styles["BodyText"]), _cell(value, styles["BodyText"])] for key, value in scalars],
+            colWidths=[width * 0.35, width * 0.65]
+        )
+        table.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#cbd5e1"))]))
+        flowables.append(table)
+
+    for key, value in section.items():
+        if not isinstance(value, list):
+            continue
+        flowables.append(Spacer(1, 8))
+        flowables.append(Paragraph(f"<b>{escape(str(key))}</b> ({len(value)})", styles["Heading4"]))
+        if not value:
+            flowables.append(Paragraph("None", styles["Normal"]))
+        elif all(isinstance(row, dict) for row in value):
+            flowables.extend(_findings_tables(key, value, styles, width))
+        else:
+            flowables.extend(_cell(item, styles["BodyText"]) for item in value[:MAX_ROWS_PER_SECTION])
+    return flowables
+
+
+def build_pdf(report):
+    """
+    Renders an audit report to PDF.
+
+    Args:
+        report (dict): Report returned by analyze_policy
+
+    Returns:
+        bytes: The PDF document
+
+    Raises:
+        ImportError: If reportlab is not installed
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=2 * cm,
+        rightMargin=2 * cm,
+        topMargin=2 * cm,
+        bottomMargin=2 * cm
+    )
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Title
+    story.append(Paragraph("<b>Vidhik AI – Policy Audit Report</b>", styles["Title"]))
+    story.append(Spacer(1, 16))
+
+    # Overall Status
+    status = escape(str(report.get("Overall Status", "Unknown")))
+    story.append(Paragraph(f"<b>Overall Status:</b> {status}", styles["Heading2"]))
+    story.append(Spacer(1, 12))
+
+    # Executive Summary
+    story.append(Paragraph("<b>Executive Summary</b>", styles["Heading2"]))
+    story.extend(_markdown_lines(report.get("Executive Summary", "No summary available"), styles))
+    story.append(Spacer(1, 12))
+
+    # Actionable Recommendations
+    story.append(Paragraph("<b>Actionable Recommendations</b>", styles["Heading2"]))
+    story.extend(_markdown_lines(report.get("Actionable Recommendations", "None"), styles))
+    story.append(Spacer(1, 12))
+
+    # Raw Reports
+    story.append(Paragraph("<b>Raw Reports</b>", styles["Heading2"]))
+    for title, section in report.get("Raw Reports", {}).items():
+        story.append(Spacer(1, 10))
+        story.append(Paragraph(f"<b>{escape(str(title))}</b>", styles["Heading3"]))
+        story.extend(_section_flowables(section, styles, doc.width))
+
+    doc.build(story)
+    pdf_data = buffer.getvalue()
+    buffer.close()
+    return pdf_data
+
+
+class PdfRenderCache:
+    """
+    Renders PDFs on a background worker and keeps recent results by report hash.
+
+    submit() returns a Future immediately; asking again for the same report
+    returns the same Future, so a PDF is built at most once per report. A
+    render that failed is dropped when next asked for, and started again.
+    """
+
+    def __init__(self, max_entries=16, workers=1):
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vidhik-pdf")
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, report, digest=None):
+        """
+        Starts rendering a report unless it is cached or already in progress.
+
+        Args:
+            report (dict): Report returned by analyze_policy
+            digest (str): Precomputed report_digest(report), if available
+
+        Returns:
+            concurrent.futures.Future: Resolves to the PDF bytes
+        """
+        if digest is None:
+            digest = report_digest(report)
+        with self._lock:
+            future = self._futures.get(digest)
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._futures.move_to_end(digest)
+                return future
+            future = self._executor.submit(build_pdf, report)
+            self._futures[digest] = future
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+            return future
@@ -0,0 +1,310 @@
+# --- vidhik_textstore.py (Compressed storage for legal provision texts) ---
+"""
+Compressed, lazily decoded storage for the provision texts behind the FAISS index.
+
+Texts are packed into fixed-size blocks compressed with zstd (or zlib when the
+`zstandard` package is not installed) using a dictionary shared by all blocks.
+A small table of offsets and short previews sits next to the blocks, so
+`store[i]` only decompresses the one block holding provision i, and
+`store.preview(i)` decompresses nothing at all.
+
+File layout (all integers little-endian):
+    b"VIDHIKTS" | uint32 header length | JSON header | sections...
+
+Convert an existing pickle with:
+    python vidhik_textstore.py data/vidhik_legal_db_metadata.pkl data/vidhik_legal_db_metadata.vts
+"""
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"VIDHIKTS"
+FORMAT_VERSION = 1
+
+# Texts per compressed block: larger blocks compress better, smaller ones decode faster
+DEFAULT_BLOCK_SIZE = 16
+# Characters kept uncompressed per provision for recommendations and result lists
+PREVIEW_CHARS = 100
+# Size of the shared compression dictionary (zlib can only use the last 32 KiB)
+ZSTD_DICT_SIZE = 112 * 1024
+ZLIB_DICT_SIZE = 32 * 1024
+# Decompressed blocks kept in memory per store
+BLOCK_CACHE_SIZE = 32
+
+
+def _sample_texts(texts, budget=2 * 1024 * 1024):
+    """Returns an evenly spaced sample of texts (as bytes) totalling roughly `budget` bytes."""
+    if not texts:
+        return []
+    average = max(1, sum(len(t) for t in texts[:1000]) // min(len(texts), 1000))
+    step = max(1, len(texts) * average // budget)
+    return [t.encode("utf-8") for t in texts[::step] if t]
+
+
+def _train_dictionary(codec, texts):
+    samples = _sample_texts(texts)
+    if not samples:
+        return b""
+    if codec == "zstd":
+        try:
+            return zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+        except zstandard.ZstdError:
+            # Too few samples to train on; fall back to raw content as the dictionary
+            return b"".join(samples)[-ZSTD_DICT_SIZE:]
+    # zlib prefers matches near the end of the dictionary, so keep the tail
+    return b"".join(samples)[-ZLIB_DICT_SIZE:]
+
+
+def _compress(codec, dictionary, data):
+    if codec == "zstd":
+        compression_dict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdCompressor(level=19, dict_data=compression_dict).compress(data)
+    compressor = zlib.compressobj(9, zdict=dictionary) if dictionary else zlib.compressobj(9)
+    return compressor.compress(data) + compressor.flush()
+
+
+def write_text_store(texts, path, codec=None, block_size=DEFAULT_BLOCK_SIZE, preview_chars=PREVIEW_CHARS):
+    """
+    Writes provision texts to a compressed text store.
+
+    The file is written next to `path` and renamed into place, so a running
+    engine never sees a half-written store.
+
+    Args:
+        texts (list): Provision texts, in FAISS index order
+        path (str): Output file path
+        codec (str): 'zstd' or 'zlib' (default: zstd if installed, else zlib)
+        block_size (int): Number of texts per compressed block
+        preview_chars (int): Number of leading characters stored uncompressed
+
+    Returns:
+        dict: Size statistics for the written store
+    """
+    if codec is None:
+        codec = "zstd" if zstandard is not None else "zlib"
+    if codec == "zstd" and zstandard is None:
+        raise ValueError("codec 'zstd' requires the zstandard package")
+
+    texts = [str(t) for t in texts]
+    dictionary = _train_dictionary(codec, texts)
+
+    blocks = []
+    block_offsets = [0]
+    entries = np.zeros((len(texts), 2), dtype="<u4")
+    for block_start in range(0, len(texts), block_size):
+        raw = bytearray()
+        for i in range(block_start, min(block_start + block_size, len(texts))):
+            encoded = texts[i].encode("utf-8")
+            entries[i] = (len(raw), len(raw) + len(encoded))
+            raw += encoded
+        compressed = _compress(codec, dictionary, bytes(raw))
+        blocks.append(compressed)
+        block_offsets.append(block_offsets[-1] + len(compressed))
+
+    previews = [t[:preview_chars].encode("utf-8") for t in texts]
+    preview_offsets = np.zeros(len(texts) + 1, dtype="<u8")
+    preview_offsets[1:] = np.cumsum([len(p) for p in previews])
+
+    sections = [
+        ("dictionary", dictionary),
+        ("block_offsets", np.asarray(block_offsets, dtype="<u8").tobytes()),
+        ("entries", entries.tobytes()),
+        ("preview_offsets", preview_offsets.tobytes()),
+        ("previews", b"".join(previews)),
+        ("blocks", b"".join(blocks)),
+    ]
+    header = {
+        "format_version": FORMAT_VERSION,
+        "codec": codec,
+        "count": len(texts),
+        "block_size": block_size,
+        "sections": {},
+    }
+    offset = 0
+    for name, data in sections:
+        # Keep numeric sections 8-byte aligned so they can be viewed in place
+        padding = -offset % 8
+        offset += padding
+        header["sections"][name] = [offset, len(data)]
+        offset += len(data)
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    body_start = len(MAGIC) + 4 + len(header_bytes)
+    body_start += -body_start % 8
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (body_start - f.tell()))
+        for name, data in sections:
+            f.write(b"\0" * (body_start + header["sections"][name][0] - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+
+    raw_size = sum(len(t.encode("utf-8")) for t in texts)
+    return {
+        "count": len(texts),
+        "codec": codec,
+        "raw_bytes": raw_size,
+        "store_bytes": os.path.getsize(path),
+        "compressed_block_bytes": block_offsets[-1],
+    }
+
+
+class CompressedTextStore:
+    """
+    Read-only, memory-mapped view of a text store written by write_text_store.
+
+    Behaves like a list of strings (len, indexing, iteration), so it can stand
+    in for the pickled metadata list. Full texts are decompressed per block on
+    access and a few recent blocks are cached.
+    """
+
+    def __init__(self, path, cache_size=BLOCK_CACHE_SIZE):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a Vidhik text store")
+        header_start = len(MAGIC) + 4
+        if len(self._mmap) < header_start:
+            raise ValueError(f"{path} is truncated")
+        (header_length,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        if len(self._mmap) < header_start + header_length:
+            raise ValueError(f"{path} is truncated")
+        header = json.loads(self._mmap[header_start:header_start + header_length])
+        if header["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported text store version {header['format_version']}")
+
+        body_start = header_start + header_length
+        body_start += -body_start % 8
+        body_end = body_start + max(offset + length for offset, length in header["sections"].values())
+        if len(self._mmap) < body_end:
+            raise ValueError(f"{path} is truncated: {len(self._mmap)} bytes, expected {body_end}")
+        buffer = memoryview(self._mmap)
+
+        def section(name):
+            offset, length = header["sections"][name]
+            return buffer[body_start + offset:body_start + offset + length]
+
+        self.codec = header["codec"]
+        self.block_size = header["block_size"]
+        self._count = header["count"]
+        self._block_offsets = np.frombuffer(section("block_offsets"), dtype="<u8")
+        self._entries = np.frombuffer(section("entries"), dtype="<u4").reshape(-1, 2)
+        self._preview_offsets = np.frombuffer(section("preview_offsets"), dtype="<u8")
+        self._previews = section("previews")
+        self._blocks = section("blocks")
+        dictionary = bytes(section("dictionary"))
+
+        if self.codec == "zstd":
+            if zstandard is None:
+                raise ImportError(f"{path} is zstd-compressed; install the zstandard package to read it")
+            compression_dict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=compression_dict)
+        else:
+            self._zdict = dictionary
+
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        i = self._check_index(i)
+        start, end = self._entries[i]
+        return self._block(i // self.block_size)[start:end].decode("utf-8")
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def preview(self, i):
+        """Returns the first PREVIEW_CHARS characters of text i without decompressing anything."""
+        i = self._check_index(i)
+        start, end = self._preview_offsets[i], self._preview_offsets[i + 1]
+        return bytes(self._previews[start:end]).decode("utf-8")
+
+    def _check_index(self, i):
+        i = int(i)
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("text store index out of range")
+        return i
+
+    def _block(self, block_id):
+        with self._lock:
+            block = self._cache.get(block_id)
+            if block is not None:
+                self._cache.move_to_end(block_id)
+                return block
+
+            compressed = self._blocks[self._block_offsets[block_id]:self._block_offsets[block_id + 1]]
+            if self.codec == "zstd":
+                block = self._decompressor.decompress(compressed)
+            else:
+                decompressor = zlib.decompressobj(zdict=self._zdict) if self._zdict else zlib.decompressobj()
+                block = decompressor.decompress(compressed) + decompressor.flush()
+
+            self._cache[block_id] = block
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return block
+
+
+def load_metadata(path):
+    """
+    Loads provision metadata from either a compressed text store or a pickle.
+
+    Args:
+        path (str): Path to a .vts text store or a .pkl metadata list
+
+    Returns:
+        CompressedTextStore or list: Indexable sequence of provision texts
+    """
+    with open(path, "rb") as f:
+        is_store = f.read(len(MAGIC)) == MAGIC
+    if is_store:
+        return CompressedTextStore(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def preview_text(metadata, i, length=PREVIEW_CHARS):
+    """Returns a short preview of provision i from either metadata representation."""
+    if isinstance(metadata, CompressedTextStore) and length <= PREVIEW_CHARS:
+        return metadata.preview(i)[:length]
+    return str(metadata[i])[:length]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python vidhik_textstore.py <metadata.pkl> <output.vts>")
+        sys.exit(1)
+
+    with open(sys.argv[1], "rb") as f:
+        provision_texts = pickle.load(f)
+
+    stats = write_text_store(provision_texts, sys.argv[2])
+    ratio = stats["raw_bytes"] / max(1, stats["store_bytes"])
+    print(f"Wrote {stats['count']} provisions to {sys.argv[2]} ({stats['codec']}): "
+          f"{stats['raw_bytes']:,} bytes of text -> {stats['store_bytes']:,} bytes ({ratio:.1f}x)")